@@ -1,7 +1,7 @@
 from django.contrib import admin
 from django.db.models import Count
 
-from airport.models import Airport, Route, AirplaneType, Airplane, Crew, Flight, Order, Ticket
+from airport.models import Airport, Route, AirplaneType, Airplane, Crew, Flight, Order, Ticket, SeatHold
 
 
 @admin.register(Airport)
@@ -87,6 +87,10 @@ class TicketAdmin(admin.ModelAdmin):
         queryset = queryset.select_related("flight", "order")
         return queryset
 
+    def save_model(self, request, obj, form, change):
+        # the form has already run full_clean()
+        obj.save(validated=True)
+
     @staticmethod
     def place(obj):
         return f"row: {obj.row}, seat: {obj.seat}"
@@ -95,3 +99,10 @@ class TicketAdmin(admin.ModelAdmin):
         return obj.order.id
 
     get_order_id.short_description = "Order ID"
+
+
+@admin.register(SeatHold)
+class SeatHoldAdmin(admin.ModelAdmin):
+    list_display = ("flight", "row", "seat", "user", "expires_at")
+    list_select_related = ("flight", "user")
+    ordering = ("expires_at",)
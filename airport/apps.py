@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class AirportConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "airport"
+
+    def ready(self):
+        from airport import metrics, signals  # noqa: F401
+
+        metrics.install()
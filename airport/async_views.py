@@ -0,0 +1,75 @@
+from django.contrib.auth import get_user_model
+from django.db.models import Prefetch
+from django.http import HttpResponse
+from django.views.decorators.http import require_GET
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+from airport.models import Flight, SeatHold, Ticket
+from airport.pagination import FlightPagination, TicketPagination
+from airport.serializers import FlightDetailSerializer, FlightListSerializer, TicketListSerializer
+
+
+def json_response(data, status=200):
+    return HttpResponse(JSONRenderer().render(data), status=status, content_type="application/json")
+
+
+async def authenticate(request):
+    """Return the active user of the request's JWT, or None, loading the user with the async ORM"""
+    authentication = JWTAuthentication()
+    header = authentication.get_header(request)
+    raw_token = header and authentication.get_raw_token(header)
+    if not raw_token:
+        return None
+    try:
+        token = authentication.get_validated_token(raw_token)
+    except (InvalidToken, TokenError):
+        return None
+    return await get_user_model().objects.filter(
+        **{jwt_settings.USER_ID_FIELD: token.get(jwt_settings.USER_ID_CLAIM), "is_active": True}
+    ).afirst()
+
+
+def flight_queryset():
+    return Flight.objects.select_related(
+        "route__source", "route__destination", "airplane"
+    ).prefetch_related("crew").with_seats_held()
+
+
+@require_GET
+async def flight_list(request):
+    """Async twin of ``GET /api/airport/flight/`` with the same body and cursors"""
+    request = Request(request)
+    paginator = FlightPagination()
+    page = await paginator.apaginate_queryset(flight_queryset(), request)
+    data = FlightListSerializer(page, many=True, context={"request": request}).data
+    return json_response(paginator.get_paginated_data(data))
+
+
+@require_GET
+async def flight_detail(request, pk):
+    """Async twin of ``GET /api/airport/flight/<id>/``"""
+    queryset = flight_queryset().prefetch_related(
+        Prefetch("seat_holds", queryset=SeatHold.objects.active(), to_attr="active_holds"),
+    )
+    flight = await queryset.filter(pk=pk).afirst()
+    if flight is None:
+        return json_response({"detail": "No Flight matches the given query."}, status=404)
+    return json_response(FlightDetailSerializer(flight, context={"request": request}).data)
+
+
+@require_GET
+async def ticket_list(request):
+    """Async twin of ``GET /api/airport/ticket/``, authenticated with a JWT"""
+    if await authenticate(request) is None:
+        return json_response({"detail": "Authentication credentials were not provided."}, status=401)
+
+    request = Request(request)
+    paginator = TicketPagination()
+    queryset = Ticket.objects.select_related("flight")
+    page = await paginator.apaginate_queryset(queryset, request)
+    data = TicketListSerializer(page, many=True, context={"request": request}).data
+    return json_response(paginator.get_paginated_data(data))
@@ -0,0 +1,149 @@
+from collections import defaultdict
+from functools import reduce
+from operator import or_
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+from airport.models import Flight, SeatHold, Ticket, violated_constraint
+from airport.seat_map import SeatMap
+
+
+class SeatsUnavailable(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "Some of the requested seats are no longer available."
+    default_code = "seats_unavailable"
+
+    def __init__(self, seats):
+        super().__init__()
+        # keep seat numbers as integers instead of coercing them to ErrorDetail strings
+        self.detail = {
+            "detail": self.detail,
+            "seats": [{"flight": flight_id, "row": row, "seat": seat} for flight_id, row, seat in seats],
+        }
+
+
+def lock_seat_maps(flights):
+    """Lock the flight rows and return their current seat maps, keyed by flight id
+
+    Rows are locked in primary key order, so concurrent orders spanning
+    several flights cannot deadlock each other.
+    """
+    airplanes = {flight.pk: flight.airplane for flight in flights}
+    locked = (
+        Flight.objects.select_for_update()
+        .filter(pk__in=airplanes)
+        .order_by("pk")
+        .values_list("pk", "seat_map")
+    )
+    return {
+        flight_id: SeatMap.for_airplane(airplanes[flight_id], seat_map)
+        for flight_id, seat_map in locked
+    }
+
+
+@transaction.atomic(savepoint=False)
+def book_tickets(order, tickets_data):
+    """Check seat availability and insert the tickets inside one critical section
+
+    ``tickets_data`` items hold ``row``, ``seat`` and an already validated
+    ``flight`` with its airplane loaded. Raises ``SeatsUnavailable`` listing
+    every seat that was sold, or held by another user, before the locks were
+    acquired. Holds the order's user had on the booked seats are released.
+    """
+    requested = defaultdict(list)
+    for ticket_data in tickets_data:
+        requested[ticket_data["flight"]].append((ticket_data["row"], ticket_data["seat"]))
+
+    seat_maps = lock_seat_maps(requested)
+    holds = active_holds(requested)
+    lost = [
+        (flight.pk, row, seat)
+        for flight, places in requested.items()
+        for row, seat in places
+        if seat_maps[flight.pk].is_taken(row, seat)
+        or holds.get((flight.pk, row, seat), order.user_id) != order.user_id
+    ]
+    if lost:
+        raise SeatsUnavailable(lost)
+
+    try:
+        # the savepoint keeps the transaction usable to look up the seats that were lost
+        with transaction.atomic():
+            tickets = Ticket.objects.bulk_create(
+                [Ticket(order=order, **ticket_data) for ticket_data in tickets_data]
+            )
+    except IntegrityError as error:
+        if violated_constraint(error) != "unique_ticket":
+            raise
+        # a ticket written outside the booking path won the seat
+        raise SeatsUnavailable(sold_places(requested))
+
+    for flight, places in requested.items():
+        Flight.objects.filter(pk=flight.pk).mark_seats(
+            places, seats_in_row=flight.airplane.seats_in_row
+        )
+
+    converted = [
+        (flight.pk, row, seat)
+        for flight, places in requested.items()
+        for row, seat in places
+        if (flight.pk, row, seat) in holds
+    ]
+    if converted:
+        SeatHold.objects.filter(
+            reduce(or_, (Q(flight_id=flight_id, row=row, seat=seat) for flight_id, row, seat in converted))
+        ).delete()
+    return tickets
+
+
+def sold_places(requested):
+    """``(flight_id, row, seat)`` of the ``requested`` places that already have a ticket"""
+    tickets = Ticket.objects.filter(
+        reduce(or_, (
+            Q(flight=flight, row=row, seat=seat) for flight, places in requested.items() for row, seat in places
+        ))
+    ).order_by("flight_id", "row", "seat").values_list("flight_id", "row", "seat")
+    return list(tickets)
+
+
+def active_holds(flights):
+    """Map ``(flight_id, row, seat)`` of every unexpired hold on ``flights`` to its user id"""
+    holds = SeatHold.objects.active().filter(flight__in=flights).order_by().values_list(
+        "flight_id", "row", "seat", "user_id"
+    )
+    return {(flight_id, row, seat): user_id for flight_id, row, seat, user_id in holds}
+
+
+@transaction.atomic
+def hold_seats(user, flight, places):
+    """Hold ``places`` on ``flight`` for ``user`` until ``SEAT_HOLD_TTL`` from now
+
+    Holding a seat the user already holds extends it; expired holds of other
+    users are taken over.
+    """
+    seat_map = lock_seat_maps([flight])[flight.pk]
+    holds = active_holds([flight])
+    lost = [
+        (flight.pk, row, seat)
+        for row, seat in places
+        if seat_map.is_taken(row, seat) or holds.get((flight.pk, row, seat), user.pk) != user.pk
+    ]
+    if lost:
+        raise SeatsUnavailable(lost)
+
+    expires_at = timezone.now() + settings.SEAT_HOLD_TTL
+    Flight.objects.filter(pk=flight.pk).touch()
+    return SeatHold.objects.bulk_create(
+        [
+            SeatHold(flight=flight, user=user, row=row, seat=seat, expires_at=expires_at)
+            for row, seat in places
+        ],
+        update_conflicts=True,
+        unique_fields=["flight", "row", "seat"],
+        update_fields=["user", "expires_at"],
+    )
@@ -0,0 +1,55 @@
+import hashlib
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.http import parse_etags, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+VERSION_CACHE_KEY = "airport:list-version:{}"
+
+
+def bump_list_version(model):
+    """Give ``model`` a new version, which orphans every cached list built from it"""
+    cache.set(VERSION_CACHE_KEY.format(model._meta.label_lower), uuid.uuid4().hex, timeout=None)
+
+
+def list_versions(models):
+    keys = [VERSION_CACHE_KEY.format(model._meta.label_lower) for model in models]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            # add() keeps a version another process stored in the meantime
+            cache.add(key, uuid.uuid4().hex, timeout=None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+class CachedListMixin:
+    """Serve ``list`` from the default cache and answer ``If-None-Match`` with 304
+
+    Entries are keyed by the current version of every model in
+    ``cache_models``, the absolute request URL and the negotiated format, so
+    they never have to be deleted: the ``post_save``/``post_delete`` handlers
+    in ``airport.signals`` give a changed model a new version and later
+    requests miss the old entries, which then expire on their own.
+    """
+
+    cache_models = ()
+
+    def list(self, request, *args, **kwargs):
+        versions = list_versions(self.cache_models or [self.queryset.model])
+        key = ":".join([*versions, request.accepted_renderer.format, request.build_absolute_uri()])
+        etag = quote_etag(hashlib.md5(key.encode(), usedforsecurity=False).hexdigest())
+        headers = {"ETag": etag}
+
+        if etag in parse_etags(request.headers.get("If-None-Match", "")):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+        cache_key = f"airport:list:{etag}"
+        data = cache.get(cache_key)
+        if data is None:
+            data = super().list(request, *args, **kwargs).data
+            cache.set(cache_key, data, timeout=settings.REFERENCE_CACHE_TIMEOUT)
+        return Response(data, headers=headers)
@@ -0,0 +1,210 @@
+import heapq
+import threading
+from bisect import bisect_left, insort
+from collections import defaultdict, namedtuple
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.utils import timezone
+
+from airport.models import Flight, Route
+
+Leg = namedtuple(
+    "Leg", ["departure_time", "flight_id", "arrival_time", "route_id", "source_id", "destination_id"]
+)
+
+GENERATION_CACHE_KEY = "airport:itinerary-index:generation"
+PRUNE_INTERVAL = timedelta(minutes=1)
+
+
+class ConnectionIndex:
+    """Upcoming flights grouped by source airport and sorted by departure time
+
+    The index is built lazily on first use and then kept current by the
+    ``post_save``/``post_delete`` handlers in ``airport.signals``, which apply
+    single flight and route changes after their transaction commits. Each
+    change also bumps a generation number in the default cache; a process that
+    sees a generation it did not produce rebuilds from the database, which
+    keeps several workers consistent when the cache is shared. Flights that
+    have departed are pruned at most once per ``PRUNE_INTERVAL``.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._loaded = False
+        self._generation = None
+        self._pruned_at = None
+        self._routes = {}
+        self._legs = {}
+        self._departures = defaultdict(list)
+
+    def invalidate(self):
+        """Drop the index so that the next search rebuilds it from the database"""
+        with self._lock:
+            self._loaded = False
+
+    def reset(self):
+        """Rebuild in every process, after writes that bypass the signals such as ``bulk_create``"""
+        with self._lock:
+            self._loaded = False
+            self._bump_generation()
+
+    def _load(self):
+        self._routes = {
+            route_id: (source_id, destination_id)
+            for route_id, source_id, destination_id in Route.objects.values_list(
+                "id", "source_id", "destination_id"
+            )
+        }
+        self._legs = {}
+        self._departures = defaultdict(list)
+        flights = Flight.objects.filter(departure_time__gte=timezone.now()).values_list(
+            "id", "departure_time", "arrival_time", "route_id"
+        )
+        for flight_id, departure_time, arrival_time, route_id in flights.iterator(chunk_size=10000):
+            self._legs[flight_id] = self._make_leg(flight_id, departure_time, arrival_time, route_id)
+        for leg in self._legs.values():
+            self._departures[leg.source_id].append(leg)
+        for legs in self._departures.values():
+            legs.sort()
+        self._pruned_at = timezone.now()
+        self._loaded = True
+
+    def _make_leg(self, flight_id, departure_time, arrival_time, route_id):
+        source_id, destination_id = self._routes[route_id]
+        return Leg(departure_time, flight_id, arrival_time, route_id, source_id, destination_id)
+
+    def _ensure_current(self):
+        generation = cache.get(GENERATION_CACHE_KEY)
+        if not self._loaded or generation != self._generation:
+            self._load()
+            self._generation = generation
+        elif timezone.now() - self._pruned_at >= PRUNE_INTERVAL:
+            self._prune()
+
+    def _prune(self):
+        """Drop the legs that have departed, which no search can use any more"""
+        now = timezone.now()
+        for source_id in list(self._departures):
+            legs = self._departures[source_id]
+            departed = bisect_left(legs, (now,))
+            for leg in legs[:departed]:
+                del self._legs[leg.flight_id]
+            del legs[:departed]
+            if not legs:
+                del self._departures[source_id]
+        self._pruned_at = now
+
+    def _bump_generation(self):
+        try:
+            generation = cache.incr(GENERATION_CACHE_KEY)
+        except ValueError:
+            cache.add(GENERATION_CACHE_KEY, 0, timeout=None)
+            generation = cache.incr(GENERATION_CACHE_KEY)
+        # any other step means another process changed flights this one has not applied
+        if generation == (self._generation or 0) + 1:
+            self._generation = generation
+        else:
+            self._loaded = False
+
+    def _remove_leg(self, flight_id):
+        leg = self._legs.pop(flight_id, None)
+        if leg is not None:
+            legs = self._departures[leg.source_id]
+            del legs[bisect_left(legs, leg)]
+
+    def _add_leg(self, leg):
+        self._legs[leg.flight_id] = leg
+        insort(self._departures[leg.source_id], leg)
+
+    def flight_changed(self, flight_id, departure_time, arrival_time, route_id):
+        with self._lock:
+            if self._loaded:
+                self._remove_leg(flight_id)
+                if route_id in self._routes and departure_time >= timezone.now():
+                    self._add_leg(self._make_leg(flight_id, departure_time, arrival_time, route_id))
+            self._bump_generation()
+
+    def flight_deleted(self, flight_id):
+        with self._lock:
+            if self._loaded:
+                self._remove_leg(flight_id)
+            self._bump_generation()
+
+    def route_changed(self, route_id, source_id, destination_id):
+        with self._lock:
+            if self._loaded:
+                self._routes[route_id] = (source_id, destination_id)
+                moved = [leg for leg in self._legs.values() if leg.route_id == route_id]
+                for leg in moved:
+                    self._remove_leg(leg.flight_id)
+                    self._add_leg(leg._replace(source_id=source_id, destination_id=destination_id))
+            self._bump_generation()
+
+    def route_deleted(self, route_id):
+        with self._lock:
+            if self._loaded:
+                self._routes.pop(route_id, None)
+            self._bump_generation()
+
+    def search(
+            self,
+            source,
+            destination,
+            departure_after,
+            departure_before,
+            max_connections=2,
+            min_connection=timedelta(minutes=45),
+            max_layover=timedelta(hours=24),
+            limit=5,
+    ):
+        """Return up to ``limit`` itineraries as lists of legs, earliest arrival first
+
+        This is a time-dependent Dijkstra over ``(airport, arrival time)``
+        labels: the label with the earliest arrival is settled first, and only
+        flights leaving at least ``min_connection`` and at most
+        ``max_layover`` after it are followed. Each airport is settled at most
+        ``limit`` times per leg count, which bounds the work on dense graphs.
+        """
+        with self._lock:
+            self._ensure_current()
+            departures = self._departures
+
+            queue = []
+            counter = 0
+            for leg in self._departures_between(departures[source], departure_after, departure_before):
+                heapq.heappush(queue, (leg.arrival_time, counter, (leg,)))
+                counter += 1
+
+            settled = defaultdict(int)
+            itineraries = []
+            while queue and len(itineraries) < limit:
+                arrival_time, _, path = heapq.heappop(queue)
+                airport = path[-1].destination_id
+                if airport == destination:
+                    itineraries.append(list(path))
+                    continue
+
+                key = (airport, len(path))
+                if settled[key] >= limit or len(path) > max_connections:
+                    continue
+                settled[key] += 1
+
+                visited = {leg.source_id for leg in path}
+                for leg in self._departures_between(
+                        departures[airport], arrival_time + min_connection, arrival_time + max_layover
+                ):
+                    if leg.destination_id not in visited:
+                        heapq.heappush(queue, (leg.arrival_time, counter, path + (leg,)))
+                        counter += 1
+            return itineraries
+
+    @staticmethod
+    def _departures_between(legs, start, end):
+        position = bisect_left(legs, (start,))
+        while position < len(legs) and legs[position].departure_time < end:
+            yield legs[position]
+            position += 1
+
+
+connection_index = ConnectionIndex()
@@ -0,0 +1,226 @@
+import csv
+import json
+import os
+import time
+from itertools import islice
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from airport.caching import bump_list_version
+from airport.itineraries import connection_index
+from airport.models import Airplane, Airport, Crew, Flight, Route
+from airport.seat_map import SeatMap
+
+FORMATS = {
+    ".csv": "csv",
+    ".json": "json",
+    ".jsonl": "json",
+    ".ndjson": "json",
+}
+
+
+def read_csv(file):
+    return csv.DictReader(file)
+
+
+def read_json(file):
+    for number, line in enumerate(file, start=1):
+        if line.strip():
+            try:
+                yield json.loads(line)
+            except ValueError as error:
+                raise CommandError(f"Line {number}: {error}")
+
+
+READERS = {
+    "csv": read_csv,
+    "json": read_json,
+}
+
+
+class ScheduleImporter:
+    """Bulk-create flights, resolving natural keys through in-memory dictionaries
+
+    Airports are keyed by name, routes by ``(source, destination, distance)``,
+    crew by ``(first_name, last_name)`` and airplanes by name. Missing airports,
+    routes and crew are created; airplanes must already exist.
+    """
+
+    def __init__(self):
+        self.airports = dict(Airport.objects.values_list("name", "id"))
+        self.routes = {
+            (source_id, destination_id, distance): route_id
+            for route_id, source_id, destination_id, distance in Route.objects.values_list(
+                "id", "source_id", "destination_id", "distance"
+            )
+        }
+        self.crew = {
+            (first_name, last_name): crew_id
+            for crew_id, first_name, last_name in Crew.objects.values_list("id", "first_name", "last_name")
+        }
+        self.airplanes = {}
+        self.ambiguous_airplanes = set()
+        for airplane in Airplane.objects.only("id", "name", "rows", "seats_in_row"):
+            if airplane.name in self.airplanes:
+                self.ambiguous_airplanes.add(airplane.name)
+            self.airplanes[airplane.name] = airplane
+        self.created = {Airport: 0, Route: 0, Crew: 0, Flight: 0}
+
+    @staticmethod
+    def parse_time(value, field):
+        parsed = parse_datetime(value or "")
+        if parsed is None:
+            raise ValueError(f"{field} is not a valid date and time: {value!r}")
+        return timezone.make_aware(parsed) if timezone.is_naive(parsed) else parsed
+
+    @staticmethod
+    def parse_crew(value):
+        names = value if isinstance(value, list) else (value or "").split(";")
+        crew = set()
+        for name in filter(None, (name.strip() for name in names)):
+            first_name, _, last_name = name.partition(" ")
+            crew.add((first_name, last_name.strip()))
+        return crew
+
+    def parse(self, record):
+        departure_time = self.parse_time(record.get("departure_time"), "departure_time")
+        arrival_time = self.parse_time(record.get("arrival_time"), "arrival_time")
+        if arrival_time <= departure_time:
+            raise ValueError("arrival_time must be after departure_time")
+        source, destination = record.get("source"), record.get("destination")
+        if not source or not destination:
+            raise ValueError("source and destination are required")
+        if source == destination:
+            raise ValueError("Source and destination airports must be different")
+        try:
+            distance = int(record.get("distance"))
+        except (TypeError, ValueError):
+            raise ValueError(f"distance is not a number: {record.get('distance')!r}")
+        airplane = record.get("airplane")
+        if airplane not in self.airplanes:
+            raise ValueError(f"Unknown airplane: {airplane!r}")
+        if airplane in self.ambiguous_airplanes:
+            raise ValueError(f"Airplane name is not unique: {airplane!r}")
+        return {
+            "departure_time": departure_time,
+            "arrival_time": arrival_time,
+            "source": (source, record.get("source_city")),
+            "destination": (destination, record.get("destination_city")),
+            "distance": distance,
+            "airplane": self.airplanes[airplane],
+            "crew": self.parse_crew(record.get("crew")),
+        }
+
+    def create_airports(self, rows):
+        new = {}
+        for row in rows:
+            for name, city in (row["source"], row["destination"]):
+                if name not in self.airports and name not in new:
+                    if not city:
+                        raise CommandError(f"Unknown airport {name!r} needs a city to be created")
+                    new[name] = Airport(name=name, closest_big_city=city)
+        for airport in Airport.objects.bulk_create(new.values()):
+            self.airports[airport.name] = airport.id
+        self.created[Airport] += len(new)
+
+    def create_routes(self, rows):
+        new = {}
+        for row in rows:
+            key = self.airports[row["source"][0]], self.airports[row["destination"][0]], row["distance"]
+            row["route"] = key
+            if key not in self.routes and key not in new:
+                new[key] = Route(source_id=key[0], destination_id=key[1], distance=key[2])
+        for key, route in zip(new, Route.objects.bulk_create(new.values())):
+            self.routes[key] = route.id
+        self.created[Route] += len(new)
+
+    def create_crew(self, rows):
+        new = {}
+        for row in rows:
+            for key in row["crew"]:
+                if key not in self.crew and key not in new:
+                    new[key] = Crew(first_name=key[0], last_name=key[1])
+        for key, member in zip(new, Crew.objects.bulk_create(new.values())):
+            self.crew[key] = member.id
+        self.created[Crew] += len(new)
+
+    def create_flights(self, rows):
+        flights = []
+        for row in rows:
+            airplane = row["airplane"]
+            # bulk_create skips Flight.save, so the empty seat map is built here
+            seat_map = SeatMap.for_airplane(airplane)
+            flights.append(Flight(
+                departure_time=row["departure_time"],
+                arrival_time=row["arrival_time"],
+                route_id=self.routes[row["route"]],
+                airplane_id=airplane.id,
+                seat_map=seat_map.to_bytes(),
+                capacity=seat_map.capacity,
+            ))
+        Flight.objects.bulk_create(flights)
+        Flight.crew.through.objects.bulk_create(
+            Flight.crew.through(flight_id=flight.id, crew_id=self.crew[key])
+            for flight, row in zip(flights, rows)
+            for key in row["crew"]
+        )
+        self.created[Flight] += len(flights)
+
+    def import_chunk(self, records):
+        rows = []
+        for number, record in records:
+            try:
+                rows.append(self.parse(record))
+            except ValueError as error:
+                raise CommandError(f"Record {number}: {error}")
+        self.create_airports(rows)
+        self.create_routes(rows)
+        self.create_crew(rows)
+        self.create_flights(rows)
+
+    def committed(self):
+        for model in (Airport, Route, Crew):
+            if self.created[model]:
+                bump_list_version(model)
+        connection_index.reset()
+
+
+class Command(BaseCommand):
+    help = (
+        "Import a flight schedule from CSV or JSON Lines in a single transaction. Each record has "
+        "departure_time, arrival_time, source, source_city, destination, destination_city, distance, "
+        "airplane and crew (full names separated by ';', or a JSON list)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument("--format", choices=sorted(READERS), help="Defaults to the file extension")
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        file_format = options["format"] or FORMATS.get(os.path.splitext(path)[1].lower())
+        if file_format is None:
+            raise CommandError("Cannot tell the format from the file name, pass --format")
+
+        started = time.perf_counter()
+        with open(path, newline="", encoding="utf-8") as file, transaction.atomic():
+            importer = ScheduleImporter()
+            records = enumerate(READERS[file_format](file), start=1)
+            while chunk := list(islice(records, options["batch_size"])):
+                importer.import_chunk(chunk)
+                imported = importer.created[Flight]
+                self.stdout.write(
+                    f"Imported {imported} flights ({imported / (time.perf_counter() - started):.0f} rows/s)"
+                )
+            transaction.on_commit(importer.committed)
+
+        seconds = time.perf_counter() - started
+        created = importer.created
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {created[Flight]} flights, {created[Airport]} airports, {created[Route]} routes and "
+            f"{created[Crew]} crew members in {seconds:.1f}s ({created[Flight] / seconds:.0f} rows/s)"
+        ))
@@ -0,0 +1,66 @@
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from airport.models import Flight, Ticket
+from airport.seat_map import SeatMap
+
+
+class Command(BaseCommand):
+    help = "Recompute flight seat maps and sold-seat counters from tickets"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report drifted flights without writing fixes",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        dry_run = options["dry_run"]
+        last_id = 0
+        checked = fixed = 0
+
+        while True:
+            with transaction.atomic():
+                flights = list(
+                    Flight.objects.select_for_update(of=("self",))
+                    .select_related("airplane")
+                    .filter(pk__gt=last_id)
+                    .order_by("pk")[:batch_size]
+                )
+                if not flights:
+                    break
+                last_id = flights[-1].pk
+
+                places = defaultdict(list)
+                tickets = Ticket.objects.filter(flight__in=flights).order_by().values_list(
+                    "flight_id", "row", "seat"
+                )
+                for flight_id, row, seat in tickets:
+                    places[flight_id].append((row, seat))
+
+                drifted = []
+                for flight in flights:
+                    seat_map = SeatMap.from_places(flight.airplane, places[flight.pk])
+                    expected = (seat_map.to_bytes(), seat_map.capacity, seat_map.taken_count)
+                    if (bytes(flight.seat_map), flight.capacity, flight.seats_sold) != expected:
+                        flight.seat_map, flight.capacity, flight.seats_sold = expected
+                        flight.version = F("version") + 1
+                        flight.updated_at = timezone.now()
+                        drifted.append(flight)
+
+                if drifted and not dry_run:
+                    Flight.objects.bulk_update(drifted, [*Flight.SEAT_STATE_FIELDS, "version", "updated_at"])
+
+            checked += len(flights)
+            fixed += len(drifted)
+            self.stdout.write(f"Checked {checked} flights, {fixed} drifted")
+
+        verb = "Found" if dry_run else "Fixed"
+        self.stdout.write(self.style.SUCCESS(f"{verb} {fixed} of {checked} flights"))
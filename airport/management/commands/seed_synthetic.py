@@ -0,0 +1,242 @@
+import random
+import time
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import DurationField, ExpressionWrapper, F, Value
+from django.utils import timezone
+
+from airport.caching import bump_list_version
+from airport.exports import batched
+from airport.itineraries import connection_index
+from airport.models import Airplane, AirplaneType, Airport, Crew, Flight, Order, Route, Ticket
+from airport.seat_map import SeatMap
+
+FIRST_NAMES = ["Anna", "Bohdan", "Daria", "Ivan", "Kateryna", "Maksym", "Olena", "Petro", "Sofia", "Taras"]
+LAST_NAMES = ["Bondar", "Hnatiuk", "Kovalenko", "Lysenko", "Melnyk", "Shevchenko", "Tkachenko", "Zhuk"]
+
+
+class SyntheticSeeder:
+    """Bulk-create a random but reproducible airline dataset
+
+    Every name starts with ``prefix``, so a dataset can be told apart from
+    real data and seeded again under another prefix. The airplane of every
+    flight is picked first, so ``tickets`` is checked against the seats of
+    all flights. Tickets are then drawn per flight before the flight is
+    inserted, so seat maps and ``seats_sold`` are right without
+    ``Flight.save`` or ``Ticket.save``.
+    """
+
+    def __init__(self, options, stdout):
+        self.options = options
+        self.stdout = stdout
+        self.prefix = options["prefix"]
+        self.batch_size = options["batch_size"]
+        self.random = random.Random(options["seed"])
+        self.started = time.perf_counter()
+        self.created = {}
+
+    def report(self, model, count):
+        self.created[model] = self.created.get(model, 0) + count
+        seconds = time.perf_counter() - self.started
+        self.stdout.write(f"{model._meta.verbose_name_plural}: {self.created[model]} ({seconds:.1f}s)")
+
+    def bulk_create(self, model, objects):
+        created = []
+        for batch in batched(objects, self.batch_size):
+            created += model.objects.bulk_create(batch)
+            self.report(model, len(batch))
+        return created
+
+    def seed(self):
+        options = self.options
+        if Airport.objects.filter(name__startswith=f"{self.prefix} ").exists():
+            raise CommandError(f"Synthetic data with prefix {self.prefix!r} already exists, pass another --prefix")
+        if options["routes"] > options["airports"] * (options["airports"] - 1):
+            raise CommandError("There are not enough airports for that many routes")
+
+        self.airports = [airport.id for airport in self.bulk_create(Airport, (
+            Airport(name=f"{self.prefix} Airport {number}", closest_big_city=f"{self.prefix} City {number}")
+            for number in range(1, options["airports"] + 1)
+        ))]
+        self.routes = self.seed_routes()
+        airplane_types = self.bulk_create(AirplaneType, (
+            AirplaneType(name=f"{self.prefix} Type {number}") for number in range(1, options["airplane_types"] + 1)
+        ))
+        self.airplanes = self.bulk_create(Airplane, (
+            Airplane(
+                name=f"{self.prefix} Airplane {number}",
+                rows=self.random.randint(10, 40),
+                seats_in_row=self.random.randint(4, 8),
+                airplane_type=self.random.choice(airplane_types),
+            )
+            for number in range(1, options["airplanes"] + 1)
+        ))
+        self.crew = [member.id for member in self.bulk_create(Crew, (
+            Crew(
+                first_name=self.random.choice(FIRST_NAMES),
+                last_name=f"{self.random.choice(LAST_NAMES)} {self.prefix} {number}",
+            )
+            for number in range(1, options["crew"] + 1)
+        ))]
+        password = make_password(options["password"])
+        self.users = [user.id for user in self.bulk_create(get_user_model(), (
+            get_user_model()(email=f"{self.prefix.lower()}-{number}@example.com", password=password)
+            for number in range(1, options["users"] + 1)
+        ))]
+        self.seed_flights()
+
+    def seed_routes(self):
+        pairs = set()
+        while len(pairs) < self.options["routes"]:
+            source, destination = self.random.sample(self.airports, 2)
+            pairs.add((source, destination))
+        routes = self.bulk_create(Route, (
+            Route(source_id=source, destination_id=destination, distance=self.random.randint(200, 10000))
+            for source, destination in sorted(pairs)
+        ))
+        return [(route.id, route.distance) for route in routes]
+
+    def seed_flights(self):
+        options = self.options
+        now = timezone.now()
+        window = timedelta(days=options["days"])
+        schedule = [
+            (self.random.choice(self.routes), self.random.choice(self.airplanes)) for _ in range(options["flights"])
+        ]
+        flights_left = len(schedule)
+        seats_left = sum(airplane.rows * airplane.seats_in_row for _, airplane in schedule)
+        tickets_left = options["tickets"]
+        if tickets_left > seats_left:
+            raise CommandError(f"--tickets is {tickets_left}, but the flights have only {seats_left} seats")
+        crew_per_flight = min(options["crew_per_flight"], len(self.crew))
+        self.first_order_id = None
+
+        for batch in batched(schedule, self.batch_size):
+            flights, places = [], []
+            for (route_id, distance), airplane in batch:
+                departure_time = now - window / 2 + window * self.random.random()
+                capacity = airplane.rows * airplane.seats_in_row
+                seats_left -= capacity
+                # spread the remaining tickets over the remaining flights, 50% to 150% of the average each,
+                # but never leave more than the later flights can seat
+                average = tickets_left / flights_left
+                sold = max(
+                    tickets_left - seats_left,
+                    min(capacity, tickets_left, round(average * self.random.uniform(0.5, 1.5))),
+                )
+                flight_places = [
+                    (index // airplane.seats_in_row + 1, index % airplane.seats_in_row + 1)
+                    for index in sorted(self.random.sample(range(capacity), sold))
+                ]
+                seat_map = SeatMap.from_places(airplane, flight_places)
+                flights.append(Flight(
+                    departure_time=departure_time,
+                    arrival_time=departure_time + timedelta(hours=distance / 800 + 0.5),
+                    route_id=route_id,
+                    airplane_id=airplane.id,
+                    seat_map=seat_map.to_bytes(),
+                    capacity=seat_map.capacity,
+                    seats_sold=sold,
+                ))
+                places.append(flight_places)
+                flights_left -= 1
+                tickets_left -= sold
+
+            Flight.objects.bulk_create(flights)
+            Flight.crew.through.objects.bulk_create(
+                Flight.crew.through(flight_id=flight.id, crew_id=crew_id)
+                for flight in flights
+                for crew_id in self.random.sample(self.crew, crew_per_flight)
+            )
+            self.report(Flight, len(flights))
+            self.seed_orders(
+                (flight.id, place) for flight, flight_places in zip(flights, places) for place in flight_places
+            )
+
+        if self.first_order_id is not None:
+            # created_at is auto_now_add, so orders are spread over the window after they are inserted
+            minutes = int(window.total_seconds() // 60)
+            Order.objects.filter(pk__gte=self.first_order_id).update(created_at=F("created_at") - ExpressionWrapper(
+                Value(timedelta(minutes=1)) * (F("id") * 7919 % minutes), output_field=DurationField()
+            ))
+
+    def seed_orders(self, tickets):
+        orders, order = [], None
+        pending = 0
+        for flight_id, place in tickets:
+            if order is None or order[1] != flight_id or len(order[2]) == order[3]:
+                # an order of one to four seats on one flight
+                order = (Order(user_id=self.random.choice(self.users)), flight_id, [], self.random.randint(1, 4))
+                orders.append(order)
+            order[2].append(place)
+            pending += 1
+            if pending >= self.batch_size:
+                self.flush_orders(orders)
+                orders, order, pending = [], None, 0
+        if orders:
+            self.flush_orders(orders)
+
+    def flush_orders(self, orders):
+        Order.objects.bulk_create(order for order, *_ in orders)
+        if self.first_order_id is None:
+            self.first_order_id = orders[0][0].id
+        tickets = [
+            Ticket(row=row, seat=seat, flight_id=flight_id, order_id=order.id)
+            for order, flight_id, places, _ in orders
+            for row, seat in places
+        ]
+        Ticket.objects.bulk_create(tickets)
+        self.report(Order, len(orders))
+        self.report(Ticket, len(tickets))
+
+    def committed(self):
+        for model in (Airport, Route, AirplaneType, Crew):
+            bump_list_version(model)
+        connection_index.reset()
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate a synthetic airline dataset with bulk inserts, in a single transaction: airports, routes, "
+        "airplane types, airplanes, crew, users, flights, orders and tickets"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--airports", type=int, default=1000)
+        parser.add_argument("--routes", type=int, default=10000)
+        parser.add_argument("--airplane-types", type=int, default=20)
+        parser.add_argument("--airplanes", type=int, default=500)
+        parser.add_argument("--crew", type=int, default=5000)
+        parser.add_argument("--crew-per-flight", type=int, default=4)
+        parser.add_argument("--users", type=int, default=1000)
+        parser.add_argument("--flights", type=int, default=20000)
+        parser.add_argument("--tickets", type=int, default=1000000)
+        parser.add_argument("--days", type=int, default=365, help="Flights and orders are spread over this window")
+        parser.add_argument("--prefix", default="Synthetic", help="Starts every generated name")
+        parser.add_argument("--password", default="synthetic", help="Password of every generated user")
+        parser.add_argument("--seed", type=int, default=0, help="Random seed, the same seed gives the same data")
+        parser.add_argument("--batch-size", type=int, default=5000)
+
+    def handle(self, *args, **options):
+        for name in ("airports", "routes", "airplane_types", "airplanes", "users", "flights", "days", "batch_size"):
+            if options[name] < 1:
+                raise CommandError(f"--{name.replace('_', '-')} must be at least 1")
+        for name in ("crew", "crew_per_flight", "tickets"):
+            if options[name] < 0:
+                raise CommandError(f"--{name.replace('_', '-')} must be at least 0")
+
+        seeder = SyntheticSeeder(options, self.stdout)
+        with transaction.atomic():
+            seeder.seed()
+            transaction.on_commit(seeder.committed)
+
+        seconds = time.perf_counter() - seeder.started
+        self.stdout.write(self.style.SUCCESS(
+            "Created " + ", ".join(
+                f"{count} {model._meta.verbose_name_plural}" for model, count in seeder.created.items()
+            ) + f" in {seconds:.1f}s"
+        ))
@@ -0,0 +1,262 @@
+import logging
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.http import HttpResponse, HttpResponseForbidden
+from django.utils.crypto import constant_time_compare
+from rest_framework.serializers import BaseSerializer
+
+logger = logging.getLogger(__name__)
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_current = ContextVar("airport_request_metrics", default=None)
+
+
+class RequestMetrics:
+    __slots__ = ("queries", "sql_seconds", "serializer_seconds", "serializing")
+
+    def __init__(self):
+        self.queries = []
+        self.sql_seconds = 0.0
+        self.serializer_seconds = 0.0
+        self.serializing = False
+
+
+class Series:
+    __slots__ = ("count", "seconds", "buckets", "queries", "sql_seconds", "serializer_seconds", "response_bytes")
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.buckets = [0] * (len(DURATION_BUCKETS) + 1)
+        self.queries = 0
+        self.sql_seconds = 0.0
+        self.serializer_seconds = 0.0
+        self.response_bytes = 0
+
+
+def escape_label(value):
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def format_labels(labels):
+    view, method, status = labels
+    return f'view="{escape_label(view)}",method="{escape_label(method)}",status="{status}"'
+
+
+COUNTERS = (
+    ("airport_db_queries_total", "queries", "SQL statements executed."),
+    ("airport_db_query_duration_seconds_total", "sql_seconds", "Time spent executing SQL."),
+    (
+        "airport_serializer_duration_seconds_total",
+        "serializer_seconds",
+        "Time spent building serializer data, including the SQL it triggers.",
+    ),
+    ("airport_http_response_size_bytes_total", "response_bytes", "Body bytes of non-streaming responses."),
+)
+
+
+class MetricsRegistry:
+    """Per-process request totals by view, method and status, in the Prometheus text format"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._series = {}
+
+    def clear(self):
+        with self._lock:
+            self._series = {}
+
+    def observe(self, labels, seconds, metrics, response_bytes):
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = Series()
+            series.count += 1
+            series.seconds += seconds
+            series.buckets[bisect_left(DURATION_BUCKETS, seconds)] += 1
+            series.queries += len(metrics.queries)
+            series.sql_seconds += metrics.sql_seconds
+            series.serializer_seconds += metrics.serializer_seconds
+            series.response_bytes += response_bytes
+
+    def render(self):
+        with self._lock:
+            series = [
+                (format_labels(labels), {name: getattr(item, name) for name in Series.__slots__})
+                for labels, item in sorted(self._series.items())
+            ]
+
+        lines = [
+            "# HELP airport_http_request_duration_seconds Time from the first middleware to the response.",
+            "# TYPE airport_http_request_duration_seconds histogram",
+        ]
+        for labels, item in series:
+            cumulative = 0
+            for bound, count in zip([*DURATION_BUCKETS, "+Inf"], item["buckets"]):
+                cumulative += count
+                lines.append(f'airport_http_request_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f"airport_http_request_duration_seconds_sum{{{labels}}} {item['seconds']}")
+            lines.append(f"airport_http_request_duration_seconds_count{{{labels}}} {item['count']}")
+        for name, key, description in COUNTERS:
+            lines.append(f"# HELP {name} {description}")
+            lines.append(f"# TYPE {name} counter")
+            for labels, item in series:
+                lines.append(f"{name}{{{labels}}} {item[key]}")
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+
+def record_query(execute, sql, params, many, context):
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        seconds = time.perf_counter() - started
+        metrics.sql_seconds += seconds
+        metrics.queries.append((seconds, sql))
+
+
+def add_query_wrapper(sender, connection, **kwargs):
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+def timed_serializer_data(data):
+    def timed(serializer):
+        metrics = _current.get()
+        if metrics is None or metrics.serializing or hasattr(serializer, "_data"):
+            return data(serializer)
+        metrics.serializing = True
+        started = time.perf_counter()
+        try:
+            return data(serializer)
+        finally:
+            metrics.serializer_seconds += time.perf_counter() - started
+            metrics.serializing = False
+
+    timed.timed = True
+    return timed
+
+
+def install():
+    """Time every query and serializer of a request; called once from ``AirportConfig.ready``
+
+    Queries are timed by an ``execute_wrapper`` added to each new database
+    connection. DRF has no hook around serialization, so the ``data``
+    property all serializers share is wrapped instead.
+    """
+    connection_created.connect(add_query_wrapper, dispatch_uid="airport.metrics")
+    if not getattr(BaseSerializer.data.fget, "timed", False):
+        BaseSerializer.data = property(timed_serializer_data(BaseSerializer.data.fget))
+
+
+def view_name(request):
+    """``FlightViewSet.list`` style name of the view that served ``request``"""
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return "unmatched"
+    func = match.func
+    view_class = getattr(func, "cls", None) or getattr(func, "view_class", None)
+    if view_class is None:
+        return func.__name__
+    method = request.method.lower()
+    actions = getattr(func, "actions", None) or {}
+    return f"{view_class.__name__}.{actions.get(method, method)}"
+
+
+class MetricsMiddleware:
+    """Record latency, SQL, serializer time and response size of every request
+
+    Must come first in ``MIDDLEWARE`` so that the latency covers the other
+    middleware. Requests slower than ``SLOW_REQUEST_THRESHOLD`` are logged
+    with their slowest SQL statements.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        self.finish(request, response, metrics, time.perf_counter() - started)
+        return response
+
+    async def __acall__(self, request):
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        self.finish(request, response, metrics, time.perf_counter() - started)
+        return response
+
+    @staticmethod
+    def finish(request, response, metrics, seconds):
+        view = view_name(request)
+        response_bytes = 0 if response.streaming else len(response.content)
+        registry.observe((view, request.method, response.status_code), seconds, metrics, response_bytes)
+
+        threshold = settings.SLOW_REQUEST_THRESHOLD
+        if threshold is not None and seconds >= threshold.total_seconds():
+            slowest = sorted(metrics.queries, key=lambda query: query[0], reverse=True)
+            logger.warning(
+                "Slow request %s %s (%s) %s in %.1f ms: %d queries in %.1f ms, serializers %.1f ms%s",
+                request.method,
+                request.path,
+                view,
+                response.status_code,
+                seconds * 1000,
+                len(metrics.queries),
+                metrics.sql_seconds * 1000,
+                metrics.serializer_seconds * 1000,
+                "".join(
+                    f"\n  {query_seconds * 1000:.1f} ms: {sql}"
+                    for query_seconds, sql in slowest[:settings.SLOW_REQUEST_LOG_QUERIES]
+                ),
+                extra={
+                    "view": view,
+                    "duration": seconds,
+                    "queries": len(metrics.queries),
+                    "sql_duration": metrics.sql_seconds,
+                    "serializer_duration": metrics.serializer_seconds,
+                },
+            )
+
+
+def metrics_view(request):
+    """Prometheus scrape endpoint; it expects ``Authorization: Bearer <METRICS_TOKEN>``, or ``DEBUG`` without a token"""
+    token = settings.METRICS_TOKEN
+    if token:
+        allowed = constant_time_compare(request.headers.get("Authorization", ""), f"Bearer {token}")
+    else:
+        allowed = settings.DEBUG
+    if not allowed:
+        return HttpResponseForbidden()
+    return HttpResponse(registry.render(), content_type="text/plain; version=0.0.4; charset=utf-8")
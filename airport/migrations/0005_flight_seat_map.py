@@ -0,0 +1,30 @@
+# Generated by Django 5.0.6 on 2026-10-18 06:18
+
+from django.db import migrations, models
+
+from airport.seat_map import SeatMap
+
+
+def build_seat_maps(apps, schema_editor):
+    Flight = apps.get_model("airport", "Flight")
+    Ticket = apps.get_model("airport", "Ticket")
+    for flight in Flight.objects.select_related("airplane").iterator():
+        places = Ticket.objects.filter(flight=flight).values_list("row", "seat")
+        flight.seat_map = SeatMap.from_places(flight.airplane, places).to_bytes()
+        flight.save(update_fields=["seat_map"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('airport', '0004_alter_airplane_unique_together_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='flight',
+            name='seat_map',
+            field=models.BinaryField(default=bytes),
+        ),
+        migrations.RunPython(build_seat_maps, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.0.6 on 2026-10-18 06:19
+
+from django.db import migrations, models
+from django.db.models import F, Func, OuterRef, Subquery
+
+
+def fill_seat_counters(apps, schema_editor):
+    Airplane = apps.get_model("airport", "Airplane")
+    Flight = apps.get_model("airport", "Flight")
+    capacity = Airplane.objects.filter(pk=OuterRef("airplane_id")).values(
+        capacity=F("rows") * F("seats_in_row")
+    )[:1]
+    Flight.objects.update(
+        capacity=Subquery(capacity),
+        seats_sold=Func(F("seat_map"), function="bit_count", output_field=models.IntegerField()),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('airport', '0005_flight_seat_map'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='flight',
+            name='capacity',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='flight',
+            name='seats_sold',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(fill_seat_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.0.6 on 2026-10-18 06:29
+
+import django.contrib.postgres.indexes
+import django.db.models.expressions
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('airport', '0009_flight_search_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='airplane',
+            index=models.Index(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('name'), name='text_pattern_ops'), name='airplane_name_prefix_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='airplane',
+            index=models.Index(django.db.models.expressions.CombinedExpression(models.F('rows'), '*', models.F('seats_in_row')), name='airplane_capacity_idx'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.0.6 on 2026-10-18 06:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('airport', '0010_airplane_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='flight',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='flight',
+            name='version',
+            field=models.PositiveIntegerField(default=1, editable=False),
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.0.6 on 2026-10-18 06:52
+
+from django.db import migrations
+
+NOTIFY_SEAT_CHANGE = """
+CREATE FUNCTION airport_notify_seat_change() RETURNS trigger AS $$
+BEGIN
+    IF OLD.airplane_id IS DISTINCT FROM NEW.airplane_id THEN
+        PERFORM pg_notify('airport_seat_events', json_build_object(
+            'flight', NEW.id, 'version', NEW.version, 'resync', true
+        )::text);
+    ELSE
+        PERFORM pg_notify('airport_seat_events', json_build_object(
+            'flight', NEW.id,
+            'version', NEW.version,
+            'rows', airplane.rows,
+            'seats_in_row', airplane.seats_in_row,
+            'old', encode(OLD.seat_map, 'hex'),
+            'new', encode(NEW.seat_map, 'hex')
+        )::text)
+        FROM airport_airplane AS airplane
+        WHERE airplane.id = NEW.airplane_id;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER airport_flight_seat_change
+AFTER UPDATE OF seat_map ON airport_flight
+FOR EACH ROW WHEN (OLD.seat_map IS DISTINCT FROM NEW.seat_map)
+EXECUTE FUNCTION airport_notify_seat_change();
+"""
+
+DROP_NOTIFY_SEAT_CHANGE = """
+DROP TRIGGER airport_flight_seat_change ON airport_flight;
+DROP FUNCTION airport_notify_seat_change();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('airport', '0011_flight_version'),
+    ]
+
+    operations = [
+        migrations.RunSQL(NOTIFY_SEAT_CHANGE, DROP_NOTIFY_SEAT_CHANGE),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.0.6 on 2026-10-18 07:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('airport', '0012_seat_change_notify'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='route',
+            constraint=models.CheckConstraint(check=models.Q(('source', models.F('destination')), _negated=True), name='route_source_not_destination'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.0.6 on 2026-10-18 07:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('airport', '0013_route_source_not_destination'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='ticket',
+            constraint=models.CheckConstraint(check=models.Q(('row__gte', 1)), name='ticket_row_positive'),
+        ),
+        migrations.AddConstraint(
+            model_name='ticket',
+            constraint=models.CheckConstraint(check=models.Q(('seat__gte', 1)), name='ticket_seat_positive'),
+        ),
+    ]
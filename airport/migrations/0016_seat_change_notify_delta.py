@@ -0,0 +1,87 @@
+# Generated by Django 5.0.6 on 2026-10-18 09:14
+
+from django.db import migrations
+
+# NOTIFY payloads must stay below 8000 bytes, so only the seats that changed
+# are sent, and a change too large even for that asks listeners to resync
+NOTIFY_SEAT_CHANGE = """
+CREATE OR REPLACE FUNCTION airport_notify_seat_change() RETURNS trigger AS $$
+DECLARE
+    seats_per_row integer;
+    payload text;
+BEGIN
+    IF OLD.airplane_id IS NOT DISTINCT FROM NEW.airplane_id THEN
+        SELECT seats_in_row INTO seats_per_row FROM airport_airplane WHERE id = NEW.airplane_id;
+        SELECT json_build_object(
+            'flight', NEW.id,
+            'version', NEW.version,
+            'taken', coalesce(json_agg(
+                json_build_array(changes.bit / seats_per_row + 1, changes.bit % seats_per_row + 1)
+                ORDER BY changes.bit
+            ) FILTER (WHERE changes.taken), '[]'),
+            'released', coalesce(json_agg(
+                json_build_array(changes.bit / seats_per_row + 1, changes.bit % seats_per_row + 1)
+                ORDER BY changes.bit
+            ) FILTER (WHERE NOT changes.taken), '[]')
+        )::text
+        INTO payload
+        FROM (
+            SELECT bytes.byte * 8 + shift AS bit, ((bytes.new_byte >> shift) & 1) = 1 AS taken
+            FROM (
+                SELECT
+                    byte,
+                    CASE WHEN byte < octet_length(OLD.seat_map) THEN get_byte(OLD.seat_map, byte) ELSE 0 END
+                        AS old_byte,
+                    CASE WHEN byte < octet_length(NEW.seat_map) THEN get_byte(NEW.seat_map, byte) ELSE 0 END
+                        AS new_byte
+                FROM generate_series(
+                    0, greatest(octet_length(OLD.seat_map), octet_length(NEW.seat_map)) - 1
+                ) AS byte
+            ) AS bytes
+            CROSS JOIN generate_series(0, 7) AS shift
+            WHERE bytes.old_byte <> bytes.new_byte AND ((bytes.old_byte # bytes.new_byte) >> shift) & 1 = 1
+        ) AS changes;
+    END IF;
+    IF payload IS NULL OR octet_length(payload) >= 8000 THEN
+        payload := json_build_object('flight', NEW.id, 'version', NEW.version, 'resync', true)::text;
+    END IF;
+    PERFORM pg_notify('airport_seat_events', payload);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+NOTIFY_SEAT_MAPS = """
+CREATE OR REPLACE FUNCTION airport_notify_seat_change() RETURNS trigger AS $$
+BEGIN
+    IF OLD.airplane_id IS DISTINCT FROM NEW.airplane_id THEN
+        PERFORM pg_notify('airport_seat_events', json_build_object(
+            'flight', NEW.id, 'version', NEW.version, 'resync', true
+        )::text);
+    ELSE
+        PERFORM pg_notify('airport_seat_events', json_build_object(
+            'flight', NEW.id,
+            'version', NEW.version,
+            'rows', airplane.rows,
+            'seats_in_row', airplane.seats_in_row,
+            'old', encode(OLD.seat_map, 'hex'),
+            'new', encode(NEW.seat_map, 'hex')
+        )::text)
+        FROM airport_airplane AS airplane
+        WHERE airplane.id = NEW.airplane_id;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('airport', '0015_order_user_created_idx'),
+    ]
+
+    operations = [
+        migrations.RunSQL(NOTIFY_SEAT_CHANGE, NOTIFY_SEAT_MAPS),
+    ]
@@ -1,11 +1,18 @@
 import os
 import uuid
+from contextlib import nullcontext
 
 from django.conf import settings
-from django.db import models
+from django.contrib.postgres.indexes import OpClass
+from django.db import IntegrityError, models, router, transaction
+from django.db.models import Count, F, Func, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce, Upper
+from django.utils import timezone
 from django.utils.text import slugify
 from rest_framework.exceptions import ValidationError
 
+from airport.seat_map import SeatMap
+
 
 class Airport(models.Model):
     name = models.CharField(max_length=255)
@@ -15,19 +22,36 @@ class Airport(models.Model):
         constraints = [
             models.UniqueConstraint(fields=["name"], name="unique_airport_name")
         ]
+        indexes = [
+            models.Index(Upper("closest_big_city"), name="airport_city_upper_idx"),
+        ]
 
     def __str__(self):
         return self.name
 
 
+def violated_constraint(error):
+    """Name of the constraint behind an ``IntegrityError``, or None"""
+    return getattr(getattr(error.__cause__, "diag", None), "constraint_name", None)
+
+
 class Route(models.Model):
     distance = models.IntegerField()
     source = models.ForeignKey(Airport, on_delete=models.CASCADE, related_name="source_routes")
     destination = models.ForeignKey(Airport, on_delete=models.CASCADE, related_name="destination_routes")
 
+    CONSTRAINT_ERRORS = {
+        "unique_route": "Route with these details already exists.",
+        "route_source_not_destination": "Source and destination airports must be different",
+    }
+
     class Meta:
         constraints = [
-            models.UniqueConstraint(fields=["distance", "source", "destination"], name="unique_route")
+            models.UniqueConstraint(fields=["distance", "source", "destination"], name="unique_route"),
+            models.CheckConstraint(check=~Q(source=F("destination")), name="route_source_not_destination"),
+        ]
+        indexes = [
+            models.Index(fields=["source", "destination"], name="route_source_destination_idx"),
         ]
 
     @property
@@ -35,13 +59,20 @@ class Route(models.Model):
         return f"{self.source} -> {self.destination}"
 
     def save(self, *args, **kwargs):
-        if self.source == self.destination:
-            raise ValidationError("Source and destination airports must be different")
-
-        if Route.objects.filter(distance=self.distance, source=self.source, destination=self.destination).exists():
-            raise ValidationError("Route with these details already exists.")
-
-        super(Route, self).save(*args, **kwargs)
+        if self.source_id is not None and self.source_id == self.destination_id:
+            raise ValidationError(self.CONSTRAINT_ERRORS["route_source_not_destination"])
+
+        # the constraints are checked by the INSERT itself; a failed statement
+        # aborts an enclosing transaction, so only there is a savepoint needed
+        connection = transaction.get_connection(kwargs.get("using") or router.db_for_write(Route, instance=self))
+        try:
+            with transaction.atomic(using=connection.alias) if connection.in_atomic_block else nullcontext():
+                super(Route, self).save(*args, **kwargs)
+        except IntegrityError as error:
+            message = self.CONSTRAINT_ERRORS.get(violated_constraint(error))
+            if message is None:
+                raise
+            raise ValidationError(message)
 
     def __str__(self):
         return f"{self.source}->{self.destination}"
@@ -79,6 +110,10 @@ class Airplane(models.Model):
                 fields=["name", "rows", "seats_in_row", "airplane_type"],
                 name="unique_airplane")
         ]
+        indexes = [
+            models.Index(OpClass(Upper("name"), name="text_pattern_ops"), name="airplane_name_prefix_idx"),
+            models.Index(F("rows") * F("seats_in_row"), name="airplane_capacity_idx"),
+        ]
 
     def __str__(self):
         return self.name
@@ -87,6 +122,15 @@ class Airplane(models.Model):
     def capacity(self):
         return self.rows * self.seats_in_row
 
+    def save(self, *args, **kwargs):
+        # seat maps index seats by (row - 1) * seats_in_row + (seat - 1), so
+        # existing flights would point at other seats after a resize
+        if not self._state.adding and Airplane.objects.filter(pk=self.pk, flights__isnull=False).exclude(
+                rows=self.rows, seats_in_row=self.seats_in_row
+        ).exists():
+            raise ValidationError("rows and seats_in_row cannot change once the airplane has flights")
+        super(Airplane, self).save(*args, **kwargs)
+
 
 class Crew(models.Model):
     first_name = models.CharField(max_length=255)
@@ -105,12 +149,136 @@ class Crew(models.Model):
         return f"{self.first_name} {self.last_name}"
 
 
+class FlightQuerySet(models.QuerySet):
+    def mark_seats(self, places, taken=True, seats_in_row=None):
+        """Set or clear the seat-map bits of ``places`` and recount seats_sold in a single UPDATE"""
+        if not places:
+            return 0
+        if seats_in_row is None:
+            seats_in_row = Subquery(
+                Airplane.objects.filter(pk=OuterRef("airplane_id")).values("seats_in_row")[:1]
+            )
+        else:
+            seats_in_row = Value(seats_in_row)
+        seat_map = F("seat_map")
+        for row, seat in set(places):
+            seat_map = Func(
+                seat_map,
+                Value(row - 1) * seats_in_row + Value(seat - 1),
+                Value(int(taken)),
+                function="set_bit",
+                output_field=models.BinaryField(),
+            )
+        return self.update(
+            seat_map=seat_map,
+            seats_sold=Func(seat_map, function="bit_count", output_field=models.IntegerField()),
+            version=F("version") + 1,
+            updated_at=timezone.now(),
+        )
+
+    def touch(self):
+        """Record a change that is not a write to the flight row, e.g. to its crew or seat holds"""
+        return self.update(version=F("version") + 1, updated_at=timezone.now())
+
+    def with_seats_held(self):
+        active_holds = SeatHold.objects.active().filter(flight=OuterRef("pk")).order_by().values(
+            "flight"
+        ).annotate(count=Count("*")).values("count")
+        return self.annotate(seats_held=Coalesce(Subquery(active_holds), 0))
+
+    def with_hold_expired_at(self):
+        """Annotate when the latest expired hold lapsed, which frees its seat without any write"""
+        expired = SeatHold.objects.filter(
+            flight=OuterRef("pk"), expires_at__lte=timezone.now()
+        ).order_by("-expires_at").values("expires_at")[:1]
+        return self.annotate(hold_expired_at=Subquery(expired))
+
+    def list_rows(self):
+        """Only the columns ``FlightListSerializer`` shows, as dicts instead of model instances"""
+        queryset = self if "seats_held" in self.query.annotations else self.with_seats_held()
+        return queryset.values(
+            "id",
+            "departure_time",
+            "arrival_time",
+            "capacity",
+            "seats_sold",
+            "seats_held",
+            source_name=F("route__source__name"),
+            destination_name=F("route__destination__name"),
+            airplane_name=F("airplane__name"),
+        )
+
+    def summaries(self):
+        """Times and airport names of each flight, as dicts"""
+        return self.values(
+            "id",
+            "departure_time",
+            "arrival_time",
+            source_name=F("route__source__name"),
+            destination_name=F("route__destination__name"),
+        )
+
+    def search(
+            self,
+            source=None,
+            destination=None,
+            source_city=None,
+            destination_city=None,
+            departure_after=None,
+            departure_before=None,
+            airplane_type=None,
+            min_seats=None,
+    ):
+        """Filter flights so that every condition can be served by an index
+
+        Airports resolve through ``Route(source, destination)`` and the
+        departure window through ``Flight(route, departure_time)``.
+        """
+        queryset = self
+        if source is not None:
+            queryset = queryset.filter(route__source_id=source)
+        if destination is not None:
+            queryset = queryset.filter(route__destination_id=destination)
+        if source_city:
+            queryset = queryset.filter(route__source__closest_big_city__iexact=source_city)
+        if destination_city:
+            queryset = queryset.filter(route__destination__closest_big_city__iexact=destination_city)
+        if departure_after is not None:
+            queryset = queryset.filter(departure_time__gte=departure_after)
+        if departure_before is not None:
+            queryset = queryset.filter(departure_time__lt=departure_before)
+        if airplane_type is not None:
+            queryset = queryset.filter(airplane__airplane_type_id=airplane_type)
+        if min_seats is not None:
+            if "seats_held" not in queryset.query.annotations:
+                queryset = queryset.with_seats_held()
+            queryset = queryset.alias(
+                seats_free=F("capacity") - F("seats_sold") - F("seats_held")
+            ).filter(seats_free__gte=min_seats)
+        return queryset
+
+
 class Flight(models.Model):
     departure_time = models.DateTimeField()
     arrival_time = models.DateTimeField()
     route = models.ForeignKey(Route, on_delete=models.CASCADE, related_name="flights")
     airplane = models.ForeignKey(Airplane, on_delete=models.CASCADE, related_name="flights")
     crew = models.ManyToManyField(Crew, related_name="flights")
+    seat_map = models.BinaryField(default=bytes, editable=False)
+    capacity = models.PositiveIntegerField(default=0, editable=False)
+    seats_sold = models.PositiveIntegerField(default=0, editable=False)
+    version = models.PositiveIntegerField(default=1, editable=False)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = FlightQuerySet.as_manager()
+
+    SEAT_STATE_FIELDS = ("seat_map", "capacity", "seats_sold")
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["departure_time", "id"], name="flight_departure_idx"),
+            models.Index(fields=["route", "departure_time"], name="flight_route_departure_idx"),
+        ]
 
     @staticmethod
     def format_time(dt):
@@ -121,11 +289,60 @@ class Flight(models.Model):
     def __str__(self):
         return f"{self.format_time(self.departure_time)} -> {self.format_time(self.arrival_time)}"
 
+    def get_seat_map(self):
+        return SeatMap.for_airplane(self.airplane, self.seat_map)
+
+    @property
+    def tickets_available(self):
+        """Free seats; without the ``seats_held`` annotation of ``with_seats_held`` it counts the holds in one query"""
+        seats_held = getattr(self, "seats_held", None)
+        if seats_held is None:
+            seats_held = self.seat_holds.active().count()
+        return self.capacity - self.seats_sold - seats_held
+
+    def rebuild_seat_map(self):
+        places = []
+        if self.pk is not None:
+            places = self.tickets.values_list("row", "seat")
+        seat_map = SeatMap.from_places(self.airplane, places)
+        self.seat_map = seat_map.to_bytes()
+        self.capacity = seat_map.capacity
+        self.seats_sold = seat_map.taken_count
+
+    def save(self, *args, **kwargs):
+        adding = self._state.adding
+        if adding:
+            self.rebuild_seat_map()
+        elif kwargs.get("update_fields") is None:
+            # seat state is maintained by atomic UPDATEs from ticket writes,
+            # so a stale in-memory copy must never overwrite it
+            if Flight.objects.filter(pk=self.pk, airplane_id=self.airplane_id).exists():
+                kwargs["update_fields"] = [
+                    field.name for field in self._meta.concrete_fields
+                    if not field.primary_key and field.name not in self.SEAT_STATE_FIELDS
+                ]
+            else:
+                self.rebuild_seat_map()
+        if not adding:
+            self.version = F("version") + 1
+            if kwargs.get("update_fields") is not None:
+                kwargs["update_fields"] = {*kwargs["update_fields"], "version", "updated_at"}
+        super(Flight, self).save(*args, **kwargs)
+        if not adding:
+            # deferred, so the incremented value is loaded on next access
+            del self.version
+
 
 class Order(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="orders")
 
+    class Meta:
+        indexes = [
+            # a user's order history in OrderPagination order
+            models.Index(fields=["user", "-created_at", "-id"], name="order_user_created_idx"),
+        ]
+
     def __str__(self):
         return str(self.id)
 
@@ -136,9 +353,17 @@ class Ticket(models.Model):
     flight = models.ForeignKey(Flight, on_delete=models.CASCADE, related_name="tickets")
     order = models.ForeignKey(Order, on_delete=models.CASCADE, related_name="tickets")
 
+    CONSTRAINT_ERRORS = {
+        "unique_ticket": "Ticket with this Flight, Row and Seat already exists.",
+        "ticket_row_positive": {"row": "row number must be positive"},
+        "ticket_seat_positive": {"seat": "seat number must be positive"},
+    }
+
     class Meta:
         constraints = [
-            models.UniqueConstraint(fields=["flight", "row", "seat"], name="unique_ticket")
+            models.UniqueConstraint(fields=["flight", "row", "seat"], name="unique_ticket"),
+            models.CheckConstraint(check=Q(row__gte=1), name="ticket_row_positive"),
+            models.CheckConstraint(check=Q(seat__gte=1), name="ticket_seat_positive"),
         ]
         ordering = ["row", "seat"]
 
@@ -172,9 +397,86 @@ class Ticket(models.Model):
         )
 
     def save(
-            self, force_insert=False, force_update=False, using=None, update_fields=None
+            self, force_insert=False, force_update=False, using=None, update_fields=None, validated=False
     ):
-        self.full_clean()
-        return super(Ticket, self).save(
-            force_insert, force_update, using, update_fields
-        )
+        """Save the ticket and mark its seat taken on the flight's seat map
+
+        Pass ``validated=True`` when the row and seat were already checked
+        against the airplane, e.g. by a form or ``TicketSerializer``, to skip
+        ``full_clean()``. Uniqueness and positive numbers are left to the
+        database constraints either way.
+        """
+        if not validated:
+            self.full_clean(validate_unique=False, validate_constraints=False)
+        previous = None
+        if not self._state.adding:
+            previous = Ticket.objects.filter(pk=self.pk).values_list("flight_id", "row", "seat").first()
+        current = (self.flight_id, self.row, self.seat)
+        seats_in_row = None
+        if Ticket.flight.is_cached(self) and Flight.airplane.is_cached(self.flight):
+            seats_in_row = self.flight.airplane.seats_in_row
+
+        try:
+            with transaction.atomic(using=using):
+                result = super(Ticket, self).save(
+                    force_insert, force_update, using, update_fields
+                )
+                if previous != current:
+                    if previous:
+                        flight_id, row, seat = previous
+                        Flight.objects.filter(pk=flight_id).mark_seats([(row, seat)], taken=False)
+                    Flight.objects.filter(pk=self.flight_id).mark_seats(
+                        [(self.row, self.seat)], seats_in_row=seats_in_row
+                    )
+        except IntegrityError as error:
+            message = self.CONSTRAINT_ERRORS.get(violated_constraint(error))
+            if message is None:
+                raise
+            raise ValidationError(message)
+        return result
+
+
+class SeatHoldQuerySet(models.QuerySet):
+    def active(self):
+        return self.filter(expires_at__gt=timezone.now())
+
+    def purge_expired(self, batch_size=5000):
+        """Delete expired holds in primary key batches and return how many were removed"""
+        expired = self.filter(expires_at__lte=timezone.now()).order_by("pk")
+        purged = 0
+        while True:
+            batch = list(expired.values_list("pk", flat=True)[:batch_size])
+            if not batch:
+                return purged
+            holds = SeatHold.objects.filter(pk__in=batch)
+            # the flights' latest hold expiry goes back once these rows are gone,
+            # so mark them changed to keep their Last-Modified moving forward
+            Flight.objects.filter(pk__in=holds.values("flight_id")).touch()
+            purged += holds.delete()[0]
+
+
+class SeatHold(models.Model):
+    row = models.IntegerField()
+    seat = models.IntegerField()
+    flight = models.ForeignKey(Flight, on_delete=models.CASCADE, related_name="seat_holds")
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="seat_holds")
+    expires_at = models.DateTimeField()
+
+    objects = SeatHoldQuerySet.as_manager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["flight", "row", "seat"], name="unique_seat_hold")
+        ]
+        indexes = [
+            models.Index(fields=["flight", "expires_at"], name="seat_hold_flight_expiry_idx"),
+            models.Index(fields=["expires_at"], name="seat_hold_expiry_idx"),
+        ]
+        ordering = ["row", "seat"]
+
+    def __str__(self):
+        return f"row: {self.row}, seat: {self.seat} until {self.expires_at}"
+
+    @property
+    def get_place(self):
+        return f"row: {self.row}, seat: {self.seat}"
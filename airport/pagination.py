@@ -0,0 +1,135 @@
+import json
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured, ValidationError
+from django.db import models
+from django.db.models import F, Func, Value
+from django.db.models.lookups import GreaterThan, LessThan
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination, _reverse_ordering
+
+
+class Row(Func):
+    """``ROW(a, b, ...)``, which PostgreSQL compares like a tuple"""
+
+    function = "ROW"
+    output_field = models.Field()
+
+
+class KeysetPagination(CursorPagination):
+    """Cursor pagination whose cost does not depend on how deep the page is
+
+    The cursor holds every ``ordering`` value of the row it points at, and
+    the next page is the rows after that tuple, e.g.
+    ``WHERE ROW(departure_time, id) > ROW(%s, %s)``. With an index on the
+    ordering this is an index range scan starting at the cursor instead of
+    an OFFSET that skips earlier rows. The ordering must end with a unique
+    field, use one direction and contain no nullable fields.
+    """
+
+    page_size = settings.API_PAGE_SIZE
+    page_size_query_param = "page_size"
+    max_page_size = settings.API_MAX_PAGE_SIZE
+    ordering = ("id",)
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        if len({field.startswith("-") for field in ordering}) != 1:
+            raise ImproperlyConfigured(f"{type(self).__name__}.ordering must sort every field in one direction")
+        return ordering
+
+    def paginate_queryset(self, queryset, request, view=None):
+        page = self.get_page_queryset(queryset, request, view)
+        if page is None:
+            return None
+        return self.set_page(list(page))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """Async ``paginate_queryset``: the same cursors and links, fetching the page with ``aiterator``"""
+        page = self.get_page_queryset(queryset, request, view)
+        if page is None:
+            return None
+        return self.set_page([obj async for obj in page.aiterator(chunk_size=self.page_size + 1)])
+
+    def get_page_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+        offset, reverse, position = self.cursor or (0, False, None)
+
+        ordering = _reverse_ordering(self.ordering) if reverse else self.ordering
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            queryset = queryset.filter(self.get_seek_lookup(queryset.model, ordering, position))
+        return queryset[offset:offset + self.page_size + 1]
+
+    def get_seek_lookup(self, model, ordering, position):
+        """The rows after ``position`` in ``ordering``, as one row comparison"""
+        names = [field.lstrip("-") for field in ordering]
+        try:
+            values = [
+                Value(field.to_python(value), output_field=field)
+                for field, value in zip(
+                    [model._meta.get_field(name) for name in names], json.loads(position), strict=True
+                )
+            ]
+        except (TypeError, ValueError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+        lookup = LessThan if ordering[0].startswith("-") else GreaterThan
+        return lookup(Row(*(F(name) for name in names)), Row(*values))
+
+    def set_page(self, results):
+        offset, reverse, current_position = self.cursor or (0, False, None)
+        self.page = results[:self.page_size]
+
+        has_following_position = len(results) > len(self.page)
+        following_position = None
+        if has_following_position:
+            following_position = self._get_position_from_instance(results[-1], self.ordering)
+
+        if reverse:
+            self.page = list(reversed(self.page))
+            self.has_next = current_position is not None or offset > 0
+            self.has_previous = has_following_position
+            self.next_position = current_position
+            self.previous_position = following_position
+        else:
+            self.has_next = has_following_position
+            self.has_previous = current_position is not None or offset > 0
+            self.next_position = following_position
+            self.previous_position = current_position
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+        return self.page
+
+    def _get_position_from_instance(self, instance, ordering):
+        values = [
+            instance[field] if isinstance(instance, dict) else getattr(instance, field)
+            for field in (field.lstrip("-") for field in ordering)
+        ]
+        return json.dumps([str(value) for value in values], separators=(",", ":"))
+
+    def get_paginated_data(self, data):
+        return {"next": self.get_next_link(), "previous": self.get_previous_link(), "results": data}
+
+
+class FlightPagination(KeysetPagination):
+    ordering = ("departure_time", "id")
+
+
+class OrderPagination(KeysetPagination):
+    ordering = ("-created_at", "-id")
+
+
+class TicketPagination(KeysetPagination):
+    ordering = ("id",)
+
+
+class RoutePagination(KeysetPagination):
+    ordering = ("id",)
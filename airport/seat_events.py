@@ -0,0 +1,300 @@
+import asyncio
+import json
+import logging
+import re
+from collections import defaultdict, deque, namedtuple
+
+import psycopg
+from django.conf import settings
+from django.db import connections
+
+from airport.models import Flight
+from airport.seat_map import SeatMap
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "airport_seat_events"
+
+RECONNECT_DELAY = 1
+
+SeatEvent = namedtuple("SeatEvent", ["version", "taken", "released"])
+
+Snapshot = namedtuple("Snapshot", ["version", "seat_map"])
+
+# put on a stream's queue when events were lost and the client needs a new snapshot
+RESYNC = object()
+
+
+def connection_params():
+    settings_dict = connections["default"].settings_dict
+    params = {
+        "dbname": settings_dict["NAME"],
+        "user": settings_dict["USER"],
+        "password": settings_dict["PASSWORD"],
+        "host": settings_dict["HOST"],
+        "port": settings_dict["PORT"],
+    }
+    return {key: value for key, value in params.items() if value}
+
+
+class SeatEventBroadcaster:
+    """Fan seat map changes out from one LISTEN connection to every stream of the process
+
+    The ``airport_flight_seat_change`` trigger notifies ``airport_seat_events``
+    whenever the seat map of a flight changes. Notifications arrive in commit
+    order and carry the new flight version, which serves as the event id, and
+    the seats taken and released. A change too large for a notification
+    carries ``resync`` instead, as does moving the flight to another airplane.
+    The last ``SEAT_STREAM_BUFFER`` events of every watched flight are kept, so
+    a client that reconnects while the flight is still watched can resume
+    instead of loading a new snapshot.
+    """
+
+    def __init__(self):
+        self._loop = None
+        self._listener = None
+        self._listening = None
+        self._queries = None
+        self._query_lock = None
+        self._subscribers = defaultdict(set)
+        self._recent = {}
+
+    def _ensure_listening(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._listener = None
+            self._queries = None
+            self._query_lock = asyncio.Lock()
+            self._subscribers.clear()
+            self._recent.clear()
+        if self._listener is None or self._listener.done():
+            self._listening = asyncio.Event()
+            self._listener = loop.create_task(self._listen())
+
+    async def _listen(self):
+        while True:
+            try:
+                async with await psycopg.AsyncConnection.connect(
+                        **connection_params(), autocommit=True
+                ) as connection:
+                    await connection.execute(f"LISTEN {CHANNEL}")
+                    # changes committed while nobody listened are unknown to the open streams
+                    self._resync(list(self._subscribers))
+                    self._listening.set()
+                    async for notify in connection.notifies():
+                        self._dispatch(json.loads(notify.payload))
+            except psycopg.Error:
+                logger.exception("Seat event listener lost its database connection")
+            self._listening.clear()
+            await asyncio.sleep(RECONNECT_DELAY)
+
+    def _dispatch(self, payload):
+        flight_id = payload["flight"]
+        if flight_id not in self._subscribers:
+            return
+        if payload.get("resync"):
+            self._resync([flight_id])
+            return
+
+        event = SeatEvent(
+            payload["version"],
+            [tuple(place) for place in payload["taken"]],
+            [tuple(place) for place in payload["released"]],
+        )
+        self._recent[flight_id].append(event)
+        for queue in self._subscribers[flight_id]:
+            self._publish(queue, event)
+
+    def _resync(self, flight_ids):
+        for flight_id in flight_ids:
+            self._recent[flight_id].clear()
+            for queue in self._subscribers[flight_id]:
+                self._publish(queue, RESYNC)
+
+    @staticmethod
+    def _publish(queue, item):
+        if queue.full():
+            # the client fell too far behind, replace its backlog with a new snapshot
+            while not queue.empty():
+                queue.get_nowait()
+            item = RESYNC
+        queue.put_nowait(item)
+
+    async def subscribe(self, flight_id):
+        """Return a queue receiving every later ``SeatEvent`` of the flight, or ``RESYNC``"""
+        self._ensure_listening()
+        await self._listening.wait()
+        queue = asyncio.Queue(maxsize=settings.SEAT_STREAM_BUFFER)
+        self._subscribers[flight_id].add(queue)
+        self._recent.setdefault(flight_id, deque(maxlen=settings.SEAT_STREAM_BUFFER))
+        return queue
+
+    def unsubscribe(self, flight_id, queue):
+        subscribers = self._subscribers[flight_id]
+        subscribers.discard(queue)
+        if not subscribers:
+            # nothing records this flight's changes any more, so later resumes need a snapshot
+            del self._subscribers[flight_id]
+            self._recent.pop(flight_id, None)
+
+    def events_after(self, flight_id, version):
+        """Buffered events newer than ``version``, or None if the buffer does not reach back to it"""
+        recent = self._recent.get(flight_id, ())
+        if version is None or all(event.version != version for event in recent):
+            return None
+        return [event for event in recent if event.version > version]
+
+    async def snapshot(self, flight_id):
+        """Return the current version and seat map of the flight, or None if it does not exist"""
+        sql, params = Flight.objects.filter(pk=flight_id).values_list(
+            "version", "seat_map", "airplane__rows", "airplane__seats_in_row"
+        ).query.sql_with_params()
+        async with self._query_lock:
+            if self._queries is None or self._queries.closed:
+                self._queries = await psycopg.AsyncConnection.connect(**connection_params(), autocommit=True)
+            cursor = await self._queries.execute(sql, params)
+            row = await cursor.fetchone()
+        if row is None:
+            return None
+        version, seat_map, rows, seats_in_row = row
+        return Snapshot(version, SeatMap(rows, seats_in_row, seat_map))
+
+    async def close(self):
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+        if self._queries is not None:
+            await self._queries.close()
+        self._loop = None
+
+
+seat_events = SeatEventBroadcaster()
+
+
+def format_event(name, version, data):
+    return f"event: {name}\nid: {version}\ndata: {json.dumps(data)}\n\n".encode()
+
+
+def snapshot_event(snapshot):
+    seat_map = snapshot.seat_map
+    return format_event("snapshot", snapshot.version, {
+        "version": snapshot.version,
+        "rows": seat_map.rows,
+        "seats_in_row": seat_map.seats_in_row,
+        "taken": list(seat_map.taken_places()),
+    })
+
+
+def delta_event(event):
+    return format_event("delta", event.version, event._asdict())
+
+
+class SeatEventStream:
+    """ASGI app streaming the seat changes of a flight as server-sent events
+
+    ``GET /api/airport/flight/<id>/seat-events/`` opens a ``text/event-stream``
+    that starts with a ``snapshot`` event listing every sold seat, followed by
+    ``delta`` events with the seats ``taken`` and ``released`` since. Event ids
+    are flight versions: a client reconnecting with ``Last-Event-ID`` receives
+    the events it missed, or a new snapshot when they are no longer buffered.
+
+    Streams are coroutines waiting on a queue outside Django's request
+    handling, so an idle client holds neither a thread nor a database
+    connection. Every other request is passed on to ``application``.
+    """
+
+    path = re.compile(r"^/api/airport/flight/(?P<pk>\d+)/seat-events/$")
+
+    def __init__(self, application, broadcaster=seat_events):
+        self.application = application
+        self.broadcaster = broadcaster
+
+    async def __call__(self, scope, receive, send):
+        match = self.path.match(scope["path"]) if scope["type"] == "http" else None
+        if match is None or scope["method"] != "GET":
+            return await self.application(scope, receive, send)
+        await self.stream(int(match["pk"]), self.last_event_id(scope), receive, send)
+
+    @staticmethod
+    def last_event_id(scope):
+        for name, value in scope["headers"]:
+            if name == b"last-event-id":
+                try:
+                    return int(value)
+                except ValueError:
+                    return None
+        return None
+
+    async def stream(self, flight_id, last_event_id, receive, send):
+        queue = await self.broadcaster.subscribe(flight_id)
+        try:
+            events = self.broadcaster.events_after(flight_id, last_event_id)
+            if events is None:
+                snapshot = await self.broadcaster.snapshot(flight_id)
+                if snapshot is None:
+                    await self.not_found(send)
+                    return
+                version, body = snapshot.version, snapshot_event(snapshot)
+            else:
+                version = events[-1].version if events else last_event_id
+                body = b"".join(delta_event(event) for event in events)
+
+            await send({
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [
+                    (b"content-type", b"text/event-stream"),
+                    (b"cache-control", b"no-cache"),
+                    (b"x-accel-buffering", b"no"),
+                ],
+            })
+            await send({"type": "http.response.body", "body": b"retry: 3000\n\n" + body, "more_body": True})
+
+            writer = asyncio.ensure_future(self.write_events(flight_id, queue, version, send))
+            disconnect = asyncio.ensure_future(self.wait_for_disconnect(receive))
+            done, pending = await asyncio.wait({writer, disconnect}, return_when=asyncio.FIRST_COMPLETED)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+            if writer in done and not writer.cancelled() and writer.exception() is not None:
+                logger.debug("Seat event stream of flight %s ended: %r", flight_id, writer.exception())
+        finally:
+            self.broadcaster.unsubscribe(flight_id, queue)
+
+    async def write_events(self, flight_id, queue, version, send):
+        keepalive = settings.SEAT_STREAM_KEEPALIVE.total_seconds()
+        while True:
+            try:
+                event = await asyncio.wait_for(queue.get(), keepalive)
+            except asyncio.TimeoutError:
+                body = b": keepalive\n\n"
+            else:
+                if event is RESYNC:
+                    snapshot = await self.broadcaster.snapshot(flight_id)
+                    if snapshot is None:
+                        await send({"type": "http.response.body", "body": b"", "more_body": False})
+                        return
+                    version, body = snapshot.version, snapshot_event(snapshot)
+                elif event.version > version:
+                    version, body = event.version, delta_event(event)
+                else:
+                    continue
+            await send({"type": "http.response.body", "body": body, "more_body": True})
+
+    @staticmethod
+    async def wait_for_disconnect(receive):
+        while (await receive())["type"] != "http.disconnect":
+            pass
+
+    @staticmethod
+    async def not_found(send):
+        await send({
+            "type": "http.response.start",
+            "status": 404,
+            "headers": [(b"content-type", b"application/json")],
+        })
+        await send({"type": "http.response.body", "body": b'{"detail":"Not found."}'})
@@ -0,0 +1,80 @@
+import base64
+
+
+class SeatMap:
+    """Packed bitset of taken seats, one bit per seat of an airplane.
+
+    Seat ``(row, seat)`` maps to bit ``(row - 1) * seats_in_row + (seat - 1)``.
+    Bits are numbered from the least significant bit of the first byte, the
+    same numbering PostgreSQL uses for ``get_bit``/``set_bit`` on ``bytea``.
+    """
+
+    __slots__ = ("rows", "seats_in_row", "bits")
+
+    def __init__(self, rows, seats_in_row, data=b""):
+        self.rows = rows
+        self.seats_in_row = seats_in_row
+        self.bits = int.from_bytes(bytes(data or b""), "little")
+
+    @classmethod
+    def for_airplane(cls, airplane, data=b""):
+        return cls(airplane.rows, airplane.seats_in_row, data)
+
+    @classmethod
+    def from_places(cls, airplane, places):
+        seat_map = cls.for_airplane(airplane)
+        for row, seat in places:
+            if seat_map.contains(row, seat):
+                seat_map.take(row, seat)
+        return seat_map
+
+    @staticmethod
+    def size_in_bytes(capacity):
+        return (capacity + 7) // 8
+
+    @property
+    def capacity(self):
+        return self.rows * self.seats_in_row
+
+    def contains(self, row, seat):
+        return 1 <= row <= self.rows and 1 <= seat <= self.seats_in_row
+
+    def index(self, row, seat):
+        return (row - 1) * self.seats_in_row + (seat - 1)
+
+    def is_taken(self, row, seat):
+        return bool(self.bits >> self.index(row, seat) & 1)
+
+    def take(self, row, seat):
+        self.bits |= 1 << self.index(row, seat)
+
+    def release(self, row, seat):
+        self.bits &= ~(1 << self.index(row, seat))
+
+    @property
+    def taken_count(self):
+        return self.bits.bit_count()
+
+    @property
+    def available_count(self):
+        return self.capacity - self.taken_count
+
+    def difference(self, other):
+        """Seat map of the seats taken here but not in ``other``"""
+        difference = SeatMap(self.rows, self.seats_in_row)
+        difference.bits = self.bits & ~other.bits
+        return difference
+
+    def taken_places(self):
+        bits = self.bits
+        while bits:
+            lowest = bits & -bits
+            row, seat = divmod(lowest.bit_length() - 1, self.seats_in_row)
+            yield row + 1, seat + 1
+            bits ^= lowest
+
+    def to_bytes(self):
+        return self.bits.to_bytes(self.size_in_bytes(self.capacity), "little")
+
+    def to_base64(self):
+        return base64.b64encode(self.to_bytes()).decode()
@@ -1,12 +1,56 @@
-from django.db import transaction
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.db import models, transaction
+from django.utils import timezone
+from drf_spectacular.utils import extend_schema_field
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
+from rest_framework.relations import MANY_RELATION_KWARGS
 
+from airport.booking import book_tickets
 from airport.models import (
-    AirplaneType, Airplane, Airport, Route, Crew, Flight, Order, Ticket
+    AirplaneType, Airplane, Airport, Route, Crew, Flight, Order, Ticket, SeatHold
 )
 
 
+class BulkManyRelatedField(serializers.ManyRelatedField):
+    """Resolve a list of primary keys with one query instead of one per item"""
+
+    def to_internal_value(self, data):
+        if isinstance(data, str) or not hasattr(data, "__iter__"):
+            self.fail("not_a_list", input_type=type(data).__name__)
+        if not self.allow_empty and len(data) == 0:
+            self.fail("empty")
+
+        child = self.child_relation
+        pks = []
+        for pk in data:
+            if isinstance(pk, bool):
+                child.fail("incorrect_type", data_type=type(pk).__name__)
+            try:
+                pks.append(int(pk))
+            except (TypeError, ValueError):
+                child.fail("incorrect_type", data_type=type(pk).__name__)
+
+        objects = child.get_queryset().in_bulk(pks)
+        for pk in pks:
+            if pk not in objects:
+                child.fail("does_not_exist", pk_value=pk)
+        return [objects[pk] for pk in pks]
+
+
+class BulkPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        list_kwargs = {"child_relation": cls(*args, **kwargs)}
+        for key in kwargs:
+            if key in MANY_RELATION_KWARGS:
+                list_kwargs[key] = kwargs[key]
+        return BulkManyRelatedField(**list_kwargs)
+
+
 class AirportSerializer(serializers.ModelSerializer):
     class Meta:
         model = Airport
@@ -20,6 +64,8 @@ class RouteSerializer(serializers.ModelSerializer):
     class Meta:
         model = Route
         fields = ["id", "distance", "source", "destination"]
+        # unique_route is enforced by the INSERT, see Route.save
+        validators = []
 
     def to_representation(self, instance):
         representation = super().to_representation(instance)
@@ -65,12 +111,18 @@ class TicketPlaceSerializer(serializers.ModelSerializer):
         fields = ["id", "get_place"]
 
 
+class TakenPlaceSerializer(serializers.Serializer):
+    row = serializers.IntegerField()
+    seat = serializers.IntegerField()
+    get_place = serializers.CharField()
+
+
 class FlightSerializer(serializers.ModelSerializer):
     route = serializers.PrimaryKeyRelatedField(
         queryset=Route.objects.select_related("source", "destination")
     )
     airplane = serializers.PrimaryKeyRelatedField(queryset=Airplane.objects.all())
-    crew = serializers.PrimaryKeyRelatedField(queryset=Crew.objects.all(), many=True)
+    crew = BulkPrimaryKeyRelatedField(queryset=Crew.objects.all(), many=True)
     departure_time = serializers.DateTimeField(format="%Y-%m-%d %H:%M")
     arrival_time = serializers.DateTimeField(format="%Y-%m-%d %H:%M")
     tickets_available = serializers.IntegerField(read_only=True)
@@ -79,6 +131,12 @@ class FlightSerializer(serializers.ModelSerializer):
         model = Flight
         fields = ["id", "departure_time", "arrival_time", "route", "airplane", "crew", "tickets_available"]
 
+    def create(self, validated_data):
+        flight = super().create(validated_data)
+        # nobody can hold a seat of a flight that did not exist
+        flight.seats_held = 0
+        return flight
+
     def to_representation(self, instance):
         representation = super().to_representation(instance)
         representation["route"] = instance.route.get_names_of_airports
@@ -86,17 +144,168 @@ class FlightSerializer(serializers.ModelSerializer):
         return representation
 
 
+class FlightRowListSerializer(serializers.ListSerializer):
+    """Represent ``Flight.objects.list_rows()`` dicts without running the child's fields
+
+    The output is the same as serializing each flight instance with
+    ``FlightListSerializer``; model instances still take that path.
+    """
+
+    def to_representation(self, data):
+        rows = list(data.all() if isinstance(data, models.manager.BaseManager) else data)
+        if not rows or not isinstance(rows[0], dict):
+            return super().to_representation(rows)
+
+        crew = defaultdict(list)
+        crew_names = Crew.objects.filter(flights__in=[row["id"] for row in rows]).values_list(
+            "flights", "first_name", "last_name"
+        )
+        for flight_id, first_name, last_name in crew_names:
+            crew[flight_id].append(f"{first_name} {last_name}")
+
+        time_zone = self.child.fields["departure_time"].default_timezone()
+        return [
+            {
+                "id": row["id"],
+                "departure_time": self.format_time(row["departure_time"], time_zone),
+                "arrival_time": self.format_time(row["arrival_time"], time_zone),
+                "route": f"{row['source_name']} -> {row['destination_name']}",
+                "airplane": row["airplane_name"],
+                "crew": crew[row["id"]],
+                "tickets_available": row["capacity"] - row["seats_sold"] - row["seats_held"],
+            }
+            for row in rows
+        ]
+
+    @staticmethod
+    def format_time(value, time_zone):
+        # what DateTimeField(format="%Y-%m-%d %H:%M") returns, without strftime
+        if time_zone is not None:
+            value = value.astimezone(time_zone)
+        return value.isoformat(" ", "minutes")[:16]
+
+
 class FlightListSerializer(FlightSerializer):
     crew = serializers.SlugRelatedField(many=True, read_only=True, slug_field="full_name")
 
+    class Meta(FlightSerializer.Meta):
+        list_serializer_class = FlightRowListSerializer
+
 
 class FlightDetailSerializer(FlightSerializer):
     crew = CrewSerializer(many=True, read_only=True)
-    taken_places = TicketPlaceSerializer(source="tickets", many=True, read_only=True)
+    taken_places = serializers.SerializerMethodField()
+    seat_map = serializers.SerializerMethodField()
 
     class Meta:
         model = Flight
-        fields = FlightSerializer.Meta.fields + ["taken_places",]
+        fields = FlightSerializer.Meta.fields + ["taken_places", "seat_map"]
+
+    @staticmethod
+    def get_active_holds(obj):
+        if hasattr(obj, "active_holds"):
+            return obj.active_holds
+        return list(obj.seat_holds.active())
+
+    @extend_schema_field(TakenPlaceSerializer(many=True))
+    def get_taken_places(self, obj):
+        """Sold seats read from the seat map, followed by seats held in checkout"""
+        places = list(obj.get_seat_map().taken_places())
+        places += [(hold.row, hold.seat) for hold in self.get_active_holds(obj)]
+        return [
+            {"row": row, "seat": seat, "get_place": f"row: {row}, seat: {seat}"} for row, seat in places
+        ]
+
+    def get_seat_map(self, obj) -> str:
+        """Base64 of the packed bitset of sold and held seats, bit (row - 1) * seats_in_row + (seat - 1)"""
+        seat_map = obj.get_seat_map()
+        for hold in self.get_active_holds(obj):
+            seat_map.take(hold.row, hold.seat)
+        return seat_map.to_base64()
+
+
+class FlightSearchSerializer(serializers.Serializer):
+    source = serializers.IntegerField(required=False)
+    destination = serializers.IntegerField(required=False)
+    source_city = serializers.CharField(required=False)
+    destination_city = serializers.CharField(required=False)
+    departure_from = serializers.DateField(required=False)
+    departure_to = serializers.DateField(required=False)
+    airplane_type = serializers.IntegerField(required=False)
+    min_seats = serializers.IntegerField(required=False, min_value=1)
+
+    def validate(self, attrs):
+        data = super(FlightSearchSerializer, self).validate(attrs=attrs)
+        departure_from = data.pop("departure_from", None)
+        departure_to = data.pop("departure_to", None)
+        if departure_from and departure_to and departure_from > departure_to:
+            raise ValidationError({"departure_to": "departure_to must not be before departure_from"})
+        # whole days in the current time zone, as a half-open range
+        if departure_from:
+            data["departure_after"] = timezone.make_aware(datetime.combine(departure_from, time.min))
+        if departure_to:
+            data["departure_before"] = timezone.make_aware(
+                datetime.combine(departure_to + timedelta(days=1), time.min)
+            )
+        return data
+
+
+class ItinerarySearchSerializer(serializers.Serializer):
+    source = serializers.IntegerField()
+    destination = serializers.IntegerField()
+    departure_date = serializers.DateField(required=False)
+    max_connections = serializers.IntegerField(required=False, default=2, min_value=0, max_value=2)
+    min_connection_minutes = serializers.IntegerField(
+        required=False, default=settings.ITINERARY_MIN_CONNECTION_MINUTES, min_value=0
+    )
+    limit = serializers.IntegerField(required=False, default=5, min_value=1, max_value=20)
+
+    def validate(self, attrs):
+        data = super(ItinerarySearchSerializer, self).validate(attrs=attrs)
+        if data["source"] == data["destination"]:
+            raise ValidationError("Source and destination airports must be different")
+        departure_date = data.pop("departure_date", None) or timezone.localdate()
+        data["departure_after"] = max(
+            timezone.make_aware(datetime.combine(departure_date, time.min)), timezone.now()
+        )
+        data["departure_before"] = timezone.make_aware(
+            datetime.combine(departure_date + timedelta(days=1), time.min)
+        )
+        data["min_connection"] = timedelta(minutes=data.pop("min_connection_minutes"))
+        return data
+
+
+class ItinerarySerializer(serializers.Serializer):
+    departure_time = serializers.DateTimeField(format="%Y-%m-%d %H:%M")
+    arrival_time = serializers.DateTimeField(format="%Y-%m-%d %H:%M")
+    connections = serializers.IntegerField()
+    flights = FlightListSerializer(many=True)
+
+
+class SeatHoldListSerializer(serializers.ListSerializer):
+    def validate(self, attrs):
+        places = [(hold_data["row"], hold_data["seat"]) for hold_data in attrs]
+        if len(set(places)) != len(places):
+            raise ValidationError("Each seat can be held only once per request.")
+        return attrs
+
+
+class SeatHoldSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = SeatHold
+        fields = ["id", "row", "seat", "expires_at"]
+        read_only_fields = ["expires_at"]
+        list_serializer_class = SeatHoldListSerializer
+
+    def validate(self, attrs):
+        data = super(SeatHoldSerializer, self).validate(attrs=attrs)
+        Ticket.validate_ticket(
+            attrs["row"],
+            attrs["seat"],
+            self.context["flight"].airplane,
+            ValidationError,
+        )
+        return data
 
 
 class TicketSerializer(serializers.ModelSerializer):
@@ -114,6 +323,10 @@ class TicketSerializer(serializers.ModelSerializer):
         )
         return data
 
+    def create(self, validated_data):
+        order = validated_data.pop("order")
+        return book_tickets(order, [validated_data])[0]
+
 
 class TicketListSerializer(TicketSerializer):
     flight = serializers.CharField(read_only=True)
@@ -123,22 +336,100 @@ class TicketDetailSerializer(TicketSerializer):
     flight = FlightDetailSerializer(read_only=True)
 
 
+class OrderTicketSerializer(serializers.ModelSerializer):
+    flight = serializers.IntegerField(source="flight_id")
+
+    class Meta:
+        model = Ticket
+        fields = ["id", "row", "seat", "flight"]
+
+
 class OrderSerializer(serializers.ModelSerializer):
-    tickets = serializers.PrimaryKeyRelatedField(queryset=Ticket.objects.all(), many=True)
-    created_at = serializers.DateTimeField(format="%Y-%m-%d %H:%M")
+    tickets = OrderTicketSerializer(many=True, allow_empty=False)
+    created_at = serializers.DateTimeField(format="%Y-%m-%d %H:%M", read_only=True)
 
     class Meta:
         model = Order
         fields = ["id", "created_at", "tickets"]
 
+    def validate_tickets(self, tickets_data):
+        """Resolve flights in one query and report every invalid seat at once"""
+        flights = Flight.objects.select_related("airplane").in_bulk(
+            {ticket_data["flight_id"] for ticket_data in tickets_data}
+        )
+        requested = set()
+        errors = []
+
+        for ticket_data in tickets_data:
+            flight_id, row, seat = ticket_data["flight_id"], ticket_data["row"], ticket_data["seat"]
+            flight = flights.get(flight_id)
+            error = {}
+            if flight is None:
+                error = {"flight": f"Flight {flight_id} does not exist."}
+            else:
+                try:
+                    Ticket.validate_ticket(row, seat, flight.airplane, ValidationError)
+                except ValidationError as exc:
+                    error = exc.detail
+                else:
+                    if (flight_id, row, seat) in requested:
+                        error = {"seat": f"Seat (row: {row}, seat: {seat}) is requested twice."}
+                    requested.add((flight_id, row, seat))
+            errors.append(error)
+
+        if any(errors):
+            raise ValidationError(errors)
+
+        for ticket_data in tickets_data:
+            ticket_data["flight"] = flights[ticket_data.pop("flight_id")]
+        return tickets_data
+
     def create(self, validated_data):
         with transaction.atomic():
             tickets_data = validated_data.pop("tickets")
             order = Order.objects.create(**validated_data)
-            for ticket_data in tickets_data:
-                Ticket.objects.create(order=order, **ticket_data)
+            book_tickets(order, tickets_data)
             return order
 
 
+class FlightSummarySerializer(serializers.Serializer):
+    """Represents ``Flight.objects.summaries()`` dicts"""
+
+    id = serializers.IntegerField()
+    departure_time = serializers.DateTimeField(format="%Y-%m-%d %H:%M")
+    arrival_time = serializers.DateTimeField(format="%Y-%m-%d %H:%M")
+    route = serializers.SerializerMethodField()
+
+    def get_route(self, obj) -> str:
+        return f"{obj['source_name']} -> {obj['destination_name']}"
+
+
+class OrderHistoryListSerializer(serializers.ListSerializer):
+    """Add the flight of every ticket when ``expand_flights`` is in the context
+
+    The flights of the whole page are loaded in one query, on top of the
+    prefetched tickets.
+    """
+
+    def to_representation(self, data):
+        orders = list(data.all() if isinstance(data, models.manager.BaseManager) else data)
+        representation = super().to_representation(orders)
+        if not self.context.get("expand_flights"):
+            return representation
+
+        flight_ids = {ticket.flight_id for order in orders for ticket in order.tickets.all()}
+        flights = {
+            row["id"]: FlightSummarySerializer(row).data
+            for row in Flight.objects.filter(pk__in=flight_ids).summaries()
+        }
+        for order, order_representation in zip(orders, representation):
+            for ticket, ticket_representation in zip(order.tickets.all(), order_representation["tickets"]):
+                ticket_representation["flight"] = flights[ticket.flight_id]
+        return representation
+
+
 class OrderListSerializer(OrderSerializer):
     tickets = TicketPlaceSerializer(many=True, read_only=True)
+
+    class Meta(OrderSerializer.Meta):
+        list_serializer_class = OrderHistoryListSerializer
@@ -0,0 +1,96 @@
+from django.db import transaction
+from django.db.models import QuerySet
+from django.db.models import Q
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from airport.caching import bump_list_version
+from airport.itineraries import connection_index
+from airport.models import Airport, Airplane, AirplaneType, Crew, Flight, Route, Ticket
+
+
+def _deleted_with_flight(origin):
+    model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    return model is Flight
+
+
+@receiver(post_delete, sender=Ticket)
+def release_ticket_seat(sender, instance, origin=None, **kwargs):
+    if origin is not None and _deleted_with_flight(origin):
+        return
+    Flight.objects.filter(pk=instance.flight_id).mark_seats(
+        [(instance.row, instance.seat)], taken=False
+    )
+
+
+@receiver(post_save, sender=Flight)
+def index_flight(sender, instance, **kwargs):
+    transaction.on_commit(lambda: connection_index.flight_changed(
+        instance.pk, instance.departure_time, instance.arrival_time, instance.route_id
+    ))
+
+
+@receiver(post_delete, sender=Flight)
+def unindex_flight(sender, instance, **kwargs):
+    flight_id = instance.pk
+    transaction.on_commit(lambda: connection_index.flight_deleted(flight_id))
+
+
+@receiver(post_save, sender=Route)
+def index_route(sender, instance, **kwargs):
+    transaction.on_commit(lambda: connection_index.route_changed(
+        instance.pk, instance.source_id, instance.destination_id
+    ))
+
+
+@receiver(post_delete, sender=Route)
+def unindex_route(sender, instance, **kwargs):
+    route_id = instance.pk
+    transaction.on_commit(lambda: connection_index.route_deleted(route_id))
+
+
+@receiver(post_save, sender=Airport)
+@receiver(post_delete, sender=Airport)
+@receiver(post_save, sender=AirplaneType)
+@receiver(post_delete, sender=AirplaneType)
+@receiver(post_save, sender=Crew)
+@receiver(post_delete, sender=Crew)
+@receiver(post_save, sender=Route)
+@receiver(post_delete, sender=Route)
+def invalidate_cached_lists(sender, **kwargs):
+    # bump once now, so lists cached while the transaction is open are keyed
+    # apart from the old ones, and once more when the change becomes visible
+    bump_list_version(sender)
+    transaction.on_commit(lambda: bump_list_version(sender))
+
+
+@receiver(m2m_changed, sender=Flight.crew.through)
+def touch_crew_flights(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+    if not reverse:
+        Flight.objects.filter(pk=instance.pk).touch()
+    elif pk_set is None:
+        Flight.objects.filter(crew=instance).touch()
+    else:
+        Flight.objects.filter(pk__in=pk_set).touch()
+
+
+@receiver(post_save, sender=Crew)
+@receiver(pre_delete, sender=Crew)
+def touch_crew_member_flights(sender, instance, created=False, **kwargs):
+    if not created:
+        Flight.objects.filter(crew=instance).touch()
+
+
+@receiver(post_save, sender=Airport)
+def touch_airport_flights(sender, instance, created, **kwargs):
+    if not created:
+        Flight.objects.filter(Q(route__source=instance) | Q(route__destination=instance)).touch()
+
+
+@receiver(post_save, sender=Route)
+@receiver(post_save, sender=Airplane)
+def touch_related_flights(sender, instance, created, **kwargs):
+    if not created:
+        Flight.objects.filter(**{sender._meta.model_name: instance}).touch()
@@ -0,0 +1,88 @@
+import os
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "airport_core.settings")
+django.setup()
+
+from django.db import connection
+from django.db.models import F
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from airport.models import AirplaneType, Airplane
+
+AIRPLANE_URL = reverse("airport:airplane-list")
+
+
+class AirplaneFilterTest(TestCase):
+    def setUp(self):
+        self.boeing = AirplaneType.objects.create(name="Boeing")
+        self.airbus = AirplaneType.objects.create(name="Airbus")
+        self.small = Airplane.objects.create(name="Boeing 737", rows=20, seats_in_row=6, airplane_type=self.boeing)
+        self.large = Airplane.objects.create(name="Boeing 777", rows=40, seats_in_row=9, airplane_type=self.boeing)
+        self.airbus_plane = Airplane.objects.create(
+            name="Airbus A320", rows=25, seats_in_row=6, airplane_type=self.airbus
+        )
+        self.client = APIClient()
+
+    def filter(self, **params):
+        response = self.client.get(AIRPLANE_URL, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return sorted(airplane["id"] for airplane in response.data)
+
+    def test_filter_by_name_prefix(self):
+        self.assertEqual(self.filter(name="boeing"), [self.small.id, self.large.id])
+        self.assertEqual(self.filter(name="737"), [])
+
+    def test_filter_by_airplane_types(self):
+        self.assertEqual(self.filter(airplane_type=self.airbus.id), [self.airbus_plane.id])
+        self.assertEqual(
+            self.filter(airplane_type=f"{self.airbus.id},{self.boeing.id}"),
+            [self.small.id, self.large.id, self.airbus_plane.id],
+        )
+
+    def test_filter_by_capacity_range(self):
+        self.assertEqual(self.filter(capacity_min=150), [self.large.id, self.airbus_plane.id])
+        self.assertEqual(self.filter(capacity_min=120, capacity_max=150), [self.small.id, self.airbus_plane.id])
+
+    def test_unfiltered_list_is_not_cached_across_requests(self):
+        self.filter()
+        new = Airplane.objects.create(name="Airbus A321", rows=30, seats_in_row=6, airplane_type=self.airbus)
+
+        self.assertIn(new.id, self.filter())
+
+    def test_invalid_filters(self):
+        self.assertEqual(
+            self.client.get(AIRPLANE_URL, {"capacity_min": "many"}).status_code, status.HTTP_400_BAD_REQUEST
+        )
+        self.assertEqual(
+            self.client.get(AIRPLANE_URL, {"airplane_type": "1,x"}).status_code, status.HTTP_400_BAD_REQUEST
+        )
+
+
+class AirplaneFilterPlanTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        airplane_types = AirplaneType.objects.bulk_create(AirplaneType(name=f"Type {i}") for i in range(20))
+        Airplane.objects.bulk_create(
+            Airplane(
+                name=f"Model {i:05d}",
+                rows=10 + i % 50,
+                seats_in_row=2 + i % 8,
+                airplane_type=airplane_types[i % 20],
+            )
+            for i in range(20000)
+        )
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE airport_airplane")
+
+    def test_name_prefix_uses_index(self):
+        plan = Airplane.objects.filter(name__istartswith="model 0001").explain()
+        self.assertIn("airplane_name_prefix_idx", plan)
+
+    def test_capacity_range_uses_index(self):
+        plan = Airplane.objects.alias(seat_count=F("rows") * F("seats_in_row")).filter(
+            seat_count__gte=450
+        ).explain()
+        self.assertIn("airplane_capacity_idx", plan)
@@ -5,7 +5,8 @@ from rest_framework.exceptions import ValidationError
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "airport_core.settings")
 django.setup()
 
-from django.test import TestCase
+from django.db import IntegrityError, transaction
+from django.test import TestCase, TransactionTestCase
 from airport.models import Airport, Route, AirplaneType, Airplane, Crew, Flight, Order, Ticket
 from airport.serializers import (
     AirportSerializer, RouteSerializer, AirplaneTypeSerializer,
@@ -49,6 +50,29 @@ class RouteModelTest(TestCase):
         with self.assertRaises(ValidationError):
             Route.objects.create(distance=100, source=self.airport1, destination=self.airport1)
 
+    def test_duplicate_route_keeps_transaction_usable(self):
+        with self.assertRaisesMessage(ValidationError, "Route with these details already exists."):
+            Route.objects.create(distance=100, source=self.airport1, destination=self.airport2)
+        self.assertEqual(Route.objects.count(), 1)
+
+    def test_same_source_destination_checked_by_database(self):
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Route.objects.bulk_create([Route(distance=100, source=self.airport1, destination=self.airport1)])
+
+
+class RouteWriteTest(TransactionTestCase):
+    def setUp(self):
+        self.airport1 = Airport.objects.create(name="Airport 1", closest_big_city="City 1")
+        self.airport2 = Airport.objects.create(name="Airport 2", closest_big_city="City 2")
+
+    def test_write_takes_one_query(self):
+        with self.assertNumQueries(1):
+            Route.objects.create(distance=100, source=self.airport1, destination=self.airport2)
+        with self.assertNumQueries(1), self.assertRaisesMessage(
+                ValidationError, "Route with these details already exists."
+        ):
+            Route.objects.create(distance=100, source=self.airport1, destination=self.airport2)
+
 
 class AirplaneTypeModelTest(TestCase):
     def setUp(self):
@@ -128,6 +152,43 @@ class OrderModelTest(TestCase):
     def test_create_order(self):
         self.assertEqual(self.order.user, self.user)
 
+
+class TicketModelTest(TestCase):
+    def setUp(self):
+        airport1 = Airport.objects.create(name="Airport 1", closest_big_city="City 1")
+        airport2 = Airport.objects.create(name="Airport 2", closest_big_city="City 2")
+        route = Route.objects.create(distance=100, source=airport1, destination=airport2)
+        airplane_type = AirplaneType.objects.create(name="Test Airplane Type")
+        airplane = Airplane.objects.create(name="Test Airplane", rows=10, seats_in_row=6, airplane_type=airplane_type)
+        self.flight = Flight.objects.create(
+            departure_time=datetime.now(),
+            arrival_time=datetime.now() + timedelta(hours=2),
+            route=route,
+            airplane=airplane
+        )
+        user = get_user_model().objects.create_user(email="testuser@example.com", password="testpass123")
+        self.order = Order.objects.create(user=user)
+
+    def test_validated_save_skips_full_clean(self):
+        ticket = Ticket(row=2, seat=3, flight_id=self.flight.id, order_id=self.order.id)
+        # savepoint, INSERT, seat map UPDATE, release
+        with self.assertNumQueries(4):
+            ticket.save(validated=True)
+        self.assertTrue(Flight.objects.get(pk=self.flight.id).get_seat_map().is_taken(2, 3))
+
+    def test_save_checks_airplane_bounds(self):
+        with self.assertRaises(ValidationError):
+            Ticket.objects.create(row=11, seat=1, flight=self.flight, order=self.order)
+
+    def test_constraints_map_to_validation_errors(self):
+        Ticket.objects.create(row=1, seat=1, flight=self.flight, order=self.order)
+        with self.assertRaisesMessage(ValidationError, "Ticket with this Flight, Row and Seat already exists."):
+            Ticket(row=1, seat=1, flight=self.flight, order=self.order).save(validated=True)
+        with self.assertRaisesMessage(ValidationError, "row number must be positive"):
+            Ticket(row=0, seat=1, flight=self.flight, order=self.order).save(validated=True)
+        self.assertEqual(Ticket.objects.count(), 1)
+
+
 class AirportSerializerTest(TestCase):
     def test_airport_serializer(self):
         airport = Airport.objects.create(name="Test Airport", closest_big_city="Test City")
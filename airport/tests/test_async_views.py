@@ -0,0 +1,87 @@
+import os
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "airport_core.settings")
+django.setup()
+
+from urllib.parse import parse_qs, urlparse
+
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+from airport.models import Airport, Route, AirplaneType, Airplane, Crew, Flight, Order, Ticket, SeatHold
+from django.contrib.auth import get_user_model
+from datetime import timedelta
+from django.utils import timezone
+
+
+def cursor(link):
+    return parse_qs(urlparse(link).query).get("cursor") if link else None
+
+
+class AsyncReadViewsTest(TestCase):
+    def setUp(self):
+        airport1 = Airport.objects.create(name="Airport 1", closest_big_city="City 1")
+        airport2 = Airport.objects.create(name="Airport 2", closest_big_city="City 2")
+        route = Route.objects.create(distance=100, source=airport1, destination=airport2)
+        airplane_type = AirplaneType.objects.create(name="Test Airplane Type")
+        airplane = Airplane.objects.create(
+            name="Test Airplane", rows=10, seats_in_row=6, airplane_type=airplane_type
+        )
+        crew = [Crew.objects.create(first_name="First", last_name=f"Last {i}") for i in range(2)]
+        user = get_user_model().objects.create_user(email="testuser@example.com", password="testpass123")
+        order = Order.objects.create(user=user)
+        self.flights = []
+        for i in range(5):
+            flight = Flight.objects.create(
+                departure_time=timezone.now() + timedelta(hours=i),
+                arrival_time=timezone.now() + timedelta(hours=i + 2),
+                route=route,
+                airplane=airplane
+            )
+            flight.crew.set(crew)
+            Ticket.objects.create(row=1, seat=i + 1, flight=flight, order=order)
+            self.flights.append(flight)
+        SeatHold.objects.create(
+            flight=self.flights[0], user=user, row=2, seat=2, expires_at=timezone.now() + timedelta(minutes=5)
+        )
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {RefreshToken.for_user(user).access_token}")
+
+    def assertSamePage(self, sync_url, async_url, params):
+        expected = self.client.get(sync_url, params)
+        response = self.client.get(async_url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["results"], expected.json()["results"])
+        self.assertEqual(cursor(response.json()["next"]), cursor(expected.json()["next"]))
+        return response.json()
+
+    def test_flight_list_matches_sync(self):
+        page = self.assertSamePage(
+            reverse("airport:flight-list"), reverse("airport:async-flight-list"), {"page_size": 2}
+        )
+        self.assertSamePage(
+            reverse("airport:flight-list"),
+            reverse("airport:async-flight-list"),
+            {"page_size": 2, "cursor": cursor(page["next"])[0]},
+        )
+
+    def test_flight_detail_matches_sync(self):
+        flight_id = self.flights[0].id
+        expected = self.client.get(reverse("airport:flight-detail", args=[flight_id]))
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse("airport:async-flight-detail", args=[flight_id]))
+        self.assertEqual(response.json(), expected.json())
+
+        response = self.client.get(reverse("airport:async-flight-detail", args=[flight_id + 100]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_ticket_list_matches_sync(self):
+        self.assertSamePage(reverse("airport:ticket-list"), reverse("airport:async-ticket-list"), {"page_size": 3})
+
+    def test_ticket_list_requires_token(self):
+        self.client.credentials()
+        response = self.client.get(reverse("airport:async-ticket-list"))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
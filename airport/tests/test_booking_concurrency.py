@@ -0,0 +1,89 @@
+import os
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "airport_core.settings")
+django.setup()
+
+import random
+import threading
+
+from django.db import connection
+from django.test import TransactionTestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from airport.models import Airport, Route, AirplaneType, Airplane, Flight, Ticket
+from django.contrib.auth import get_user_model
+from datetime import timedelta
+from django.utils import timezone
+
+ORDER_URL = reverse("airport:order-list")
+
+
+class ConcurrentBookingTest(TransactionTestCase):
+    workers = 16
+    attempts_per_worker = 5
+
+    def setUp(self):
+        airport1 = Airport.objects.create(name="Airport 1", closest_big_city="City 1")
+        airport2 = Airport.objects.create(name="Airport 2", closest_big_city="City 2")
+        route = Route.objects.create(distance=100, source=airport1, destination=airport2)
+        airplane_type = AirplaneType.objects.create(name="Test Airplane Type")
+        airplane = Airplane.objects.create(
+            name="Small Airplane", rows=4, seats_in_row=3, airplane_type=airplane_type
+        )
+        self.flight = Flight.objects.create(
+            departure_time=timezone.now(),
+            arrival_time=timezone.now() + timedelta(hours=2),
+            route=route,
+            airplane=airplane
+        )
+        self.users = [
+            get_user_model().objects.create_user(email=f"user{i}@example.com", password="testpass123")
+            for i in range(self.workers)
+        ]
+
+    def book_from_many_workers(self):
+        barrier = threading.Barrier(self.workers)
+        statuses = []
+        lock = threading.Lock()
+
+        def worker(user, seed):
+            rng = random.Random(seed)
+            client = APIClient()
+            client.force_authenticate(user)
+            barrier.wait()
+            try:
+                for _ in range(self.attempts_per_worker):
+                    places = {(rng.randint(1, 4), rng.randint(1, 3)) for _ in range(rng.randint(1, 3))}
+                    tickets = [{"row": row, "seat": seat, "flight": self.flight.id} for row, seat in places]
+                    response = client.post(ORDER_URL, {"tickets": tickets}, format="json")
+                    with lock:
+                        statuses.append(response.status_code)
+            finally:
+                connection.close()
+
+        threads = [
+            threading.Thread(target=worker, args=(user, seed))
+            for seed, user in enumerate(self.users)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return statuses
+
+    def test_same_flight_is_never_oversold(self):
+        statuses = self.book_from_many_workers()
+
+        self.assertEqual(len(statuses), self.workers * self.attempts_per_worker)
+        self.assertTrue(set(statuses) <= {status.HTTP_201_CREATED, status.HTTP_409_CONFLICT})
+        self.assertIn(status.HTTP_409_CONFLICT, statuses)
+
+        places = list(Ticket.objects.filter(flight=self.flight).values_list("row", "seat"))
+        self.assertEqual(len(places), len(set(places)))
+        self.assertLessEqual(len(places), 12)
+
+        self.flight.refresh_from_db()
+        self.assertEqual(self.flight.seats_sold, len(places))
+        self.assertEqual(sorted(self.flight.get_seat_map().taken_places()), sorted(places))
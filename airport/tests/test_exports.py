@@ -0,0 +1,109 @@
+import os
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "airport_core.settings")
+django.setup()
+
+import csv
+import io
+import json
+from unittest import mock
+
+from django.test import AsyncClient, TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+from airport.models import Airport, Route, AirplaneType, Airplane, Flight, Order, Ticket
+from django.contrib.auth import get_user_model
+from datetime import timedelta
+from django.utils import timezone
+
+TICKET_EXPORT_URL = reverse("airport:ticket-export")
+ORDER_EXPORT_URL = reverse("airport:order-export")
+
+
+def content(response):
+    return b"".join(response.streaming_content).decode()
+
+
+class ExportTest(TestCase):
+    def setUp(self):
+        airport1 = Airport.objects.create(name="Airport 1", closest_big_city="City 1")
+        airport2 = Airport.objects.create(name="Airport 2", closest_big_city="City 2")
+        route = Route.objects.create(distance=100, source=airport1, destination=airport2)
+        airplane_type = AirplaneType.objects.create(name="Test Airplane Type")
+        airplane = Airplane.objects.create(
+            name="Test Airplane", rows=10, seats_in_row=6, airplane_type=airplane_type
+        )
+        self.flight = Flight.objects.create(
+            departure_time=timezone.now(),
+            arrival_time=timezone.now() + timedelta(hours=2),
+            route=route,
+            airplane=airplane
+        )
+        self.user = get_user_model().objects.create_user(
+            email="admin@example.com", password="testpass123", is_staff=True
+        )
+        self.orders = [Order.objects.create(user=self.user) for _ in range(2)]
+        for seat in range(1, 4):
+            Ticket.objects.create(row=1, seat=seat, flight=self.flight, order=self.orders[0])
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_ticket_export_ndjson(self):
+        response = self.client.get(TICKET_EXPORT_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        rows = [json.loads(line) for line in content(response).splitlines()]
+        self.assertEqual([row["seat"] for row in rows], [1, 2, 3])
+        self.assertEqual(rows[0]["order"], self.orders[0].id)
+        self.assertEqual(rows[0]["user"], "admin@example.com")
+        self.assertEqual(rows[0]["ordered_at"], self.orders[0].created_at.isoformat())
+
+    def test_order_export_csv(self):
+        response = self.client.get(ORDER_EXPORT_URL, {"export_format": "csv"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('filename="orders.csv"', response["Content-Disposition"])
+        rows = list(csv.DictReader(io.StringIO(content(response))))
+        self.assertEqual([row["tickets"] for row in rows], ["3", "0"])
+        self.assertEqual(rows[0]["created_at"], self.orders[0].created_at.isoformat())
+
+    async def test_asgi_export_streams_async_chunks(self):
+        token = RefreshToken.for_user(self.user).access_token
+
+        with mock.patch("airport.exports.CHUNK_SIZE", 2):
+            response = await AsyncClient().get(
+                TICKET_EXPORT_URL, {"export_format": "csv"}, headers={"authorization": f"Bearer {token}"}
+            )
+            self.assertTrue(response.is_async)
+            chunks = [chunk async for chunk in response.streaming_content]
+
+        self.assertEqual(len(chunks), 2)
+        rows = list(csv.DictReader(io.StringIO(b"".join(chunks).decode())))
+        self.assertEqual([row["seat"] for row in rows], ["1", "2", "3"])
+        self.assertEqual(rows[0]["ordered_at"], self.orders[0].created_at.isoformat())
+
+    async def test_asgi_export_ndjson(self):
+        token = RefreshToken.for_user(self.user).access_token
+
+        response = await AsyncClient().get(ORDER_EXPORT_URL, headers={"authorization": f"Bearer {token}"})
+        chunks = [chunk async for chunk in response.streaming_content]
+
+        rows = [json.loads(line) for line in b"".join(chunks).decode().splitlines()]
+        self.assertEqual([row["tickets"] for row in rows], [3, 0])
+        self.assertEqual(rows[0]["created_at"], self.orders[0].created_at.isoformat())
+
+    def test_unknown_format_rejected(self):
+        response = self.client.get(TICKET_EXPORT_URL, {"export_format": "xml"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_export_requires_admin(self):
+        self.client.force_authenticate(
+            get_user_model().objects.create_user(email="user@example.com", password="testpass123")
+        )
+        response = self.client.get(ORDER_EXPORT_URL)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
@@ -0,0 +1,119 @@
+import os
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "airport_core.settings")
+django.setup()
+
+from django.test import TestCase
+from django.urls import reverse
+from django.utils.http import http_date
+from rest_framework import status
+from rest_framework.test import APIClient
+from airport.models import Airport, Route, AirplaneType, Airplane, Crew, Flight, Order, Ticket, SeatHold
+from django.contrib.auth import get_user_model
+from datetime import timedelta
+from django.utils import timezone
+
+
+def detail_url(flight_id):
+    return reverse("airport:flight-detail", args=[flight_id])
+
+
+class FlightConditionalGetTest(TestCase):
+    def setUp(self):
+        airport1 = Airport.objects.create(name="Airport 1", closest_big_city="City 1")
+        airport2 = Airport.objects.create(name="Airport 2", closest_big_city="City 2")
+        route = Route.objects.create(distance=100, source=airport1, destination=airport2)
+        airplane_type = AirplaneType.objects.create(name="Test Airplane Type")
+        airplane = Airplane.objects.create(
+            name="Test Airplane", rows=10, seats_in_row=6, airplane_type=airplane_type
+        )
+        self.flight = Flight.objects.create(
+            departure_time=timezone.now() + timedelta(days=1),
+            arrival_time=timezone.now() + timedelta(days=1, hours=2),
+            route=route,
+            airplane=airplane
+        )
+        self.crew = Crew.objects.create(first_name="First", last_name="Last")
+        self.user = get_user_model().objects.create_user(email="testuser@example.com", password="testpass123")
+        self.order = Order.objects.create(user=self.user)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def assertChanged(self, etag, change):
+        change()
+        response = self.client.get(detail_url(self.flight.id), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+        return response["ETag"]
+
+    def test_matching_etag_skips_serializer(self):
+        response = self.client.get(detail_url(self.flight.id))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        with self.assertNumQueries(1):
+            not_modified = self.client.get(detail_url(self.flight.id), HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(not_modified.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(not_modified["ETag"], response["ETag"])
+
+    def test_if_modified_since(self):
+        last_modified = self.client.get(detail_url(self.flight.id))["Last-Modified"]
+        response = self.client.get(detail_url(self.flight.id), HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        response = self.client.get(
+            detail_url(self.flight.id),
+            HTTP_IF_MODIFIED_SINCE=http_date((timezone.now() - timedelta(days=1)).timestamp()),
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_ticket_changes_bump_version(self):
+        etag = self.client.get(detail_url(self.flight.id))["ETag"]
+        ticket = Ticket(row=1, seat=1, flight=self.flight, order=self.order)
+        etag = self.assertChanged(etag, ticket.save)
+        self.assertChanged(etag, ticket.delete)
+
+    def test_crew_changes_bump_version(self):
+        etag = self.client.get(detail_url(self.flight.id))["ETag"]
+        etag = self.assertChanged(etag, lambda: self.flight.crew.add(self.crew))
+
+        def rename():
+            self.crew.last_name = "Renamed"
+            self.crew.save()
+
+        etag = self.assertChanged(etag, rename)
+        self.assertChanged(etag, lambda: self.crew.flights.clear())
+
+    def test_flight_save_bumps_version(self):
+        etag = self.client.get(detail_url(self.flight.id))["ETag"]
+
+        def delay():
+            self.flight.arrival_time += timedelta(hours=1)
+            self.flight.save()
+
+        self.assertChanged(etag, delay)
+        self.assertEqual(self.flight.version, 2)
+
+    def test_expired_hold_changes_etag(self):
+        hold = SeatHold.objects.create(
+            flight=self.flight, user=self.user, row=1, seat=1, expires_at=timezone.now() + timedelta(minutes=5)
+        )
+        etag = self.client.get(detail_url(self.flight.id))["ETag"]
+
+        def expire():
+            hold.expires_at = timezone.now() - timedelta(seconds=1)
+            hold.save()
+
+        self.assertChanged(etag, expire)
+
+    def test_hold_endpoint_bumps_version(self):
+        etag = self.client.get(detail_url(self.flight.id))["ETag"]
+        hold_url = reverse("airport:flight-hold", args=[self.flight.id])
+        etag = self.assertChanged(
+            etag, lambda: self.client.post(hold_url, [{"row": 2, "seat": 2}], format="json")
+        )
+        self.assertChanged(etag, lambda: self.client.delete(hold_url))
+
+    def test_missing_flight_returns_not_found(self):
+        response = self.client.get(detail_url(self.flight.id + 1))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,63 @@
+import os
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "airport_core.settings")
+django.setup()
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from airport.models import Airport, Route, AirplaneType, Airplane, Crew, Flight, Order, Ticket, SeatHold
+from airport.serializers import FlightListSerializer
+from django.contrib.auth import get_user_model
+from datetime import datetime, timedelta
+from django.utils import timezone
+
+
+class FlightRowListSerializerTest(TestCase):
+    def setUp(self):
+        airport1 = Airport.objects.create(name="Airport 1", closest_big_city="City 1")
+        airport2 = Airport.objects.create(name="Airport 2", closest_big_city="City 2")
+        route = Route.objects.create(distance=100, source=airport1, destination=airport2)
+        airplane_type = AirplaneType.objects.create(name="Test Airplane Type")
+        airplane = Airplane.objects.create(
+            name="Test Airplane", rows=10, seats_in_row=6, airplane_type=airplane_type
+        )
+        crew = [Crew.objects.create(first_name="First", last_name=f"Last {i}") for i in range(3)]
+        user = get_user_model().objects.create_user(email="testuser@example.com", password="testpass123")
+        order = Order.objects.create(user=user)
+        departure = timezone.make_aware(datetime(2030, 6, 1, 23, 45))
+        for i in range(4):
+            flight = Flight.objects.create(
+                departure_time=departure + timedelta(days=i),
+                arrival_time=departure + timedelta(days=i, hours=2),
+                route=route,
+                airplane=airplane
+            )
+            flight.crew.set(crew[:i])
+            Ticket.objects.create(row=1, seat=i + 1, flight=flight, order=order)
+        SeatHold.objects.create(
+            flight=flight, user=user, row=2, seat=2, expires_at=timezone.now() + timedelta(minutes=5)
+        )
+
+    def assertSameAsInstances(self):
+        instances = Flight.objects.select_related(
+            "route__source", "route__destination", "airplane"
+        ).prefetch_related("crew").with_seats_held().order_by("id")
+        expected = FlightListSerializer(list(instances), many=True).data
+        with self.assertNumQueries(2):
+            data = FlightListSerializer(Flight.objects.list_rows().order_by("id"), many=True).data
+        self.assertEqual(data, expected)
+
+    def test_rows_match_instances(self):
+        self.assertSameAsInstances()
+
+    @override_settings(TIME_ZONE="Europe/Kyiv")
+    def test_rows_match_instances_in_local_time(self):
+        self.assertSameAsInstances()
+
+    def test_search_uses_rows(self):
+        response = APIClient().get(reverse("airport:flight-search"), {"min_seats": 59})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()["results"]), 3)
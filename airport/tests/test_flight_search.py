@@ -0,0 +1,120 @@
+import os
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "airport_core.settings")
+django.setup()
+
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from airport.models import Airport, Route, AirplaneType, Airplane, Flight, Order, Ticket
+from airport.seat_map import SeatMap
+from django.contrib.auth import get_user_model
+from datetime import datetime, timedelta
+from django.utils import timezone
+
+SEARCH_URL = reverse("airport:flight-search")
+
+
+class FlightSearchTest(TestCase):
+    def setUp(self):
+        self.kyiv = Airport.objects.create(name="Boryspil", closest_big_city="Kyiv")
+        self.lviv = Airport.objects.create(name="Danylo Halytskyi", closest_big_city="Lviv")
+        self.odesa = Airport.objects.create(name="Odesa International", closest_big_city="Odesa")
+        kyiv_lviv = Route.objects.create(distance=470, source=self.kyiv, destination=self.lviv)
+        kyiv_odesa = Route.objects.create(distance=440, source=self.kyiv, destination=self.odesa)
+        self.jet = AirplaneType.objects.create(name="Jet")
+        prop = AirplaneType.objects.create(name="Propeller")
+        big = Airplane.objects.create(name="Big", rows=10, seats_in_row=6, airplane_type=self.jet)
+        small = Airplane.objects.create(name="Small", rows=1, seats_in_row=2, airplane_type=prop)
+
+        day = timezone.make_aware(datetime(2030, 5, 10, 12, 0))
+        self.first = Flight.objects.create(
+            departure_time=day, arrival_time=day + timedelta(hours=1), route=kyiv_lviv, airplane=big
+        )
+        self.second = Flight.objects.create(
+            departure_time=day + timedelta(days=2), arrival_time=day + timedelta(days=2, hours=1),
+            route=kyiv_lviv, airplane=small
+        )
+        self.third = Flight.objects.create(
+            departure_time=day, arrival_time=day + timedelta(hours=1), route=kyiv_odesa, airplane=big
+        )
+        user = get_user_model().objects.create_user(email="testuser@example.com", password="testpass123")
+        Ticket.objects.create(row=1, seat=1, flight=self.second, order=Order.objects.create(user=user))
+        self.client = APIClient()
+
+    def search(self, **params):
+        response = self.client.get(SEARCH_URL, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [flight["id"] for flight in response.data["results"]]
+
+    def test_filter_by_airports_and_cities(self):
+        self.assertEqual(self.search(source=self.kyiv.id, destination=self.lviv.id), [self.first.id, self.second.id])
+        self.assertEqual(self.search(source_city="kyiv", destination_city="ODESA"), [self.third.id])
+
+    def test_filter_by_departure_window(self):
+        found = self.search(departure_from="2030-05-11", departure_to="2030-05-12")
+        self.assertEqual(found, [self.second.id])
+
+    def test_filter_by_airplane_type_and_seats(self):
+        self.assertEqual(self.search(airplane_type=self.jet.id), [self.first.id, self.third.id])
+        self.assertEqual(self.search(destination=self.lviv.id, min_seats=2), [self.first.id])
+
+    def test_invalid_window(self):
+        response = self.client.get(SEARCH_URL, {"departure_from": "2030-05-12", "departure_to": "2030-05-11"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class FlightSearchPlanTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        airports = Airport.objects.bulk_create(
+            Airport(name=f"Airport {i}", closest_big_city=f"City {i}") for i in range(40)
+        )
+        routes = Route.objects.bulk_create(
+            Route(distance=100 + i, source=source, destination=destination)
+            for i, (source, destination) in enumerate(
+                (source, destination) for source in airports for destination in airports if source != destination
+            )
+        )
+        airplane = Airplane.objects.create(
+            name="Test Airplane",
+            rows=10,
+            seats_in_row=6,
+            airplane_type=AirplaneType.objects.create(name="Test Airplane Type"),
+        )
+        seat_map = SeatMap.for_airplane(airplane).to_bytes()
+        start = timezone.make_aware(datetime(2030, 1, 1))
+        Flight.objects.bulk_create(
+            Flight(
+                departure_time=start + timedelta(hours=7 * i),
+                arrival_time=start + timedelta(hours=7 * i + 2),
+                route=routes[i % len(routes)],
+                airplane=airplane,
+                seat_map=seat_map,
+                capacity=airplane.capacity,
+            )
+            for i in range(20000)
+        )
+        cls.route = routes[5]
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+    def test_search_uses_index_scans(self):
+        queryset = Flight.objects.select_related(
+            "route__source", "route__destination", "airplane"
+        ).with_seats_held().search(
+            source=self.route.source_id,
+            destination=self.route.destination_id,
+            departure_after=timezone.make_aware(datetime(2030, 1, 1)),
+            departure_before=timezone.make_aware(datetime(2031, 1, 1)),
+            min_seats=1,
+        )
+
+        plan = queryset.explain()
+
+        self.assertNotIn("Seq Scan on airport_flight", plan)
+        self.assertNotIn("Seq Scan on airport_route", plan)
+        self.assertIn("flight_route_departure_idx", plan)
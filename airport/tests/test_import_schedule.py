@@ -0,0 +1,96 @@
+import os
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "airport_core.settings")
+django.setup()
+
+import json
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from airport.models import Airport, Route, AirplaneType, Airplane, Crew, Flight
+
+HEADER = "departure_time,arrival_time,source,source_city,destination,destination_city,distance,airplane,crew\n"
+
+
+class ImportScheduleTest(TestCase):
+    def setUp(self):
+        self.airport = Airport.objects.create(name="Boryspil", closest_big_city="Kyiv")
+        airplane_type = AirplaneType.objects.create(name="Test Airplane Type")
+        self.airplane = Airplane.objects.create(
+            name="Boeing", rows=10, seats_in_row=6, airplane_type=airplane_type
+        )
+        Crew.objects.create(first_name="Anna", last_name="Pilot")
+
+    def write(self, content, suffix=".csv"):
+        file = tempfile.NamedTemporaryFile("w", suffix=suffix, delete=False)
+        file.write(content)
+        file.close()
+        self.addCleanup(os.unlink, file.name)
+        return file.name
+
+    def import_schedule(self, path, **options):
+        out = StringIO()
+        call_command("import_schedule", path, stdout=out, **options)
+        return out.getvalue()
+
+    def test_import_csv(self):
+        rows = "".join(
+            f"2030-06-0{day}T08:00,2030-06-0{day}T10:00,Boryspil,,Heathrow,London,2100,Boeing,"
+            f"Anna Pilot;John Steward\n"
+            for day in range(1, 6)
+        )
+        out = self.import_schedule(self.write(HEADER + rows), batch_size=2)
+
+        self.assertIn("Imported 5 flights, 1 airports, 1 routes and 1 crew members", out)
+        route = Route.objects.get()
+        self.assertEqual((route.source, route.destination.closest_big_city), (self.airport, "London"))
+        flights = Flight.objects.order_by("departure_time")
+        self.assertEqual(flights.count(), 5)
+        flight = flights.first()
+        self.assertEqual(flight.route, route)
+        self.assertEqual(flight.version, 1)
+        self.assertEqual(flight.tickets_available, 60)
+        self.assertEqual(bytes(flight.seat_map), bytes(8))
+        self.assertEqual(
+            sorted(flight.crew.values_list("last_name", flat=True)), ["Pilot", "Steward"]
+        )
+
+    def test_import_json_reuses_existing_rows(self):
+        destination = Airport.objects.create(name="Heathrow", closest_big_city="London")
+        route = Route.objects.create(source=self.airport, destination=destination, distance=2100)
+        records = [
+            {
+                "departure_time": f"2030-06-0{day}T08:00:00+00:00",
+                "arrival_time": f"2030-06-0{day}T10:00:00+00:00",
+                "source": "Boryspil",
+                "destination": "Heathrow",
+                "distance": 2100,
+                "airplane": "Boeing",
+                "crew": ["Anna Pilot"],
+            }
+            for day in range(1, 4)
+        ]
+        path = self.write("\n".join(json.dumps(record) for record in records), suffix=".jsonl")
+
+        # natural keys resolve from memory, so the query count does not grow with the rows
+        with self.assertNumQueries(8):
+            self.import_schedule(path)
+
+        self.assertEqual(Route.objects.count(), 1)
+        self.assertEqual(Crew.objects.count(), 1)
+        self.assertEqual(Flight.objects.filter(route=route, crew__last_name="Pilot").count(), 3)
+
+    def test_invalid_record_rolls_back(self):
+        rows = (
+            "2030-06-01T08:00,2030-06-01T10:00,Boryspil,,Heathrow,London,2100,Boeing,\n"
+            "2030-06-02T08:00,2030-06-02T10:00,Boryspil,,Heathrow,London,2100,Airbus,\n"
+        )
+        with self.assertRaisesMessage(CommandError, "Record 2: Unknown airplane: 'Airbus'"):
+            self.import_schedule(self.write(HEADER + rows), batch_size=1)
+
+        self.assertFalse(Flight.objects.exists())
+        self.assertFalse(Airport.objects.filter(name="Heathrow").exists())
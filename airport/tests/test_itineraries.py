@@ -0,0 +1,119 @@
+import os
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "airport_core.settings")
+django.setup()
+
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from airport.itineraries import GENERATION_CACHE_KEY, PRUNE_INTERVAL, connection_index
+from airport.models import Airport, Route, AirplaneType, Airplane, Flight
+from datetime import datetime, timedelta
+from django.utils import timezone
+
+ITINERARY_URL = reverse("airport:flight-itineraries")
+
+
+class ItinerarySearchTest(TestCase):
+    def setUp(self):
+        connection_index.invalidate()
+        self.day = (timezone.now() + timedelta(days=3)).date()
+        self.kyiv, self.warsaw, self.berlin, self.lisbon = [
+            Airport.objects.create(name=f"{city} Airport", closest_big_city=city)
+            for city in ("Kyiv", "Warsaw", "Berlin", "Lisbon")
+        ]
+        self.airplane = Airplane.objects.create(
+            name="Test Airplane",
+            rows=10,
+            seats_in_row=6,
+            airplane_type=AirplaneType.objects.create(name="Test Airplane Type"),
+        )
+        self.direct = self.fly(self.kyiv, self.lisbon, 8, 14)
+        self.kyiv_warsaw = self.fly(self.kyiv, self.warsaw, 6, 8)
+        self.warsaw_lisbon = self.fly(self.warsaw, self.lisbon, 9, 12)
+        self.warsaw_lisbon_tight = self.fly(self.warsaw, self.lisbon, 8.25, 11.25)
+        self.kyiv_berlin = self.fly(self.kyiv, self.berlin, 5, 6)
+        self.berlin_warsaw = self.fly(self.berlin, self.warsaw, 7, 8)
+        self.client = APIClient()
+
+    def fly(self, source, destination, departure_hour, arrival_hour):
+        route, _ = Route.objects.get_or_create(source=source, destination=destination, distance=1000)
+        departure = timezone.make_aware(datetime.combine(self.day, datetime.min.time()))
+        return Flight.objects.create(
+            departure_time=departure + timedelta(hours=departure_hour),
+            arrival_time=departure + timedelta(hours=arrival_hour),
+            route=route,
+            airplane=self.airplane,
+        )
+
+    def search(self, **params):
+        params = {"source": self.kyiv.id, "destination": self.lisbon.id, "departure_date": self.day, **params}
+        response = self.client.get(ITINERARY_URL, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [[flight["id"] for flight in itinerary["flights"]] for itinerary in response.data]
+
+    def test_itineraries_ordered_by_arrival(self):
+        self.assertEqual(
+            self.search(),
+            [
+                [self.kyiv_warsaw.id, self.warsaw_lisbon.id],
+                [self.kyiv_berlin.id, self.berlin_warsaw.id, self.warsaw_lisbon.id],
+                [self.direct.id],
+            ],
+        )
+
+    def test_minimum_connection_time(self):
+        itineraries = self.search(min_connection_minutes=0, max_connections=1)
+        self.assertEqual(itineraries[0], [self.kyiv_warsaw.id, self.warsaw_lisbon_tight.id])
+
+        itineraries = self.search(min_connection_minutes=90)
+        self.assertEqual(itineraries, [[self.direct.id]])
+
+    def test_max_connections(self):
+        self.assertEqual(self.search(max_connections=0), [[self.direct.id]])
+
+    def test_index_updates_incrementally(self):
+        self.search()
+        with self.captureOnCommitCallbacks(execute=True):
+            faster = self.fly(self.kyiv, self.lisbon, 7, 11)
+
+        with self.assertNumQueries(0):
+            paths = connection_index.search(
+                self.kyiv.id,
+                self.lisbon.id,
+                faster.departure_time - timedelta(hours=1),
+                faster.departure_time + timedelta(hours=1),
+                limit=1,
+            )
+        self.assertEqual([leg.flight_id for leg in paths[0]], [faster.id])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            faster.delete()
+        self.assertEqual(self.search(limit=1), [[self.kyiv_warsaw.id, self.warsaw_lisbon.id]])
+
+    def test_change_from_another_process_forces_reload(self):
+        self.search()
+        # another process adds a flight and bumps the generation, this one only sees the bump
+        faster = self.fly(self.kyiv, self.lisbon, 7, 11)
+        cache.set(GENERATION_CACHE_KEY, (cache.get(GENERATION_CACHE_KEY) or 0) + 1, timeout=None)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.fly(self.berlin, self.lisbon, 20, 23)
+
+        self.assertEqual(self.search(limit=1), [[faster.id]])
+
+    def test_departed_legs_are_pruned(self):
+        self.search()
+        later = timezone.make_aware(datetime.combine(self.day, datetime.min.time())) + timedelta(hours=7)
+
+        with mock.patch("django.utils.timezone.now", return_value=later + PRUNE_INTERVAL):
+            with self.assertNumQueries(0):
+                connection_index.search(self.warsaw.id, self.lisbon.id, later, later + timedelta(hours=12))
+
+        self.assertEqual(
+            set(connection_index._legs), {self.direct.id, self.warsaw_lisbon.id, self.warsaw_lisbon_tight.id}
+        )
@@ -0,0 +1,89 @@
+import os
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "airport_core.settings")
+django.setup()
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from airport.metrics import registry
+from airport.models import Airport, Route, AirplaneType, Airplane, Crew, Flight
+from datetime import timedelta
+from django.utils import timezone
+
+FLIGHT_LABELS = 'view="FlightViewSet.list",method="GET",status="200"'
+
+
+def sample(body, name, labels=FLIGHT_LABELS):
+    prefix = f"{name}{{{labels}}} "
+    for line in body.splitlines():
+        if line.startswith(prefix):
+            return float(line[len(prefix):])
+    return None
+
+
+@override_settings(METRICS_TOKEN="secret")
+class MetricsTest(TestCase):
+    def setUp(self):
+        registry.clear()
+        airport1 = Airport.objects.create(name="Airport 1", closest_big_city="City 1")
+        airport2 = Airport.objects.create(name="Airport 2", closest_big_city="City 2")
+        route = Route.objects.create(distance=100, source=airport1, destination=airport2)
+        airplane_type = AirplaneType.objects.create(name="Test Airplane Type")
+        airplane = Airplane.objects.create(
+            name="Test Airplane", rows=10, seats_in_row=6, airplane_type=airplane_type
+        )
+        flight = Flight.objects.create(
+            departure_time=timezone.now(),
+            arrival_time=timezone.now() + timedelta(hours=2),
+            route=route,
+            airplane=airplane
+        )
+        flight.crew.add(Crew.objects.create(first_name="First", last_name="Last"))
+        self.client = APIClient()
+
+    def scrape(self, token="secret"):
+        return self.client.get(reverse("metrics"), HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    def test_request_is_recorded_by_view_and_action(self):
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse("airport:flight-list"))
+
+        body = self.scrape().content.decode()
+        self.assertEqual(sample(body, "airport_http_request_duration_seconds_count"), 1)
+        self.assertEqual(
+            sample(body, "airport_http_request_duration_seconds_bucket", FLIGHT_LABELS + ',le="+Inf"'), 1
+        )
+        self.assertEqual(sample(body, "airport_db_queries_total"), 2)
+        self.assertGreater(sample(body, "airport_db_query_duration_seconds_total"), 0)
+        self.assertGreater(sample(body, "airport_serializer_duration_seconds_total"), 0)
+        self.assertEqual(sample(body, "airport_http_response_size_bytes_total"), len(response.content))
+
+    def test_actions_and_function_views_are_named(self):
+        self.client.get(reverse("airport:flight-search"))
+        self.client.get(reverse("airport:async-flight-list"))
+
+        body = self.scrape().content.decode()
+        self.assertIn('view="FlightViewSet.search",method="GET",status="200"', body)
+        self.assertIn('view="flight_list",method="GET",status="200"', body)
+
+    @override_settings(SLOW_REQUEST_THRESHOLD=timedelta(0))
+    def test_slow_request_log_includes_sql(self):
+        with self.assertLogs("airport.metrics", "WARNING") as logs:
+            self.client.get(reverse("airport:flight-list"))
+
+        self.assertIn("(FlightViewSet.list) 200", logs.output[0])
+        self.assertIn("2 queries", logs.output[0])
+        self.assertIn('FROM "airport_flight"', logs.output[0])
+
+    def test_token_protects_endpoint(self):
+        self.assertEqual(self.client.get(reverse("metrics")).status_code, 403)
+        self.assertEqual(self.scrape("wrong").status_code, 403)
+        self.assertEqual(self.scrape().status_code, 200)
+
+    @override_settings(METRICS_TOKEN="")
+    def test_endpoint_without_token_is_closed_unless_debugging(self):
+        self.assertEqual(self.client.get(reverse("metrics")).status_code, 403)
+        with self.settings(DEBUG=True):
+            self.assertEqual(self.client.get(reverse("metrics")).status_code, 200)
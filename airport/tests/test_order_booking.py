@@ -0,0 +1,143 @@
+import os
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "airport_core.settings")
+django.setup()
+
+from django.db import IntegrityError, transaction
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from airport.booking import book_tickets
+from airport.models import Airport, Route, AirplaneType, Airplane, Flight, Order, Ticket
+from django.contrib.auth import get_user_model
+from datetime import timedelta
+from django.utils import timezone
+
+ORDER_URL = reverse("airport:order-list")
+
+
+class OrderBookingTest(TestCase):
+    def setUp(self):
+        airport1 = Airport.objects.create(name="Airport 1", closest_big_city="City 1")
+        airport2 = Airport.objects.create(name="Airport 2", closest_big_city="City 2")
+        route = Route.objects.create(distance=100, source=airport1, destination=airport2)
+        airplane_type = AirplaneType.objects.create(name="Test Airplane Type")
+        airplane = Airplane.objects.create(
+            name="Test Airplane", rows=10, seats_in_row=6, airplane_type=airplane_type
+        )
+        self.flight = Flight.objects.create(
+            departure_time=timezone.now(),
+            arrival_time=timezone.now() + timedelta(hours=2),
+            route=route,
+            airplane=airplane
+        )
+        self.other_flight = Flight.objects.create(
+            departure_time=timezone.now() + timedelta(days=1),
+            arrival_time=timezone.now() + timedelta(days=1, hours=2),
+            route=route,
+            airplane=airplane
+        )
+        self.user = get_user_model().objects.create_user(email="testuser@example.com", password="testpass123")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def book(self, places, flight=None):
+        flight = flight or self.flight
+        tickets = [{"row": row, "seat": seat, "flight": flight.id} for row, seat in places]
+        return self.client.post(ORDER_URL, {"tickets": tickets}, format="json")
+
+    def test_create_order_with_tickets(self):
+        response = self.book([(1, 1), (1, 2), (2, 1)])
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.data["tickets"]), 3)
+        order = Order.objects.get(user=self.user)
+        self.assertEqual(order.tickets.count(), 3)
+        self.flight.refresh_from_db()
+        self.assertEqual(self.flight.seats_sold, 3)
+        self.assertTrue(self.flight.get_seat_map().is_taken(2, 1))
+
+    def test_query_count_does_not_grow_with_group_size(self):
+        with self.assertNumQueries(11):
+            self.book([(1, seat) for seat in range(1, 3)])
+        with self.assertNumQueries(11):
+            self.book([(row, seat) for row in range(2, 4) for seat in range(1, 6)])
+
+    def test_invalid_seats_reported_together(self):
+        response = self.book([(1, 2), (1, 2), (11, 1), (1, 7)])
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        errors = response.data["tickets"]
+        self.assertEqual(errors[0], {})
+        self.assertIn("seat", errors[1])
+        self.assertIn("row", errors[2])
+        self.assertIn("seat", errors[3])
+        self.assertFalse(Order.objects.exists())
+
+    def test_taken_seats_return_conflict(self):
+        Ticket.objects.create(
+            row=1, seat=1, flight=self.flight, order=Order.objects.create(user=self.user)
+        )
+        Ticket.objects.create(
+            row=2, seat=2, flight=self.flight, order=Order.objects.create(user=self.user)
+        )
+
+        response = self.book([(1, 1), (1, 2), (2, 2)])
+
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(
+            response.data["seats"],
+            [
+                {"flight": self.flight.id, "row": 1, "seat": 1},
+                {"flight": self.flight.id, "row": 2, "seat": 2},
+            ],
+        )
+        self.assertEqual(Ticket.objects.count(), 2)
+        self.assertEqual(Order.objects.count(), 2)
+
+    def test_seat_sold_outside_booking_path_returns_conflict(self):
+        # bulk_create skips Ticket.save, so the seat map still shows the seat as free
+        Ticket.objects.bulk_create(
+            [Ticket(row=1, seat=1, flight=self.flight, order=Order.objects.create(user=self.user))]
+        )
+
+        response = self.book([(1, 1), (1, 2)])
+
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(response.data["seats"], [{"flight": self.flight.id, "row": 1, "seat": 1}])
+        self.assertEqual(Ticket.objects.count(), 1)
+
+    def test_other_integrity_errors_are_not_conflicts(self):
+        order = Order.objects.create(user=self.user)
+
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            book_tickets(order, [{"row": 2, "seat": 0, "flight": self.flight}])
+
+        self.assertFalse(Ticket.objects.exists())
+
+    def test_order_spanning_flights_updates_each_flight(self):
+        tickets = [
+            {"row": 1, "seat": 1, "flight": self.flight.id},
+            {"row": 1, "seat": 1, "flight": self.other_flight.id},
+        ]
+        response = self.client.post(ORDER_URL, {"tickets": tickets}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        for flight in (self.flight, self.other_flight):
+            flight.refresh_from_db()
+            self.assertEqual(flight.seats_sold, 1)
+
+    def test_create_ticket(self):
+        order = Order.objects.create(user=self.user)
+        url = reverse("airport:ticket-list")
+        ticket = {"row": 3, "seat": 4, "flight": self.flight.id, "order": order.id}
+
+        response = self.client.post(url, ticket, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Ticket.objects.get().order, order)
+        self.flight.refresh_from_db()
+        self.assertTrue(self.flight.get_seat_map().is_taken(3, 4))
+        self.assertEqual(self.client.post(url, ticket, format="json").status_code, status.HTTP_400_BAD_REQUEST)
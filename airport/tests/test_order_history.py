@@ -0,0 +1,81 @@
+import os
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "airport_core.settings")
+django.setup()
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from airport.models import Airport, Route, AirplaneType, Airplane, Flight, Order, Ticket
+from datetime import timedelta
+from django.utils import timezone
+
+ORDER_URL = reverse("airport:order-list")
+
+
+class OrderHistoryTest(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(email="flyer@example.com", password="testpass123")
+        other_user = get_user_model().objects.create_user(email="other@example.com", password="testpass123")
+        airport1 = Airport.objects.create(name="Airport 1", closest_big_city="City 1")
+        airport2 = Airport.objects.create(name="Airport 2", closest_big_city="City 2")
+        route = Route.objects.create(distance=100, source=airport1, destination=airport2)
+        airplane_type = AirplaneType.objects.create(name="Test Airplane Type")
+        airplane = Airplane.objects.create(
+            name="Test Airplane", rows=10, seats_in_row=6, airplane_type=airplane_type
+        )
+        self.departure = timezone.now().replace(second=0, microsecond=0)
+        self.flights = [
+            Flight.objects.create(
+                departure_time=self.departure + timedelta(days=i),
+                arrival_time=self.departure + timedelta(days=i, hours=2),
+                route=route,
+                airplane=airplane
+            )
+            for i in range(2)
+        ]
+        created_at = timezone.now()
+        for i in range(10):
+            order = Order.objects.create(user=self.user)
+            Ticket.objects.create(row=i + 1, seat=1, flight=self.flights[0], order=order)
+            Ticket.objects.create(row=i + 1, seat=1, flight=self.flights[1], order=order)
+        # pairs of orders share a timestamp, so a cursor must carry the id as well
+        for i, order in enumerate(Order.objects.order_by("id")):
+            Order.objects.filter(pk=order.pk).update(created_at=created_at + timedelta(minutes=i // 2))
+        Order.objects.create(user=other_user)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_pages_are_newest_first(self):
+        seen = []
+        url = f"{ORDER_URL}?page_size=3"
+        while url:
+            response = self.client.get(url)
+            seen += [order["id"] for order in response.data["results"]]
+            url = response.data["next"]
+
+        self.assertEqual(
+            seen, list(Order.objects.filter(user=self.user).order_by("-created_at", "-id").values_list("id", flat=True))
+        )
+
+    def test_tickets_have_no_flight_by_default(self):
+        response = self.client.get(ORDER_URL)
+
+        self.assertEqual(set(response.data["results"][0]["tickets"][0]), {"id", "get_place"})
+
+    def test_expand_flight_loads_flights_in_one_query(self):
+        # orders, their tickets and the flights of the page
+        with self.assertNumQueries(3):
+            response = self.client.get(ORDER_URL, {"expand": "flight"})
+
+        # both tickets of an order have the same row and seat, so their order is not defined
+        tickets = sorted(response.data["results"][0]["tickets"], key=lambda ticket: ticket["flight"]["id"])
+        self.assertEqual([ticket["flight"]["id"] for ticket in tickets], [flight.id for flight in self.flights])
+        self.assertEqual(tickets[0]["flight"], {
+            "id": self.flights[0].id,
+            "departure_time": timezone.localtime(self.departure).strftime("%Y-%m-%d %H:%M"),
+            "arrival_time": timezone.localtime(self.departure + timedelta(hours=2)).strftime("%Y-%m-%d %H:%M"),
+            "route": "Airport 1 -> Airport 2",
+        })
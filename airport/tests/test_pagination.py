@@ -0,0 +1,88 @@
+import os
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "airport_core.settings")
+django.setup()
+
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+from airport.models import Airport, Route, AirplaneType, Airplane, Flight
+from airport.pagination import FlightPagination
+from datetime import timedelta
+from django.utils import timezone
+
+FLIGHT_URL = reverse("airport:flight-list")
+
+
+class FlightPaginationTest(TestCase):
+    def setUp(self):
+        airport1 = Airport.objects.create(name="Airport 1", closest_big_city="City 1")
+        airport2 = Airport.objects.create(name="Airport 2", closest_big_city="City 2")
+        route = Route.objects.create(distance=100, source=airport1, destination=airport2)
+        airplane_type = AirplaneType.objects.create(name="Test Airplane Type")
+        airplane = Airplane.objects.create(
+            name="Test Airplane", rows=10, seats_in_row=6, airplane_type=airplane_type
+        )
+        departure = timezone.now()
+        # several flights share a departure time, so a cursor must carry the id as well
+        for i in range(25):
+            Flight.objects.create(
+                departure_time=departure + timedelta(hours=i // 3),
+                arrival_time=departure + timedelta(hours=i // 3 + 2),
+                route=route,
+                airplane=airplane
+            )
+        self.client = APIClient()
+
+    def test_pages_cover_every_flight_once(self):
+        seen = []
+        url = f"{FLIGHT_URL}?page_size=4"
+        while url:
+            response = self.client.get(url)
+            self.assertLessEqual(len(response.data["results"]), 4)
+            seen += [flight["id"] for flight in response.data["results"]]
+            url = response.data["next"]
+
+        self.assertEqual(seen, list(Flight.objects.order_by("departure_time", "id").values_list("id", flat=True)))
+
+    def test_previous_pages_walk_back(self):
+        url = f"{FLIGHT_URL}?page_size=4"
+        pages = []
+        while url:
+            response = self.client.get(url)
+            pages.append([flight["id"] for flight in response.data["results"]])
+            url = response.data["next"]
+
+        url = response.data["previous"]
+        for page in reversed(pages[:-1]):
+            response = self.client.get(url)
+            self.assertEqual([flight["id"] for flight in response.data["results"]], page)
+            url = response.data["previous"]
+        self.assertIsNone(url)
+
+    def test_page_seeks_to_the_cursor_row(self):
+        response = self.client.get(f"{FLIGHT_URL}?page_size=4")
+
+        with CaptureQueriesContext(connection) as context:
+            self.client.get(response.data["next"])
+
+        sql = next(query["sql"] for query in context.captured_queries if 'FROM "airport_flight" ' in query["sql"])
+        self.assertIn('WHERE ROW("airport_flight"."departure_time", "airport_flight"."id") > (ROW(', sql)
+        self.assertNotIn("OFFSET", sql)
+
+    def test_invalid_cursor_is_not_found(self):
+        response = self.client.get(FLIGHT_URL, {"cursor": "cD1bIngiXQ=="})
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_page_size_is_capped(self):
+        with mock.patch.object(FlightPagination, "max_page_size", 5):
+            response = self.client.get(f"{FLIGHT_URL}?page_size=50")
+
+        self.assertEqual(len(response.data["results"]), 5)
+        self.assertIsNotNone(response.data["next"])
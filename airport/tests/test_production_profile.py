@@ -0,0 +1,114 @@
+import os
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "airport_core.settings")
+django.setup()
+
+import json
+import subprocess
+import sys
+import tempfile
+from unittest import mock
+
+from django.conf import settings
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from drf_spectacular.generators import SchemaGenerator
+from airport_core.schema import clear_schema_cache
+
+PROFILE_PROBE = """
+import json
+import django
+django.setup()
+from django.conf import settings
+from django.urls import Resolver404, resolve
+try:
+    resolve("/__debug__/render_panel/")
+    debug_urls = True
+except Resolver404:
+    debug_urls = False
+print(json.dumps({
+    "debug": settings.DEBUG,
+    "apps": settings.INSTALLED_APPS,
+    "middleware": settings.MIDDLEWARE,
+    "loaders": settings.TEMPLATES[0]["OPTIONS"].get("loaders"),
+    "debug_urls": debug_urls,
+}, default=str))
+"""
+
+
+class ProductionProfileTest(TestCase):
+    def probe(self, **environment):
+        environment = {**os.environ, "DJANGO_SETTINGS_MODULE": "airport_core.settings", **environment}
+        output = subprocess.run(
+            [sys.executable, "-c", PROFILE_PROBE],
+            env=environment,
+            cwd=settings.BASE_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        return json.loads(output)
+
+    def test_production_strips_debug_tools(self):
+        profile = self.probe(
+            DJANGO_PROFILE="production", DJANGO_SECRET_KEY="test", DJANGO_ALLOWED_HOSTS="api.example.com"
+        )
+
+        self.assertFalse(profile["debug"])
+        self.assertNotIn("debug_toolbar", profile["apps"])
+        self.assertNotIn("debug_toolbar.middleware.DebugToolbarMiddleware", profile["middleware"])
+        self.assertEqual(profile["loaders"][0][0], "django.template.loaders.cached.Loader")
+        self.assertFalse(profile["debug_urls"])
+
+    def test_development_keeps_debug_tools(self):
+        profile = self.probe(DJANGO_PROFILE="development")
+
+        self.assertTrue(profile["debug"])
+        self.assertIn("debug_toolbar", profile["apps"])
+        self.assertTrue(profile["debug_urls"])
+
+
+class PrecompiledSchemaTest(TestCase):
+    def setUp(self):
+        clear_schema_cache()
+
+    def test_serves_schema_file(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as file:
+            json.dump({"openapi": "3.0.3", "info": {"title": "Precompiled", "version": "1"}, "paths": {}}, file)
+        self.addCleanup(os.unlink, file.name)
+
+        with override_settings(OPENAPI_SCHEMA_FILE=file.name), self.assertNumQueries(0):
+            response = self.client.get(reverse("schema"), {"format": "json"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["info"]["title"], "Precompiled")
+
+    def test_generates_schema_without_file(self):
+        response = self.client.get(reverse("schema"), {"format": "json"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("/api/airport/flight/", response.json()["paths"])
+
+    def test_generates_schema_once_per_format(self):
+        with mock.patch.object(SchemaGenerator, "get_schema", autospec=True, side_effect=SchemaGenerator.get_schema) \
+                as get_schema:
+            first = self.client.get(reverse("schema"), {"format": "json"})
+            second = self.client.get(reverse("schema"), {"format": "json"})
+            yaml = self.client.get(reverse("schema"))
+
+        self.assertEqual(get_schema.call_count, 2)
+        self.assertEqual(first.content, second.content)
+        self.assertEqual(first["ETag"], second["ETag"])
+        self.assertNotEqual(first["ETag"], yaml["ETag"])
+        self.assertEqual(yaml["Content-Type"], "application/vnd.oai.openapi; charset=utf-8")
+        self.assertIn('filename="', yaml["Content-Disposition"])
+
+    def test_matching_etag_is_not_modified(self):
+        etag = self.client.get(reverse("schema"))["ETag"]
+
+        response = self.client.get(reverse("schema"), headers={"If-None-Match": etag})
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+        self.assertEqual(response.content, b"")
@@ -0,0 +1,186 @@
+import os
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "airport_core.settings")
+django.setup()
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+from airport.models import (
+    Airport, Route, AirplaneType, Airplane, Crew, Flight, Order, Ticket, SeatHold
+)
+from django.contrib.auth import get_user_model
+from datetime import timedelta
+from django.utils import timezone
+
+
+class QueryCountTest(TestCase):
+    """Every router-registered action must run a fixed number of queries
+
+    Each check runs the request against a small dataset, seeds ten times as
+    many rows and runs it again: both runs must issue the same number of
+    queries, and that number must stay within the bound.
+    """
+
+    small = 3
+    large = 30
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email="admin@example.com", password="testpass123", is_staff=True
+        )
+        self.other_user = get_user_model().objects.create_user(email="other@example.com", password="testpass123")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.units = 0
+        self.first_flight = None
+
+    def seed(self, count):
+        for _ in range(count):
+            i = self.units
+            self.units += 1
+            source = Airport.objects.create(name=f"Airport {i}a", closest_big_city=f"City {i}a")
+            destination = Airport.objects.create(name=f"Airport {i}b", closest_big_city=f"City {i}b")
+            route = Route.objects.create(distance=100 + i, source=source, destination=destination)
+            airplane_type = AirplaneType.objects.create(name=f"Type {i}")
+            airplane = Airplane.objects.create(
+                name=f"Airplane {i}", rows=20, seats_in_row=6, airplane_type=airplane_type
+            )
+            crew = [Crew.objects.create(first_name=f"First {i}", last_name=f"Last {j}") for j in range(3)]
+            flight = Flight.objects.create(
+                departure_time=timezone.now() + timedelta(hours=i),
+                arrival_time=timezone.now() + timedelta(hours=i + 2),
+                route=route,
+                airplane=airplane,
+            )
+            flight.crew.set(crew)
+            self.first_flight = self.first_flight or flight
+
+            order = Order.objects.create(user=self.user)
+            Ticket.objects.create(row=1, seat=1, flight=flight, order=order)
+            Ticket.objects.create(row=i // 6 + 2, seat=i % 6 + 1, flight=self.first_flight, order=order)
+            SeatHold.objects.create(
+                flight=flight, user=self.other_user, row=20, seat=1, expires_at=timezone.now() + timedelta(minutes=5)
+            )
+
+    def count_queries(self, request):
+        send, url, data = request()
+        with CaptureQueriesContext(connection) as context:
+            response = send(url, data, format="json")
+        self.assertLess(response.status_code, 400, getattr(response, "data", None))
+        return len(context)
+
+    def assertConstantQueries(self, bound, request):
+        self.seed(self.small)
+        small = self.count_queries(request)
+        self.seed(self.large - self.small)
+        large = self.count_queries(request)
+
+        self.assertEqual(small, large, f"{small} queries for {self.small} rows, {large} for {self.large}")
+        self.assertLessEqual(large, bound)
+
+    def get(self, name, *args):
+        return lambda: (self.client.get, reverse(f"airport:{name}", args=args), {"page_size": 100})
+
+    def post(self, name, payload):
+        # the payload is built before counting, its lookups are not part of the request
+        return lambda: (self.client.post, reverse(f"airport:{name}"), payload())
+
+    def test_airport_list(self):
+        self.assertConstantQueries(1, self.get("airport-list"))
+
+    def test_airport_create(self):
+        self.assertConstantQueries(2, self.post(
+            "airport-list", lambda: {"name": f"New {self.units}", "closest_big_city": "City"}
+        ))
+
+    def test_route_list(self):
+        self.assertConstantQueries(1, self.get("route-list"))
+
+    def test_route_retrieve(self):
+        self.seed(1)
+        self.assertConstantQueries(1, self.get("route-detail", Route.objects.first().id))
+
+    def test_route_create(self):
+        # both airports, then the INSERT inside the savepoint the test transaction requires
+        self.assertConstantQueries(5, self.post("route-list", lambda: {
+            "distance": 5000 + self.units,
+            "source": Airport.objects.first().id,
+            "destination": Airport.objects.last().id,
+        }))
+
+    def test_airplane_type_list(self):
+        self.assertConstantQueries(1, self.get("airplanetype-list"))
+
+    def test_airplane_type_create(self):
+        self.assertConstantQueries(2, self.post("airplanetype-list", lambda: {"name": f"New {self.units}"}))
+
+    def test_airplane_list(self):
+        self.assertConstantQueries(1, self.get("airplane-list"))
+
+    def test_airplane_retrieve(self):
+        self.seed(1)
+        self.assertConstantQueries(1, self.get("airplane-detail", Airplane.objects.first().id))
+
+    def test_airplane_create(self):
+        self.assertConstantQueries(3, self.post("airplane-list", lambda: {
+            "name": f"New {self.units}",
+            "rows": 10,
+            "seats_in_row": 4,
+            "airplane_type": AirplaneType.objects.first().id,
+        }))
+
+    def test_crew_list(self):
+        self.assertConstantQueries(1, self.get("crew-list"))
+
+    def test_crew_create(self):
+        self.assertConstantQueries(2, self.post(
+            "crew-list", lambda: {"first_name": "New", "last_name": f"Member {self.units}"}
+        ))
+
+    def test_flight_list(self):
+        self.assertConstantQueries(2, self.get("flight-list"))
+
+    def test_flight_retrieve(self):
+        self.seed(1)
+        self.assertConstantQueries(5, self.get("flight-detail", self.first_flight.id))
+
+    def test_flight_create(self):
+        # the new flight gets every crew member, so the payload grows with the seed
+        self.assertConstantQueries(10, self.post("flight-list", lambda: {
+            "departure_time": "2030-01-01 10:00",
+            "arrival_time": "2030-01-01 12:00",
+            "route": Route.objects.first().id,
+            "airplane": Airplane.objects.first().id,
+            "crew": list(Crew.objects.values_list("id", flat=True)),
+        }))
+
+    def test_order_list(self):
+        self.assertConstantQueries(2, self.get("order-list"))
+
+    def test_order_list_with_flights(self):
+        self.assertConstantQueries(3, lambda: (
+            self.client.get, reverse("airport:order-list"), {"page_size": 100, "expand": "flight"}
+        ))
+
+    def test_order_create(self):
+        # one ticket per seeded unit on each of the two newest flights
+        self.assertConstantQueries(12, self.post("order-list", lambda: {"tickets": [
+            {"row": 10 + i // 6, "seat": i % 6 + 1, "flight": flight_id}
+            for flight_id in Flight.objects.order_by("-id").values_list("id", flat=True)[:2]
+            for i in range(self.units)
+        ]}))
+
+    def test_ticket_list(self):
+        self.assertConstantQueries(1, self.get("ticket-list"))
+
+    def test_ticket_create(self):
+        self.assertConstantQueries(10, self.post("ticket-list", lambda: {
+            "row": 15,
+            "seat": self.units % 6 + 1,
+            "flight": Flight.objects.last().id,
+            "order": Order.objects.first().id,
+        }))
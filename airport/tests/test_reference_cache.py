@@ -0,0 +1,73 @@
+import os
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "airport_core.settings")
+django.setup()
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from airport.models import Airport, Route, Crew
+from django.contrib.auth import get_user_model
+
+AIRPORT_URL = reverse("airport:airport-list")
+ROUTE_URL = reverse("airport:route-list")
+CREW_URL = reverse("airport:crew-list")
+
+
+class ReferenceCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.airport1 = Airport.objects.create(name="Airport 1", closest_big_city="City 1")
+        self.airport2 = Airport.objects.create(name="Airport 2", closest_big_city="City 2")
+        Route.objects.create(distance=100, source=self.airport1, destination=self.airport2)
+        self.user = get_user_model().objects.create_user(email="testuser@example.com", password="testpass123")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_list_served_from_cache(self):
+        response = self.client.get(AIRPORT_URL)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        with self.assertNumQueries(0):
+            cached = self.client.get(AIRPORT_URL)
+        self.assertEqual(cached.data, response.data)
+        self.assertEqual(cached["ETag"], response["ETag"])
+
+    def test_matching_etag_returns_not_modified(self):
+        etag = self.client.get(ROUTE_URL)["ETag"]
+
+        with self.assertNumQueries(0):
+            response = self.client.get(ROUTE_URL, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], etag)
+
+    def test_save_invalidates_list(self):
+        etag = self.client.get(AIRPORT_URL)["ETag"]
+        Airport.objects.create(name="Airport 3", closest_big_city="City 3")
+
+        response = self.client.get(AIRPORT_URL, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 3)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_airport_change_invalidates_routes(self):
+        self.client.get(ROUTE_URL)
+        self.airport1.closest_big_city = "Renamed"
+        self.airport1.save()
+
+        response = self.client.get(ROUTE_URL)
+        self.assertEqual(response.data["results"][0]["source"], "Renamed")
+
+    def test_delete_invalidates_list(self):
+        crew = Crew.objects.create(first_name="First", last_name="Last")
+        self.assertEqual(len(self.client.get(CREW_URL).data), 1)
+        crew.delete()
+        self.assertEqual(self.client.get(CREW_URL).data, [])
+
+    def test_query_string_cached_separately(self):
+        first_page = self.client.get(ROUTE_URL, {"page_size": 1})
+        full_page = self.client.get(ROUTE_URL)
+        self.assertNotEqual(first_page["ETag"], full_page["ETag"])
@@ -0,0 +1,205 @@
+import os
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "airport_core.settings")
+django.setup()
+
+import asyncio
+import json
+
+from asgiref.sync import sync_to_async
+from django.test import TransactionTestCase
+from django.db.models import F
+from airport.models import Airport, Route, AirplaneType, Airplane, Flight, Order, Ticket
+from airport.seat_events import SeatEventBroadcaster, SeatEventStream
+from airport.seat_map import SeatMap
+from django.contrib.auth import get_user_model
+from datetime import timedelta
+from django.utils import timezone
+
+TIMEOUT = 5
+
+
+class StreamClient:
+    """Minimal ASGI client that reads one server-sent event at a time"""
+
+    def __init__(self, application, path, last_event_id=None):
+        headers = [] if last_event_id is None else [(b"last-event-id", str(last_event_id).encode())]
+        self.scope = {"type": "http", "method": "GET", "path": path, "headers": headers}
+        self.application = application
+        self.messages = asyncio.Queue()
+        self.disconnected = asyncio.Event()
+        self.buffer = b""
+        self.task = None
+        self.status = None
+
+    async def receive(self):
+        await self.disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(self, message):
+        await self.messages.put(message)
+
+    async def open(self):
+        self.task = asyncio.ensure_future(self.application(self.scope, self.receive, self.send))
+        start = await asyncio.wait_for(self.messages.get(), TIMEOUT)
+        self.status = start["status"]
+        return self
+
+    async def read_event(self):
+        while b"\n\n" not in self.buffer:
+            message = await asyncio.wait_for(self.messages.get(), TIMEOUT)
+            self.buffer += message["body"]
+        block, self.buffer = self.buffer.split(b"\n\n", 1)
+        fields = dict(line.split(": ", 1) for line in block.decode().splitlines() if ": " in line)
+        if "data" not in fields:
+            return await self.read_event()
+        return fields["event"], int(fields["id"]), json.loads(fields["data"])
+
+    async def close(self):
+        self.disconnected.set()
+        await asyncio.wait_for(self.task, TIMEOUT)
+
+
+class SeatEventStreamTest(TransactionTestCase):
+    def setUp(self):
+        airport1 = Airport.objects.create(name="Airport 1", closest_big_city="City 1")
+        airport2 = Airport.objects.create(name="Airport 2", closest_big_city="City 2")
+        route = Route.objects.create(distance=100, source=airport1, destination=airport2)
+        airplane_type = AirplaneType.objects.create(name="Test Airplane Type")
+        airplane = Airplane.objects.create(
+            name="Test Airplane", rows=10, seats_in_row=6, airplane_type=airplane_type
+        )
+        self.flight = Flight.objects.create(
+            departure_time=timezone.now(),
+            arrival_time=timezone.now() + timedelta(hours=2),
+            route=route,
+            airplane=airplane
+        )
+        user = get_user_model().objects.create_user(email="testuser@example.com", password="testpass123")
+        self.order = Order.objects.create(user=user)
+        self.path = f"/api/airport/flight/{self.flight.id}/seat-events/"
+        self.broadcaster = SeatEventBroadcaster()
+        self.application = SeatEventStream(application=None, broadcaster=self.broadcaster)
+
+    def book(self, row, seat):
+        return Ticket.objects.create(row=row, seat=seat, flight=self.flight, order=self.order)
+
+    async def connect(self, last_event_id=None):
+        return await StreamClient(self.application, self.path, last_event_id).open()
+
+    async def test_snapshot_then_deltas(self):
+        try:
+            await sync_to_async(self.book)(1, 1)
+            client = await self.connect()
+
+            event, snapshot_id, data = await client.read_event()
+            self.assertEqual(event, "snapshot")
+            self.assertEqual(data["taken"], [[1, 1]])
+            self.assertEqual(data["seats_in_row"], 6)
+
+            ticket = await sync_to_async(self.book)(2, 3)
+            event, delta_id, data = await client.read_event()
+            self.assertEqual(event, "delta")
+            self.assertGreater(delta_id, snapshot_id)
+            self.assertEqual(data["taken"], [[2, 3]])
+            self.assertEqual(data["released"], [])
+
+            await sync_to_async(ticket.delete)()
+            event, release_id, data = await client.read_event()
+            self.assertGreater(release_id, delta_id)
+            self.assertEqual(data["released"], [[2, 3]])
+            await client.close()
+        finally:
+            await self.broadcaster.close()
+
+    async def test_resume_from_last_event_id(self):
+        try:
+            watcher = await self.connect()
+            client = await self.connect()
+            await client.read_event()
+
+            await sync_to_async(self.book)(1, 1)
+            _, last_event_id, _ = await client.read_event()
+            await client.close()
+
+            await sync_to_async(self.book)(1, 2)
+            for _ in range(3):
+                await watcher.read_event()
+
+            resumed = await self.connect(last_event_id)
+            event, _, data = await resumed.read_event()
+            self.assertEqual(event, "delta")
+            self.assertEqual(data["taken"], [[1, 2]])
+            await resumed.close()
+            await watcher.close()
+        finally:
+            await self.broadcaster.close()
+
+    async def test_unknown_last_event_id_gets_snapshot(self):
+        try:
+            await sync_to_async(self.book)(3, 3)
+            client = await self.connect(last_event_id=12345)
+            event, _, data = await client.read_event()
+            self.assertEqual(event, "snapshot")
+            self.assertEqual(data["taken"], [[3, 3]])
+            await client.close()
+        finally:
+            await self.broadcaster.close()
+
+    def use_large_airplane(self):
+        # 400 rows of 60 seats: both seat maps hex-encoded exceed the 8000-byte NOTIFY limit
+        airplane = Airplane.objects.create(
+            name="Large Airplane", rows=400, seats_in_row=60,
+            airplane_type=self.flight.airplane.airplane_type
+        )
+        self.flight = Flight.objects.create(
+            departure_time=self.flight.departure_time,
+            arrival_time=self.flight.arrival_time,
+            route=self.flight.route,
+            airplane=airplane
+        )
+        self.path = f"/api/airport/flight/{self.flight.id}/seat-events/"
+
+    async def test_large_airplane_sends_changed_seats(self):
+        await sync_to_async(self.use_large_airplane)()
+        try:
+            client = await self.connect()
+            await client.read_event()
+
+            ticket = await sync_to_async(self.book)(400, 60)
+            event, _, data = await client.read_event()
+            self.assertEqual(event, "delta")
+            self.assertEqual(data["taken"], [[400, 60]])
+
+            await sync_to_async(ticket.delete)()
+            event, _, data = await client.read_event()
+            self.assertEqual(data["released"], [[400, 60]])
+            await client.close()
+        finally:
+            await self.broadcaster.close()
+
+    async def test_change_too_large_for_notification_resyncs(self):
+        await sync_to_async(self.use_large_airplane)()
+        try:
+            client = await self.connect()
+            await client.read_event()
+
+            airplane = self.flight.airplane
+            full = SeatMap.for_airplane(airplane, b"\xff" * SeatMap.size_in_bytes(airplane.capacity))
+            await Flight.objects.filter(pk=self.flight.pk).aupdate(seat_map=full.to_bytes(), version=F("version") + 1)
+            event, _, data = await client.read_event()
+            self.assertEqual(event, "snapshot")
+            self.assertEqual(len(data["taken"]), airplane.capacity)
+            await client.close()
+        finally:
+            await self.broadcaster.close()
+
+    async def test_unknown_flight_returns_not_found(self):
+        try:
+            self.path = f"/api/airport/flight/{self.flight.id + 1}/seat-events/"
+            client = await self.connect()
+            self.assertEqual(client.status, 404)
+            await client.task
+        finally:
+            await self.broadcaster.close()
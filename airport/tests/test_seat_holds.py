@@ -0,0 +1,118 @@
+import os
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "airport_core.settings")
+django.setup()
+
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from airport.models import Airport, Route, AirplaneType, Airplane, Flight, SeatHold, Ticket
+from django.contrib.auth import get_user_model
+from datetime import timedelta
+from django.utils import timezone
+
+ORDER_URL = reverse("airport:order-list")
+
+
+def hold_url(flight_id):
+    return reverse("airport:flight-hold", args=[flight_id])
+
+
+def detail_url(flight_id):
+    return reverse("airport:flight-detail", args=[flight_id])
+
+
+class SeatHoldTest(TestCase):
+    def setUp(self):
+        airport1 = Airport.objects.create(name="Airport 1", closest_big_city="City 1")
+        airport2 = Airport.objects.create(name="Airport 2", closest_big_city="City 2")
+        route = Route.objects.create(distance=100, source=airport1, destination=airport2)
+        airplane_type = AirplaneType.objects.create(name="Test Airplane Type")
+        airplane = Airplane.objects.create(
+            name="Test Airplane", rows=10, seats_in_row=6, airplane_type=airplane_type
+        )
+        self.flight = Flight.objects.create(
+            departure_time=timezone.now(),
+            arrival_time=timezone.now() + timedelta(hours=2),
+            route=route,
+            airplane=airplane
+        )
+        self.user = get_user_model().objects.create_user(email="user@example.com", password="testpass123")
+        self.other_user = get_user_model().objects.create_user(email="other@example.com", password="testpass123")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def hold(self, places, user=None):
+        client = self.client
+        if user is not None:
+            client = APIClient()
+            client.force_authenticate(user)
+        seats = [{"row": row, "seat": seat} for row, seat in places]
+        return client.post(hold_url(self.flight.id), seats, format="json")
+
+    def book(self, places):
+        tickets = [{"row": row, "seat": seat, "flight": self.flight.id} for row, seat in places]
+        return self.client.post(ORDER_URL, {"tickets": tickets}, format="json")
+
+    def test_holds_count_against_availability(self):
+        response = self.hold([(1, 1), (1, 2)])
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        response = self.client.get(detail_url(self.flight.id))
+
+        self.assertEqual(response.data["tickets_available"], 58)
+        self.assertEqual(
+            response.data["taken_places"],
+            [
+                {"row": 1, "seat": 1, "get_place": "row: 1, seat: 1"},
+                {"row": 1, "seat": 2, "get_place": "row: 1, seat: 2"},
+            ],
+        )
+        list_response = self.client.get(reverse("airport:flight-list"))
+        self.assertEqual(list_response.data["results"][0]["tickets_available"], 58)
+
+    def test_seat_held_by_other_user_conflicts(self):
+        self.hold([(2, 2)], user=self.other_user)
+
+        self.assertEqual(self.hold([(2, 2), (2, 3)]).status_code, status.HTTP_409_CONFLICT)
+        response = self.book([(2, 2)])
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(response.data["seats"], [{"flight": self.flight.id, "row": 2, "seat": 2}])
+
+    def test_booking_converts_own_hold(self):
+        self.hold([(3, 1), (3, 2)])
+
+        response = self.book([(3, 1)])
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(list(SeatHold.objects.values_list("row", "seat")), [(3, 2)])
+        self.flight.refresh_from_db()
+        self.assertEqual(self.flight.tickets_available, 58)
+
+    def test_expired_hold_does_not_block(self):
+        self.hold([(4, 4)], user=self.other_user)
+        SeatHold.objects.update(expires_at=timezone.now() - timedelta(seconds=1))
+
+        self.assertEqual(self.hold([(4, 4)]).status_code, status.HTTP_201_CREATED)
+        self.assertEqual(SeatHold.objects.get().user, self.user)
+
+    def test_release_holds(self):
+        self.hold([(5, 1)])
+
+        response = self.client.delete(hold_url(self.flight.id))
+
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(SeatHold.objects.exists())
+
+    def test_purge_expired_holds(self):
+        self.hold([(6, 1), (6, 2), (6, 3)])
+        SeatHold.objects.filter(seat__lt=3).update(expires_at=timezone.now() - timedelta(minutes=1))
+
+        call_command("purge_seat_holds", batch_size=1, stdout=StringIO())
+
+        self.assertEqual(list(SeatHold.objects.values_list("seat", flat=True)), [3])
@@ -0,0 +1,148 @@
+import os
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "airport_core.settings")
+django.setup()
+
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.exceptions import ValidationError
+from rest_framework.test import APIClient
+from airport.models import Airport, Route, AirplaneType, Airplane, Flight, Order, Ticket
+from airport.seat_map import SeatMap
+from airport.serializers import FlightDetailSerializer
+from django.contrib.auth import get_user_model
+from datetime import datetime, timedelta
+
+
+class SeatMapTest(TestCase):
+    def setUp(self):
+        self.seat_map = SeatMap(rows=3, seats_in_row=4)
+
+    def test_take_and_release(self):
+        self.seat_map.take(2, 3)
+        self.assertTrue(self.seat_map.is_taken(2, 3))
+        self.assertEqual(self.seat_map.taken_count, 1)
+        self.assertEqual(self.seat_map.available_count, 11)
+        self.seat_map.release(2, 3)
+        self.assertFalse(self.seat_map.is_taken(2, 3))
+
+    def test_round_trip_bytes(self):
+        for place in [(1, 1), (2, 4), (3, 4)]:
+            self.seat_map.take(*place)
+        restored = SeatMap(3, 4, self.seat_map.to_bytes())
+        self.assertEqual(len(self.seat_map.to_bytes()), 2)
+        self.assertEqual(list(restored.taken_places()), [(1, 1), (2, 4), (3, 4)])
+
+
+class FlightSeatMapTest(TestCase):
+    def setUp(self):
+        airport1 = Airport.objects.create(name="Airport 1", closest_big_city="City 1")
+        airport2 = Airport.objects.create(name="Airport 2", closest_big_city="City 2")
+        route = Route.objects.create(distance=100, source=airport1, destination=airport2)
+        airplane_type = AirplaneType.objects.create(name="Test Airplane Type")
+        self.airplane = Airplane.objects.create(
+            name="Test Airplane", rows=10, seats_in_row=6, airplane_type=airplane_type
+        )
+        self.flight = Flight.objects.create(
+            departure_time=datetime.now(),
+            arrival_time=datetime.now() + timedelta(hours=2),
+            route=route,
+            airplane=self.airplane
+        )
+        user = get_user_model().objects.create_user(email="testuser@example.com", password="testpass123")
+        self.order = Order.objects.create(user=user)
+
+    def test_new_flight_has_empty_seat_map(self):
+        self.assertEqual(len(self.flight.seat_map), 8)
+        self.assertEqual(self.flight.capacity, 60)
+        self.assertEqual(self.flight.seats_sold, 0)
+        self.assertEqual(self.flight.tickets_available, 60)
+
+    def test_ticket_create_and_delete_update_seat_map(self):
+        ticket = Ticket.objects.create(row=2, seat=5, flight=self.flight, order=self.order)
+        self.flight.refresh_from_db()
+        self.assertTrue(self.flight.get_seat_map().is_taken(2, 5))
+        self.assertEqual(self.flight.seats_sold, 1)
+        self.assertEqual(self.flight.tickets_available, 59)
+
+        ticket.delete()
+        self.flight.refresh_from_db()
+        self.assertFalse(self.flight.get_seat_map().is_taken(2, 5))
+        self.assertEqual(self.flight.tickets_available, 60)
+
+    def test_order_delete_releases_seats(self):
+        Ticket.objects.create(row=1, seat=1, flight=self.flight, order=self.order)
+        Ticket.objects.create(row=1, seat=2, flight=self.flight, order=self.order)
+        self.order.delete()
+        self.flight.refresh_from_db()
+        self.assertEqual(self.flight.tickets_available, 60)
+
+    def test_flight_update_keeps_seat_map(self):
+        Ticket.objects.create(row=3, seat=3, flight=self.flight, order=self.order)
+        self.flight.arrival_time += timedelta(hours=1)
+        self.flight.save()
+        self.flight.refresh_from_db()
+        self.assertTrue(self.flight.get_seat_map().is_taken(3, 3))
+
+    def test_detail_serializer_seat_map(self):
+        Ticket.objects.create(row=1, seat=3, flight=self.flight, order=self.order)
+        self.flight.refresh_from_db()
+        data = FlightDetailSerializer(self.flight).data
+        self.assertEqual(data["seat_map"], "BAAAAAAAAAA=")
+        self.assertEqual(data["tickets_available"], 59)
+        self.assertEqual(data["taken_places"], [{"row": 1, "seat": 3, "get_place": "row: 1, seat: 3"}])
+
+    def test_detail_serializer_reads_taken_places_from_seat_map(self):
+        seat_map = self.flight.get_seat_map()
+        seat_map.take(2, 1)
+        seat_map.take(1, 6)
+        Flight.objects.filter(pk=self.flight.pk).update(seat_map=seat_map.to_bytes())
+        flight = Flight.objects.select_related("airplane").get(pk=self.flight.pk)
+        flight.active_holds = []
+
+        with self.assertNumQueries(0):
+            data = FlightDetailSerializer().get_taken_places(flight)
+
+        self.assertEqual(data, [
+            {"row": 1, "seat": 6, "get_place": "row: 1, seat: 6"},
+            {"row": 2, "seat": 1, "get_place": "row: 2, seat: 1"},
+        ])
+
+    def test_reconcile_fixes_drifted_counters(self):
+        Ticket.objects.create(row=1, seat=1, flight=self.flight, order=self.order)
+        Ticket.objects.create(row=4, seat=2, flight=self.flight, order=self.order)
+        Flight.objects.filter(pk=self.flight.pk).update(seat_map=bytes(8), seats_sold=7, capacity=1)
+
+        call_command("reconcile_seat_counters", batch_size=1, stdout=StringIO())
+
+        self.flight.refresh_from_db()
+        self.assertEqual(self.flight.capacity, 60)
+        self.assertEqual(self.flight.seats_sold, 2)
+        self.assertTrue(self.flight.get_seat_map().is_taken(4, 2))
+
+    def test_airplane_with_flights_cannot_be_resized(self):
+        self.airplane.rows = 12
+        with self.assertRaises(ValidationError):
+            self.airplane.save()
+
+        client = APIClient()
+        client.force_authenticate(get_user_model().objects.create_user(
+            email="admin@example.com", password="testpass123", is_staff=True
+        ))
+        url = reverse("airport:airplane-detail", args=[self.airplane.id])
+        self.assertEqual(client.patch(url, {"seats_in_row": 4}).status_code, 400)
+        self.assertEqual(client.patch(url, {"name": "Renamed"}).status_code, 200)
+        self.airplane.refresh_from_db()
+        self.assertEqual((self.airplane.rows, self.airplane.seats_in_row), (10, 6))
+
+    def test_airplane_without_flights_can_be_resized(self):
+        self.flight.delete()
+        self.airplane.rows = 12
+        self.airplane.save()
+
+        self.airplane.refresh_from_db()
+        self.assertEqual(self.airplane.capacity, 72)
@@ -0,0 +1,94 @@
+import os
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "airport_core.settings")
+django.setup()
+
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db.models import Count, F, Sum
+from django.test import TestCase
+from airport.models import Airport, Route, Airplane, Crew, Flight, Order, Ticket
+
+SCALE = {
+    "airports": 10,
+    "routes": 20,
+    "airplane_types": 2,
+    "airplanes": 5,
+    "crew": 10,
+    "users": 3,
+    "flights": 30,
+    "tickets": 900,
+    "batch_size": 100,
+}
+
+
+class SeedSyntheticTest(TestCase):
+    def seed(self, **options):
+        out = StringIO()
+        call_command("seed_synthetic", stdout=out, **{**SCALE, **options})
+        return out.getvalue()
+
+    def test_seed_creates_consistent_dataset(self):
+        out = self.seed()
+
+        self.assertIn("900 tickets", out)
+        self.assertEqual(Airport.objects.count(), 10)
+        self.assertEqual(Route.objects.count(), 20)
+        self.assertEqual(Airplane.objects.count(), 5)
+        self.assertEqual(Flight.objects.count(), 30)
+        self.assertEqual(Ticket.objects.count(), 900)
+        self.assertEqual(Flight.crew.through.objects.count(), 30 * 4)
+        for flight in Flight.objects.select_related("airplane").annotate(ticket_count=Count("tickets")):
+            seat_map = flight.get_seat_map()
+            self.assertEqual(flight.seats_sold, flight.ticket_count)
+            self.assertEqual(sorted(seat_map.taken_places()), list(flight.tickets.values_list("row", "seat")))
+        for order in Order.objects.prefetch_related("tickets"):
+            self.assertLessEqual(len(order.tickets.all()), 4)
+            self.assertEqual(len({ticket.flight_id for ticket in order.tickets.all()}), 1)
+        self.assertTrue(self.client.login(email="synthetic-1@example.com", password="synthetic"))
+
+    def test_same_seed_gives_same_data(self):
+        self.seed(prefix="First")
+        self.seed(prefix="Second")
+
+        first, second = (
+            list(Flight.objects.filter(route__source__name__startswith=prefix).order_by("id").values_list(
+                "capacity", "seats_sold", "seat_map"
+            ))
+            for prefix in ("First", "Second")
+        )
+        self.assertEqual(first, second)
+        self.assertEqual(get_user_model().objects.filter(email__startswith="second-").count(), 3)
+
+    def test_existing_prefix_is_rejected(self):
+        self.seed()
+
+        with self.assertRaises(CommandError):
+            self.seed()
+
+    def test_tickets_can_fill_every_seat(self):
+        self.seed(prefix="Empty", tickets=0)
+        seats = Flight.objects.aggregate(seats=Sum("capacity"))["seats"]
+
+        self.seed(prefix="Full", tickets=seats)
+
+        full = Flight.objects.filter(route__source__name__startswith="Full")
+        self.assertEqual(Ticket.objects.filter(flight__in=full).count(), seats)
+        self.assertFalse(full.exclude(seats_sold=F("capacity")).exists())
+
+    def test_more_tickets_than_seats_are_rejected(self):
+        with self.assertRaisesMessage(CommandError, "seats"):
+            self.seed(tickets=30 * 40 * 8 + 1)
+
+        self.assertFalse(Airport.objects.exists())
+
+    def test_negative_counts_are_rejected(self):
+        for name in ("crew_per_flight", "tickets"):
+            with self.subTest(name=name), self.assertRaisesMessage(CommandError, "must be at least 0"):
+                self.seed(**{name: -1})
+
+        self.assertFalse(Airport.objects.exists())
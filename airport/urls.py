@@ -1,6 +1,7 @@
 from django.urls import path, include
 from rest_framework import routers
 
+from airport import async_views
 from airport.views import (
     AirportViewSet,
     RouteViewSet,
@@ -24,6 +25,9 @@ router.register("ticket", TicketViewSet)
 
 urlpatterns = [
     path("", include(router.urls)),
+    path("async/flight/", async_views.flight_list, name="async-flight-list"),
+    path("async/flight/<int:pk>/", async_views.flight_detail, name="async-flight-detail"),
+    path("async/ticket/", async_views.ticket_list, name="async-ticket-list"),
 ]
 
 app_name = "airport"
@@ -1,14 +1,24 @@
-from django.db.models import F, Count
+from django.conf import settings
+from django.db.models import Count, F, OuterRef, Prefetch, Subquery
+from django.db.models.functions import Coalesce
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
 from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import extend_schema, OpenApiParameter
 from rest_framework import viewsets, mixins, status
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from rest_framework.response import Response
 from rest_framework.viewsets import GenericViewSet
 
+from airport.booking import hold_seats
+from airport.caching import CachedListMixin
+from airport.exports import export_response
+from airport.itineraries import connection_index
+from airport.pagination import FlightPagination, OrderPagination, RoutePagination, TicketPagination
 from airport.models import (
-    Airport, AirplaneType, Crew, Flight, Order, Ticket, Airplane, Route
+    Airport, AirplaneType, Crew, Flight, Order, Ticket, Airplane, Route, SeatHold
 )
 from airport.serializers import (
     AirportSerializer,
@@ -24,21 +34,37 @@ from airport.serializers import (
     TicketListSerializer,
     TicketDetailSerializer,
     OrderListSerializer,
-    AirplaneImageSerializer
+    AirplaneImageSerializer,
+    SeatHoldSerializer,
+    FlightSearchSerializer,
+    ItinerarySearchSerializer,
+    ItinerarySerializer,
 )
 
 
-class AirportViewSet(mixins.CreateModelMixin, mixins.ListModelMixin, GenericViewSet):
+EXPORT_PARAMETERS = [
+    OpenApiParameter(
+        "export_format",
+        type=OpenApiTypes.STR,
+        enum=["ndjson", "csv"],
+        description="Encoding of the streamed rows, ndjson by default",
+    ),
+]
+
+
+class AirportViewSet(CachedListMixin, mixins.CreateModelMixin, mixins.ListModelMixin, GenericViewSet):
     queryset = Airport.objects.all()
     serializer_class = AirportSerializer
 
 
-class RouteViewSet(viewsets.ModelViewSet):
+class RouteViewSet(CachedListMixin, viewsets.ModelViewSet):
     queryset = Route.objects.select_related("source", "destination")
+    cache_models = (Route, Airport)
     serializer_class = RouteSerializer
+    pagination_class = RoutePagination
 
 
-class AirplaneTypeViewSet(mixins.CreateModelMixin, mixins.ListModelMixin, GenericViewSet):
+class AirplaneTypeViewSet(CachedListMixin, mixins.CreateModelMixin, mixins.ListModelMixin, GenericViewSet):
     queryset = AirplaneType.objects.all()
     serializer_class = AirplaneTypeSerializer
 
@@ -47,6 +73,42 @@ class AirplaneViewSet(viewsets.ModelViewSet):
     queryset = Airplane.objects.select_related("airplane_type")
     serializer_class = AirplaneSerializer
 
+    @staticmethod
+    def _params_to_ints(query_string):
+        try:
+            return [int(str_id) for str_id in query_string.split(",")]
+        except ValueError:
+            raise ValidationError({"airplane_type": "Expected comma separated airplane type ids"})
+
+    @staticmethod
+    def _param_to_int(query_params, name):
+        try:
+            return int(query_params[name])
+        except ValueError:
+            raise ValidationError({name: "A valid integer is required."})
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action != "list":
+            return queryset
+
+        query_params = self.request.query_params
+        name = query_params.get("name")
+        airplane_type = query_params.get("airplane_type")
+
+        if name:
+            queryset = queryset.filter(name__istartswith=name)
+        if airplane_type:
+            queryset = queryset.filter(airplane_type_id__in=self._params_to_ints(airplane_type))
+        if "capacity_min" in query_params or "capacity_max" in query_params:
+            # matches the airplane_capacity_idx expression index
+            queryset = queryset.alias(seat_count=F("rows") * F("seats_in_row"))
+            if "capacity_min" in query_params:
+                queryset = queryset.filter(seat_count__gte=self._param_to_int(query_params, "capacity_min"))
+            if "capacity_max" in query_params:
+                queryset = queryset.filter(seat_count__lte=self._param_to_int(query_params, "capacity_max"))
+        return queryset
+
     def get_serializer_class(self):
         if self.action == "upload_image":
             return AirplaneImageSerializer
@@ -69,14 +131,25 @@ class AirplaneViewSet(viewsets.ModelViewSet):
         parameters=[
             OpenApiParameter(
                 "airplane_type",
-                type=OpenApiTypes.INT,
+                type=OpenApiTypes.STR,
                 description="Filter by airplane type "
-                            "id (ex. ?airplane_type=2)",
+                            "ids (ex. ?airplane_type=2,3)",
             ),
             OpenApiParameter(
                 "name",
                 type=OpenApiTypes.STR,
-                description="Filter by airplane name (ex. ?name=boeing)",
+                description="Filter by start of the airplane name, "
+                            "case insensitive (ex. ?name=boeing)",
+            ),
+            OpenApiParameter(
+                "capacity_min",
+                type=OpenApiTypes.INT,
+                description="Filter by minimum number of seats (ex. ?capacity_min=100)",
+            ),
+            OpenApiParameter(
+                "capacity_max",
+                type=OpenApiTypes.INT,
+                description="Filter by maximum number of seats (ex. ?capacity_max=200)",
             ),
         ]
     )
@@ -85,7 +158,7 @@ class AirplaneViewSet(viewsets.ModelViewSet):
         return super().list(request, *args, **kwargs)
 
 
-class CrewViewSet(mixins.CreateModelMixin, mixins.ListModelMixin, GenericViewSet):
+class CrewViewSet(CachedListMixin, mixins.CreateModelMixin, mixins.ListModelMixin, GenericViewSet):
     queryset = Crew.objects.all()
     serializer_class = CrewSerializer
 
@@ -93,29 +166,142 @@ class CrewViewSet(mixins.CreateModelMixin, mixins.ListModelMixin, GenericViewSet
 class FlightViewSet(viewsets.ModelViewSet):
     queryset = Flight.objects.all()
     serializer_class = FlightSerializer
+    pagination_class = FlightPagination
 
     def get_queryset(self):
+        if self.action in ("list", "search"):
+            # FlightListSerializer renders these rows directly, see FlightRowListSerializer
+            return Flight.objects.list_rows()
         queryset = Flight.objects.select_related(
             "route__source", "route__destination", "airplane"
-        ).prefetch_related("crew").annotate(
-            tickets_available=(
-                    F("airplane__rows") * F("airplane__seats_in_row") - Count("tickets")
+        ).prefetch_related("crew").with_seats_held()
+        if self.action == "retrieve":
+            queryset = queryset.prefetch_related(
+                Prefetch("seat_holds", queryset=SeatHold.objects.active(), to_attr="active_holds")
             )
-        )
         return queryset
 
+    def retrieve(self, request, *args, **kwargs):
+        """Answer If-None-Match / If-Modified-Since from the flight's version before serializing"""
+        try:
+            state = Flight.objects.filter(pk=kwargs["pk"]).with_seats_held().with_hold_expired_at().values(
+                "version", "updated_at", "seats_held", "hold_expired_at"
+            ).first()
+        except (TypeError, ValueError):
+            state = None
+        if state is None:
+            return super().retrieve(request, *args, **kwargs)
+
+        # holds lapse without a write, so their count and latest expiry are part of the validators
+        etag = quote_etag(
+            f"{kwargs['pk']}-{state['version']}-{state['seats_held']}-{request.accepted_renderer.format}"
+        )
+        last_modified = max(filter(None, [state["updated_at"], state["hold_expired_at"]]))
+        last_modified = int(last_modified.timestamp())
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = super().retrieve(request, *args, **kwargs)
+        response["ETag"] = etag
+        response["Last-Modified"] = http_date(last_modified)
+        return response
+
     def get_serializer_class(self):
-        if self.action == "list":
+        if self.action in ("list", "search"):
             return FlightListSerializer
         if self.action == "retrieve":
             return FlightDetailSerializer
+        if self.action == "hold":
+            return SeatHoldSerializer
+        if self.action == "itineraries":
+            return ItinerarySerializer
         return self.serializer_class
 
+    @extend_schema(
+        parameters=[
+            OpenApiParameter("source", type=OpenApiTypes.INT, description="Source airport id"),
+            OpenApiParameter("destination", type=OpenApiTypes.INT, description="Destination airport id"),
+            OpenApiParameter(
+                "source_city", type=OpenApiTypes.STR, description="Closest big city of the source airport"
+            ),
+            OpenApiParameter(
+                "destination_city",
+                type=OpenApiTypes.STR,
+                description="Closest big city of the destination airport",
+            ),
+            OpenApiParameter(
+                "departure_from",
+                type=OpenApiTypes.DATE,
+                description="First departure date (ex. ?departure_from=2024-07-01)",
+            ),
+            OpenApiParameter(
+                "departure_to",
+                type=OpenApiTypes.DATE,
+                description="Last departure date (ex. ?departure_to=2024-07-07)",
+            ),
+            OpenApiParameter("airplane_type", type=OpenApiTypes.INT, description="Airplane type id"),
+            OpenApiParameter("min_seats", type=OpenApiTypes.INT, description="Minimum number of available seats"),
+        ]
+    )
+    @action(methods=["GET"], detail=False)
+    def search(self, request):
+        """Search flights by route, departure date window, airplane type and availability"""
+        filters = FlightSearchSerializer(data=request.query_params)
+        filters.is_valid(raise_exception=True)
+        queryset = self.get_queryset().search(**filters.validated_data)
+
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+    @extend_schema(parameters=[ItinerarySearchSerializer])
+    @action(methods=["GET"], detail=False)
+    def itineraries(self, request):
+        """Find direct and connecting itineraries, earliest arrival first"""
+        search = ItinerarySearchSerializer(data=request.query_params)
+        search.is_valid(raise_exception=True)
+        paths = connection_index.search(max_layover=settings.ITINERARY_MAX_LAYOVER, **search.validated_data)
+
+        flights = self.get_queryset().in_bulk({leg.flight_id for path in paths for leg in path})
+        itineraries = [
+            {
+                "departure_time": path[0].departure_time,
+                "arrival_time": path[-1].arrival_time,
+                "connections": len(path) - 1,
+                "flights": [flights[leg.flight_id] for leg in path],
+            }
+            for path in paths
+            if all(leg.flight_id in flights for leg in path)
+        ]
+        return Response(self.get_serializer(itineraries, many=True).data)
+
+    @extend_schema(request=SeatHoldSerializer(many=True), responses=SeatHoldSerializer(many=True))
+    @action(
+        methods=["POST", "DELETE"],
+        detail=True,
+        permission_classes=(IsAuthenticated,),
+    )
+    def hold(self, request, pk=None):
+        """Hold seats for the checkout of the current user, or release all of them"""
+        flight = self.get_object()
+        if request.method == "DELETE":
+            deleted, _ = SeatHold.objects.filter(flight=flight, user=request.user).delete()
+            if deleted:
+                Flight.objects.filter(pk=flight.pk).touch()
+            return Response(status=status.HTTP_204_NO_CONTENT)
+
+        context = {**self.get_serializer_context(), "flight": flight}
+        serializer = self.get_serializer(data=request.data, many=True, context=context)
+        serializer.is_valid(raise_exception=True)
+        places = [(hold_data["row"], hold_data["seat"]) for hold_data in serializer.validated_data]
+        holds = hold_seats(request.user, flight, places)
+        return Response(self.get_serializer(holds, many=True).data, status=status.HTTP_201_CREATED)
+
 
 class TicketViewSet(mixins.CreateModelMixin, mixins.ListModelMixin, GenericViewSet):
     queryset = Ticket.objects.select_related("flight__route__source",
                                              "flight__route__destination")
     serializer_class = TicketSerializer
+    pagination_class = TicketPagination
     permission_classes = (IsAuthenticated,)
 
     def get_serializer_class(self):
@@ -125,21 +311,67 @@ class TicketViewSet(mixins.CreateModelMixin, mixins.ListModelMixin, GenericViewS
             return TicketDetailSerializer
         return self.serializer_class
 
+    @extend_schema(parameters=EXPORT_PARAMETERS, responses={200: OpenApiTypes.STR})
+    @action(methods=["GET"], detail=False, permission_classes=(IsAdminUser,))
+    def export(self, request):
+        """Stream every ticket with its order as NDJSON or CSV"""
+        fields = {
+            "id": "id",
+            "row": "row",
+            "seat": "seat",
+            "flight": "flight_id",
+            "order": "order_id",
+            "ordered_at": "order__created_at",
+            "user": "order__user__email",
+        }
+        queryset = Ticket.objects.order_by("id")
+        return export_response(request, queryset, fields, "tickets")
+
 
 class OrderViewSet(mixins.CreateModelMixin, mixins.ListModelMixin, GenericViewSet):
-    queryset = (Order.objects.select_related("user")
-                .prefetch_related("tickets__flight__route__source",
-                                  "tickets__flight__route__destination"))
+    queryset = Order.objects.prefetch_related("tickets")
     serializer_class = OrderSerializer
+    pagination_class = OrderPagination
     permission_classes = (IsAuthenticated,)
 
     def get_queryset(self):
-        return Order.objects.filter(user=self.request.user)
+        return self.queryset.filter(user=self.request.user)
 
     def get_serializer_class(self):
         if self.action == "list":
             return OrderListSerializer
         return self.serializer_class
 
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context["expand_flights"] = self.request.query_params.get("expand") == "flight"
+        return context
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "expand",
+                type=OpenApiTypes.STR,
+                enum=["flight"],
+                description="Add the flight of every ticket",
+            ),
+        ]
+    )
+    def list(self, request, *args, **kwargs):
+        """The current user's orders, newest first"""
+        return super().list(request, *args, **kwargs)
+
+    @extend_schema(parameters=EXPORT_PARAMETERS, responses={200: OpenApiTypes.STR})
+    @action(methods=["GET"], detail=False, permission_classes=(IsAdminUser,))
+    def export(self, request):
+        """Stream every order with its ticket count as NDJSON or CSV"""
+        # a correlated count streams row by row, a GROUP BY would aggregate everything first
+        ticket_count = Ticket.objects.filter(order=OuterRef("pk")).order_by().values("order").annotate(
+            count=Count("*")
+        ).values("count")
+        queryset = Order.objects.annotate(ticket_count=Coalesce(Subquery(ticket_count), 0)).order_by("id")
+        fields = {"id": "id", "created_at": "created_at", "user": "user__email", "tickets": "ticket_count"}
+        return export_response(request, queryset, fields, "orders")
+
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
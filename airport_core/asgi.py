@@ -13,4 +13,9 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "airport_core.settings")
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+# imported once the app registry is ready
+from airport.seat_events import SeatEventStream  # noqa: E402
+
+application = SeatEventStream(django_application)
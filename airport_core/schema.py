@@ -0,0 +1,76 @@
+import hashlib
+import json
+import logging
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.http import HttpResponse
+from django.utils import translation
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+from drf_spectacular.views import SpectacularAPIView
+
+logger = logging.getLogger(__name__)
+
+# rendered schemas by version, language and media type, built once per process
+_rendered = {}
+
+
+@lru_cache(maxsize=None)
+def load_schema(path):
+    try:
+        with open(path, encoding="utf-8") as file:
+            return json.load(file)
+    except FileNotFoundError:
+        logger.warning("OpenAPI schema file %s not found, generating the schema once per process", path)
+        return None
+
+
+@receiver(setting_changed)
+def clear_schema_cache(**kwargs):
+    load_schema.cache_clear()
+    _rendered.clear()
+
+
+class SchemaView(SpectacularAPIView):
+    """Serve the schema rendered once per process and answer ``If-None-Match`` with 304
+
+    The schema comes from ``OPENAPI_SCHEMA_FILE`` when there is one, built at
+    deploy time with ``python manage.py spectacular --format openapi-json
+    --file schema.json``, and is generated on the first request otherwise.
+    The rendered body is kept per version, language and format, and its hash
+    is the ETag.
+    """
+
+    def _get_schema_response(self, request):
+        version = self.api_version or request.version or self._get_version_parameter(request)
+        key = (version, translation.get_language(), request.accepted_media_type)
+        rendered = _rendered.get(key)
+        if rendered is None:
+            rendered = _rendered[key] = self.render_schema(request, version)
+        content, headers = rendered
+
+        response = get_conditional_response(request, etag=headers["ETag"])
+        if response is None:
+            response = HttpResponse(content, content_type=headers["Content-Type"])
+            response["Content-Disposition"] = headers["Content-Disposition"]
+        response["ETag"] = headers["ETag"]
+        return response
+
+    def render_schema(self, request, version):
+        schema = settings.OPENAPI_SCHEMA_FILE and load_schema(str(settings.OPENAPI_SCHEMA_FILE))
+        if schema is None:
+            generator = self.generator_class(urlconf=self.urlconf, api_version=version, patterns=self.patterns)
+            schema = generator.get_schema(request=request, public=self.serve_public)
+        renderer = request.accepted_renderer
+        content = renderer.render(schema, request.accepted_media_type, self.get_renderer_context())
+        content_type = request.accepted_media_type
+        if renderer.charset:
+            content_type = f"{content_type}; charset={renderer.charset}"
+        return content, {
+            "Content-Type": content_type,
+            "Content-Disposition": f'inline; filename="{self._get_filename(request, version)}"',
+            "ETag": quote_etag(hashlib.md5(content, usedforsecurity=False).hexdigest()),
+        }
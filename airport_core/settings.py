@@ -12,6 +12,8 @@ https://docs.djangoproject.com/en/5.0/ref/settings/
 import os
 from datetime import timedelta
 from pathlib import Path
+
+from django.core.exceptions import ImproperlyConfigured
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -23,6 +25,11 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/5.0/howto/deployment/checklist/
 
+# "development" or "production", see "Settings profiles" in README.md
+DJANGO_PROFILE = os.environ.get("DJANGO_PROFILE", "development")
+if DJANGO_PROFILE not in ("development", "production"):
+    raise ImproperlyConfigured(f"Unknown DJANGO_PROFILE {DJANGO_PROFILE!r}")
+
 # SECURITY WARNING: keep the secret key used in production secret!
 SECRET_KEY = "django-insecure-1$55@)d^e9t!csafh4xheiy#(ep7r94zty6p4$9#=752!b7gq="
 
@@ -40,6 +47,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "rest_framework",
     "rest_framework_simplejwt",
     "drf_spectacular",
@@ -49,6 +57,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "airport.metrics.MetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "debug_toolbar.middleware.DebugToolbarMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -97,9 +106,29 @@ DATABASES = {
         "PASSWORD": os.environ["POSTGRES_PASSWORD"],
         "HOST": os.environ["POSTGRES_HOST"],
         "PORT": os.environ["POSTGRES_PORT"],
+        # seconds a connection is kept for the next request, 0 closes it after each
+        # request; keep 0 under ASGI, see "Database connections" in README.md
+        "CONN_MAX_AGE": int(os.environ.get("POSTGRES_CONN_MAX_AGE", 0)),
+        "CONN_HEALTH_CHECKS": os.environ.get("POSTGRES_CONN_HEALTH_CHECKS", "true").lower() == "true",
+        # PgBouncer in transaction mode cannot keep a cursor open between statements
+        "DISABLE_SERVER_SIDE_CURSORS": (
+            os.environ.get("POSTGRES_DISABLE_SERVER_SIDE_CURSORS", "false").lower() == "true"
+        ),
     }
 }
 
+# Caches
+# https://docs.djangoproject.com/en/5.0/topics/cache/
+
+CACHES = {
+    "default": {
+        "BACKEND": os.environ.get("CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"),
+        "LOCATION": os.environ.get("CACHE_LOCATION", "airport"),
+    }
+}
+
+REFERENCE_CACHE_TIMEOUT = int(os.environ.get("REFERENCE_CACHE_TIMEOUT_SECONDS", 3600))
+
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
 
@@ -154,6 +183,9 @@ REST_FRAMEWORK = {
     ),
 }
 
+API_PAGE_SIZE = int(os.environ.get("API_PAGE_SIZE", 20))
+API_MAX_PAGE_SIZE = int(os.environ.get("API_MAX_PAGE_SIZE", 100))
+
 SPECTACULAR_SETTINGS = {
     "TITLE": "Airport API Service",
     "DESCRIPTION": "System for tracking flights from airports across the globe",
@@ -172,3 +204,44 @@ SIMPLE_JWT = {
     "REFRESH_TOKEN_LIFETIME": timedelta(days=31),
     "ROTATE_REFRESH_TOKENS": False,
 }
+
+ITINERARY_MIN_CONNECTION_MINUTES = int(os.environ.get("ITINERARY_MIN_CONNECTION_MINUTES", 45))
+
+ITINERARY_MAX_LAYOVER = timedelta(hours=int(os.environ.get("ITINERARY_MAX_LAYOVER_HOURS", 24)))
+
+SEAT_HOLD_TTL = timedelta(seconds=int(os.environ.get("SEAT_HOLD_TTL_SECONDS", 600)))
+
+SEAT_STREAM_BUFFER = int(os.environ.get("SEAT_STREAM_BUFFER", 256))
+
+SEAT_STREAM_KEEPALIVE = timedelta(seconds=int(os.environ.get("SEAT_STREAM_KEEPALIVE_SECONDS", 15)))
+
+# requests slower than this are logged with their slowest SQL; 0 turns the log off
+SLOW_REQUEST_THRESHOLD = timedelta(milliseconds=int(os.environ.get("SLOW_REQUEST_THRESHOLD_MS", 1000))) or None
+
+SLOW_REQUEST_LOG_QUERIES = int(os.environ.get("SLOW_REQUEST_LOG_QUERIES", 5))
+
+# GET /metrics requires "Authorization: Bearer <METRICS_TOKEN>"; without a token it is only open with DEBUG on
+METRICS_TOKEN = os.environ.get("METRICS_TOKEN", "")
+
+# OpenAPI schema written by "manage.py spectacular" and served as is instead of
+# being generated on each request; None generates it
+OPENAPI_SCHEMA_FILE = None
+
+DEBUG_APPS = ["debug_toolbar"]
+
+DEBUG_MIDDLEWARE = ["debug_toolbar.middleware.DebugToolbarMiddleware"]
+
+if DJANGO_PROFILE == "production":
+    DEBUG = False
+    SECRET_KEY = os.environ["DJANGO_SECRET_KEY"]
+    ALLOWED_HOSTS = os.environ["DJANGO_ALLOWED_HOSTS"].split(",")
+    INSTALLED_APPS = [app for app in INSTALLED_APPS if app not in DEBUG_APPS]
+    MIDDLEWARE = [middleware for middleware in MIDDLEWARE if middleware not in DEBUG_MIDDLEWARE]
+    TEMPLATES[0]["APP_DIRS"] = False
+    TEMPLATES[0]["OPTIONS"]["loaders"] = [
+        (
+            "django.template.loaders.cached.Loader",
+            ["django.template.loaders.filesystem.Loader", "django.template.loaders.app_directories.Loader"],
+        ),
+    ]
+    OPENAPI_SCHEMA_FILE = os.environ.get("OPENAPI_SCHEMA_FILE", BASE_DIR / "schema.json")
@@ -0,0 +1,85 @@
+"""Baseline load test of the main /api/airport/ endpoints.
+
+Meant to run against the dataset of ``manage.py seed_synthetic``, whose users
+all share one password, on a server started separately, e.g.:
+
+    python manage.py seed_synthetic
+    uvicorn airport_core.wsgi:application --interface wsgi --port 8000
+    python benchmarks/api.py --base-url http://127.0.0.1:8000 -c 16 -n 2000
+
+The flight, airports and departure date used by the detail, search and
+itinerary requests are taken from a flight departing tomorrow or later, so
+the itinerary search has flights left to find. Every endpoint is loaded in
+turn with the same concurrency and reported with its throughput and latency
+percentiles.
+"""
+import argparse
+import json
+import urllib.request
+from datetime import datetime, timedelta, timezone
+from urllib.parse import urlencode
+
+from loadtest import report, run
+
+
+def get_json(url, headers=None, data=None):
+    request = urllib.request.Request(url, headers={"Content-Type": "application/json", **(headers or {})})
+    if data is not None:
+        request.data = json.dumps(data).encode()
+    with urllib.request.urlopen(request) as response:
+        return json.load(response)
+
+
+def results_of(data):
+    return data["results"] if isinstance(data, dict) else data
+
+
+def endpoints(base_url, headers):
+    tomorrow = (datetime.now(timezone.utc) + timedelta(days=1)).date().isoformat()
+    flight = results_of(get_json(
+        f"{base_url}/api/airport/flight/search/?" + urlencode({"departure_from": tomorrow, "page_size": 1}), headers
+    ))[0]
+    airports = {airport["name"]: airport["id"] for airport in results_of(get_json(f"{base_url}/api/airport/airport/"))}
+    source, _, destination = flight["route"].partition(" -> ")
+    route = {"source": airports[source], "destination": airports[destination]}
+    date = flight["departure_time"][:10]
+    return [
+        "api/airport/airport/",
+        "api/airport/route/",
+        "api/airport/airplane-type/",
+        "api/airport/airplane/",
+        "api/airport/crew/",
+        "api/airport/flight/",
+        f"api/airport/flight/{flight['id']}/",
+        "api/airport/flight/search/?" + urlencode({**route, "departure_from": date, "departure_to": date}),
+        "api/airport/flight/itineraries/?" + urlencode({**route, "departure_date": date}),
+        "api/airport/order/",
+        "api/airport/ticket/",
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--email", default="synthetic-1@example.com")
+    parser.add_argument("--password", default="synthetic")
+    parser.add_argument("-c", "--concurrency", type=int, default=16)
+    parser.add_argument("-n", "--requests", type=int, default=2000)
+    parser.add_argument("--warmup", type=int, default=100)
+    args = parser.parse_args()
+    base_url = args.base_url.rstrip("/")
+
+    token = get_json(
+        f"{base_url}/api/users/token/", data={"email": args.email, "password": args.password}
+    )["access"]
+    headers = {"Authorization": f"Bearer {token}"}
+    results = [
+        run(f"{base_url}/{path}", args.concurrency, args.requests, headers=headers, warmup=args.warmup)
+        ._replace(url=path.partition("?")[0])
+        for path in endpoints(base_url, headers)
+    ]
+    report(results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""Compare the sync DRF viewsets with their async twins under the same load.
+
+Serve the project with an ASGI server and the production profile, e.g.
+``DJANGO_PROFILE=production uvicorn airport_core.asgi:application --workers 1``
+with ``DJANGO_SECRET_KEY`` and ``DJANGO_ALLOWED_HOSTS`` set. The development
+profile adds django-debug-toolbar's sync-only middleware, which makes Django
+run the async views in a thread too. Then run:
+
+    python benchmarks/async_views.py --flight 1 --token <access token> -c 64 -n 5000
+"""
+import argparse
+
+from loadtest import report, run
+
+PAIRS = [
+    ("flight/", "async/flight/"),
+    ("flight/{flight}/", "async/flight/{flight}/"),
+    ("ticket/", "async/ticket/"),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000/api/airport/")
+    parser.add_argument("--flight", type=int, required=True, help="id of the flight used for the detail pair")
+    parser.add_argument("--token", required=True, help="JWT access token, the ticket list requires one")
+    parser.add_argument("-c", "--concurrency", type=int, default=64)
+    parser.add_argument("-n", "--requests", type=int, default=5000)
+    args = parser.parse_args()
+
+    headers = {"Authorization": f"Bearer {args.token}"}
+    results = []
+    for sync_path, async_path in PAIRS:
+        for path in (sync_path, async_path):
+            url = args.base_url + path.format(flight=args.flight)
+            results.append(run(url, args.concurrency, args.requests, headers=headers))
+    report(results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Latency of one endpoint with and without persistent database connections.
+
+Serves the project once per configuration with ``uvicorn --interface wsgi``,
+whose fixed set of worker threads lets a kept connection be reused, loads
+the endpoint and prints the usual table:
+
+    python benchmarks/connections.py --path api/airport/flight/ -c 8 -n 3000
+
+The database settings come from the environment as for ``manage.py``.
+"""
+import argparse
+import os
+import socket
+import subprocess
+import sys
+import time
+
+from loadtest import report, run
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CONFIGURATIONS = [
+    ("connect per request", {"POSTGRES_CONN_MAX_AGE": "0"}),
+    ("persistent", {"POSTGRES_CONN_MAX_AGE": "60", "POSTGRES_CONN_HEALTH_CHECKS": "false"}),
+    ("persistent + health check", {"POSTGRES_CONN_MAX_AGE": "60", "POSTGRES_CONN_HEALTH_CHECKS": "true"}),
+]
+
+
+def wait_for_port(port, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"server did not start on port {port}")
+
+
+def serve(port, environment):
+    return subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "airport_core.wsgi:application",
+            "--interface", "wsgi", "--port", str(port), "--log-level", "warning",
+        ],
+        cwd=ROOT,
+        env={**os.environ, **environment},
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--path", default="api/airport/flight/")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("-c", "--concurrency", type=int, default=8)
+    parser.add_argument("-n", "--requests", type=int, default=3000)
+    args = parser.parse_args()
+
+    results = []
+    for label, environment in CONFIGURATIONS:
+        server = serve(args.port, environment)
+        try:
+            wait_for_port(args.port)
+            result = run(f"http://127.0.0.1:{args.port}/{args.path}", args.concurrency, args.requests)
+        finally:
+            server.terminate()
+            server.wait()
+        results.append(result._replace(url=label))
+    report(results)
+
+
+if __name__ == "__main__":
+    main()
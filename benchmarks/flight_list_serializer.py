@@ -0,0 +1,68 @@
+"""Rows per second of FlightListSerializer over model instances and over ``list_rows()`` dicts.
+
+Runs against the configured database, which needs at least ``--flights``
+flights (``manage.py import_schedule`` loads them quickly):
+
+    python benchmarks/flight_list_serializer.py --flights 10000
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "airport_core.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from airport.models import Flight  # noqa: E402
+from airport.serializers import FlightListSerializer  # noqa: E402
+
+
+def instances(limit):
+    return list(
+        Flight.objects.select_related("route__source", "route__destination", "airplane")
+        .prefetch_related("crew").with_seats_held().order_by("departure_time", "id")[:limit]
+    )
+
+
+def rows(limit):
+    return list(Flight.objects.list_rows().order_by("departure_time", "id")[:limit])
+
+
+def measure(load, limit, repeat):
+    best_fetch = best_total = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        page = load(limit)
+        fetched = time.perf_counter()
+        data = FlightListSerializer(page, many=True).data
+        finished = time.perf_counter()
+        best_fetch = min(best_fetch, fetched - started)
+        best_total = min(best_total, finished - started)
+    return data, best_fetch, best_total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--flights", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    results = {}
+    for name, load in (("instances", instances), ("rows", rows)):
+        results[name] = measure(load, args.flights, args.repeat)
+
+    count = len(results["rows"][0])
+    if results["instances"][0] != results["rows"][0]:
+        sys.exit("The two paths produced different output")
+    print(f"{count} flights, best of {args.repeat}")
+    print(f"{'path':<10} {'fetch ms':>9} {'serialize ms':>13} {'rows/s':>9}")
+    for name, (_, fetch, total) in results.items():
+        print(f"{name:<10} {fetch * 1000:>9.1f} {(total - fetch) * 1000:>13.1f} {count / total:>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
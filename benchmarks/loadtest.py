@@ -0,0 +1,123 @@
+"""Closed-loop HTTP load generator using only the standard library.
+
+Every worker thread keeps one keep-alive connection and sends its next
+request as soon as the previous response is read. Each URL is run in turn,
+so endpoints can be compared under the same concurrency:
+
+    python benchmarks/loadtest.py \\
+        http://localhost:8000/api/airport/flight/ \\
+        http://localhost:8000/api/airport/async/flight/ \\
+        --concurrency 64 --requests 5000 --header "Authorization: Bearer <token>"
+"""
+import argparse
+import http.client
+import statistics
+import threading
+import time
+from collections import namedtuple
+from urllib.parse import urlsplit
+
+Result = namedtuple("Result", ["url", "requests", "errors", "seconds", "latencies"])
+
+
+def percentile(values, fraction):
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def run(url, concurrency=32, requests=2000, headers=None, method="GET", body=None, warmup=100):
+    """Send ``requests`` requests to ``url`` from ``concurrency`` workers and return a ``Result``"""
+    parts = urlsplit(url)
+    connection_class = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+    target = parts.path + (f"?{parts.query}" if parts.query else "")
+    headers = dict(headers or {})
+
+    remaining = [warmup + requests]
+    lock = threading.Lock()
+    latencies = []
+    errors = [0]
+    started = []
+
+    def take():
+        with lock:
+            if remaining[0] == 0:
+                return None
+            remaining[0] -= 1
+            warming = remaining[0] >= requests
+            if not warming and not started:
+                started.append(time.perf_counter())
+            return warming
+
+    def worker():
+        connection = connection_class(parts.netloc, timeout=60)
+        while (warming := take()) is not None:
+            begin = time.perf_counter()
+            try:
+                connection.request(method, target, body=body, headers=headers)
+                response = connection.getresponse()
+                response.read()
+                failed = response.status >= 400
+            except (OSError, http.client.HTTPException):
+                connection.close()
+                connection = connection_class(parts.netloc, timeout=60)
+                failed = True
+            elapsed = time.perf_counter() - begin
+            if not warming:
+                with lock:
+                    latencies.append(elapsed)
+                    errors[0] += failed
+        connection.close()
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    seconds = time.perf_counter() - started[0] if started else 0.0
+    return Result(url, len(latencies), errors[0], seconds, latencies)
+
+
+def report(results):
+    print(f"{'url':<60} {'req/s':>9} {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} {'max ms':>8} {'errors':>7}")
+    for result in results:
+        latencies = result.latencies
+        print(
+            f"{result.url:<60} "
+            f"{result.requests / result.seconds if result.seconds else 0:>9.1f} "
+            f"{statistics.median(latencies) * 1000 if latencies else float('nan'):>8.1f} "
+            f"{percentile(latencies, 0.9) * 1000:>8.1f} "
+            f"{percentile(latencies, 0.99) * 1000:>8.1f} "
+            f"{max(latencies, default=float('nan')) * 1000:>8.1f} "
+            f"{result.errors:>7}"
+        )
+
+
+def parse_headers(values):
+    headers = {}
+    for value in values:
+        name, _, content = value.partition(":")
+        headers[name.strip()] = content.strip()
+    return headers
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("urls", nargs="+")
+    parser.add_argument("-c", "--concurrency", type=int, default=32)
+    parser.add_argument("-n", "--requests", type=int, default=2000)
+    parser.add_argument("--warmup", type=int, default=100)
+    parser.add_argument("-H", "--header", action="append", default=[], help='e.g. "Authorization: Bearer <token>"')
+    args = parser.parse_args(argv)
+
+    headers = parse_headers(args.header)
+    results = [
+        run(url, args.concurrency, args.requests, headers=headers, warmup=args.warmup)
+        for url in args.urls
+    ]
+    report(results)
+
+
+if __name__ == "__main__":
+    main()
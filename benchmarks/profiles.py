@@ -0,0 +1,73 @@
+"""Startup time and request latency of the development and production profiles.
+
+Startup is the median time of a fresh interpreter importing the WSGI
+application. Latency is measured per endpoint against ``uvicorn --interface
+wsgi`` serving each profile in turn:
+
+    python benchmarks/profiles.py -c 8 -n 2000 \\
+        --path api/airport/flight/ --path api/schema/ --path api/doc/swagger/
+
+The production profile serves ``schema.json`` from the project root when it
+exists; build it first with ``python manage.py spectacular --format
+openapi-json --file schema.json`` to include the precompiled schema.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from connections import ROOT, serve, wait_for_port
+from loadtest import report, run
+
+PROFILES = [
+    ("development", {"DJANGO_PROFILE": "development"}),
+    (
+        "production",
+        {"DJANGO_PROFILE": "production", "DJANGO_SECRET_KEY": "benchmark", "DJANGO_ALLOWED_HOSTS": "127.0.0.1"},
+    ),
+]
+
+
+def startup_seconds(environment, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        subprocess.run(
+            [sys.executable, "-c", "import airport_core.wsgi"],
+            cwd=ROOT,
+            env={**os.environ, **environment},
+            check=True,
+        )
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--path", action="append", dest="paths")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--startup-repeat", type=int, default=5)
+    parser.add_argument("-c", "--concurrency", type=int, default=8)
+    parser.add_argument("-n", "--requests", type=int, default=2000)
+    args = parser.parse_args()
+    paths = args.paths or ["api/airport/flight/", "api/schema/"]
+
+    results = []
+    for label, environment in PROFILES:
+        print(f"{label:<12} startup {startup_seconds(environment, args.startup_repeat) * 1000:.0f} ms")
+        server = serve(args.port, environment)
+        try:
+            wait_for_port(args.port)
+            for path in paths:
+                result = run(f"http://127.0.0.1:{args.port}/{path}", args.concurrency, args.requests)
+                results.append(result._replace(url=f"{label} {path}"))
+        finally:
+            server.terminate()
+            server.wait()
+    report(results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Cost of building the OpenAPI schema and latency of serving it.
+
+Times, in process, schema generation, rendering, and one request to
+drf-spectacular's view (generated on every request) and to ``SchemaView``
+(served from the per-process cache). Then serves the project with
+``uvicorn --interface wsgi`` and loads ``/api/schema/``, with and without a
+matching ``If-None-Match``:
+
+    python benchmarks/schema.py -c 8 -n 2000
+
+The database settings come from the environment as for ``manage.py``.
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+import urllib.request
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "airport_core.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.test import RequestFactory  # noqa: E402
+from drf_spectacular.generators import SchemaGenerator  # noqa: E402
+from drf_spectacular.renderers import OpenApiJsonRenderer, OpenApiYamlRenderer  # noqa: E402
+from drf_spectacular.views import SpectacularAPIView  # noqa: E402
+
+from airport_core.schema import SchemaView  # noqa: E402
+from connections import serve, wait_for_port  # noqa: E402
+from loadtest import report, run  # noqa: E402
+
+
+def median_ms(function, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("-c", "--concurrency", type=int, default=8)
+    parser.add_argument("-n", "--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    schema = SchemaGenerator().get_schema(request=None, public=True)
+    factory = RequestFactory()
+    generated, cached = SpectacularAPIView.as_view(), SchemaView.as_view()
+    timings = [
+        ("generate", lambda: SchemaGenerator().get_schema(request=None, public=True)),
+        ("render yaml", lambda: OpenApiYamlRenderer().render(schema)),
+        ("render json", lambda: OpenApiJsonRenderer().render(schema)),
+        ("view, generated", lambda: generated(factory.get("/api/schema/")).render()),
+        ("view, cached", lambda: cached(factory.get("/api/schema/"))),
+    ]
+    for label, function in timings:
+        print(f"{label:<16} {median_ms(function, args.repeat):>8.1f} ms")
+    print()
+
+    url = f"http://127.0.0.1:{args.port}/api/schema/"
+    server = serve(args.port, {})
+    try:
+        wait_for_port(args.port)
+        etag = urllib.request.urlopen(url).headers["ETag"]
+        results = [
+            run(url, args.concurrency, args.requests)._replace(url="200"),
+            run(url, args.concurrency, args.requests, headers={"If-None-Match": etag})._replace(url="304"),
+        ]
+    finally:
+        server.terminate()
+        server.wait()
+    report(results)
+
+
+if __name__ == "__main__":
+    main()